@@ -1,6 +1,6 @@
 import pandas as pd
 import yfinance as yf
-import requests
+import http_client
 from bs4 import BeautifulSoup
 import time
 
@@ -13,7 +13,7 @@ def get_sp500_tickers():
         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
     }
     
-    response = requests.get(url, headers=headers)
+    response = http_client.get(url, headers=headers)
     soup = BeautifulSoup(response.text, 'html.parser')
     
     # Try different ways to find the table
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Inverted-file (IVF) approximate nearest-neighbour index over the normalized
+company embeddings, pure NumPy.
+
+A spherical k-means quantizer splits the companies into `nlist` cells; a query
+only scores the companies in its `nprobe` closest cells. Candidates are scored
+exactly against the stored embeddings, so the only approximation is which cells
+get probed. /match uses it to shortlist ANN_CANDIDATES companies before the
+TF-IDF, keyword and industry terms are computed.
+
+Build from existing artifacts and print recall@k vs brute force:
+  python ann_index.py --nlist 0 --nprobe 8 16 32
+(precompute_companies.py --ann does the same right after encoding.)
+"""
+import argparse
+import hashlib
+import os
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+ARTIFACT_DIR = "artifacts"
+ANN_INDEX_PATH = os.path.join(ARTIFACT_DIR, "ann_ivf.npz")
+COMP_EMB_PATH = os.path.join(ARTIFACT_DIR, "company_embeddings.npy")
+
+
+def default_nlist(n: int) -> int:
+    return int(max(1, min(n // 8, round(4 * np.sqrt(n)))))
+
+
+def embeddings_digest(embs: np.ndarray) -> str:
+    """Ties an index to the exact embedding matrix it was built from."""
+    return hashlib.sha256(np.ascontiguousarray(embs, dtype=np.float32).tobytes()).hexdigest()
+
+
+def _top_idx(scores: np.ndarray, k: int) -> np.ndarray:
+    k = min(k, len(scores))
+    part = np.argpartition(-scores, k - 1)[:k]
+    return part[np.argsort(-scores[part], kind="stable")]
+
+
+class IVFIndex:
+    def __init__(self, centroids: np.ndarray, offsets: np.ndarray, ids: np.ndarray,
+                 n: int, digest: str = ""):
+        self.centroids = centroids          # (nlist, d), L2-normalized
+        self.offsets = offsets              # (nlist + 1,) CSR offsets into ids
+        self.ids = ids                      # company indices grouped by cell
+        self.n = n
+        self.digest = digest                # embeddings_digest() of the indexed matrix
+
+    @property
+    def nlist(self) -> int:
+        return len(self.centroids)
+
+    @classmethod
+    def build(cls, embs: np.ndarray, nlist: Optional[int] = None, iters: int = 20,
+              seed: int = 0, train_size: int = 100_000) -> "IVFIndex":
+        n = len(embs)
+        nlist = nlist or default_nlist(n)
+        rng = np.random.default_rng(seed)
+        train = embs[rng.choice(n, size=min(n, train_size), replace=False)].astype(np.float32)
+        C = train[rng.choice(len(train), size=nlist, replace=False)].copy()
+        for _ in range(iters):
+            assign = np.argmax(train @ C.T, axis=1)
+            for c in range(nlist):
+                members = train[assign == c]
+                if len(members):
+                    C[c] = members.sum(axis=0)
+                else:  # re-seed empty cells
+                    C[c] = train[rng.integers(len(train))]
+            C /= np.linalg.norm(C, axis=1, keepdims=True) + 1e-12
+
+        assign = np.empty(n, dtype=np.int32)
+        for s in range(0, n, 8192):
+            assign[s:s + 8192] = np.argmax(embs[s:s + 8192] @ C.T, axis=1)
+        ids = np.argsort(assign, kind="stable").astype(np.int32)
+        counts = np.bincount(assign, minlength=nlist)
+        offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+        return cls(C, offsets, ids, n, embeddings_digest(embs))
+
+    def save(self, path: str = ANN_INDEX_PATH) -> None:
+        np.savez(path, centroids=self.centroids, offsets=self.offsets, ids=self.ids,
+                 n=np.int64(self.n), digest=np.array(self.digest))
+
+    @classmethod
+    def load(cls, path: str = ANN_INDEX_PATH, embs: Optional[np.ndarray] = None) -> "IVFIndex":
+        """Load a saved index; with embs, raise if it was built from a different matrix."""
+        z = np.load(path)
+        index = cls(z["centroids"], z["offsets"], z["ids"], int(z["n"]), str(z["digest"]))
+        digest = getattr(embs, "digest", None) or (embeddings_digest(embs) if embs is not None else None)
+        if embs is not None and (index.n != len(embs) or index.digest != digest):
+            raise RuntimeError(f"Stale ANN index {path}: built from different company embeddings. "
+                               "Re-run precompute_companies.py --ann.")
+        return index
+
+    def probe(self, q: np.ndarray, nprobe: int) -> np.ndarray:
+        """Company ids in the nprobe cells closest to q."""
+        cells = _top_idx(self.centroids @ q, nprobe)
+        return np.concatenate([self.ids[self.offsets[c]:self.offsets[c + 1]] for c in cells])
+
+    def search(self, embs: np.ndarray, q: np.ndarray, k: int, nprobe: int):
+        """Top-k (ids, dense scores) among probed cells, best first."""
+        cand = self.probe(q, nprobe)
+        scores = embs[cand] @ q
+        order = _top_idx(scores, k)
+        return cand[order], scores[order]
+
+
+# =========================
+# Recall report
+# =========================
+def synthetic_queries(embs: np.ndarray, n_queries: int = 200, seed: int = 1) -> np.ndarray:
+    """Held-out-style queries: blends of two random companies plus noise, normalized."""
+    rng = np.random.default_rng(seed)
+    a = embs[rng.integers(len(embs), size=n_queries)]
+    b = embs[rng.integers(len(embs), size=n_queries)]
+    noise = rng.standard_normal(a.shape).astype(np.float32) * 0.02
+    Q = a + 0.5 * b + noise
+    return Q / np.linalg.norm(Q, axis=1, keepdims=True)
+
+
+def recall_report(index: IVFIndex, embs: np.ndarray, queries: np.ndarray,
+                  ks: List[int], nprobes: List[int]) -> List[Dict[str, float]]:
+    t0 = time.perf_counter()
+    exact = [np.argsort(-(embs @ q), kind="stable")[:max(ks)] for q in queries]
+    brute_ms = (time.perf_counter() - t0) * 1000 / len(queries)
+
+    rows = []
+    for nprobe in nprobes:
+        hits = {k: 0 for k in ks}
+        t0 = time.perf_counter()
+        results = [index.search(embs, q, max(ks), nprobe)[0] for q in queries]
+        ann_ms = (time.perf_counter() - t0) * 1000 / len(queries)
+        for got, ref in zip(results, exact):
+            for k in ks:
+                hits[k] += len(set(got[:k]) & set(ref[:k]))
+        row = {"nprobe": nprobe, "ann_ms": ann_ms, "brute_ms": brute_ms}
+        for k in ks:
+            row[f"recall@{k}"] = hits[k] / float(k * len(queries))
+        rows.append(row)
+    return rows
+
+
+def print_recall(rows: List[Dict[str, float]]) -> None:
+    for r in rows:
+        recalls = "  ".join(f"{k}={v:.3f}" for k, v in r.items() if k.startswith("recall@"))
+        print(f"  nprobe={r['nprobe']:<4} {recalls}  ann {r['ann_ms']:.2f} ms/query  brute {r['brute_ms']:.2f} ms/query")
+
+
+def build_and_report(embs: np.ndarray, nlist: Optional[int], nprobes: List[int],
+                     ks: List[int], path: str = ANN_INDEX_PATH) -> IVFIndex:
+    t0 = time.perf_counter()
+    index = IVFIndex.build(embs, nlist=nlist or None)
+    print(f"IVF index: {index.n} companies, {index.nlist} cells, built in {time.perf_counter() - t0:.2f} s")
+    index.save(path)
+    print(f"Recall vs brute force ({len(ks)} cutoffs, synthetic held-out queries):")
+    print_recall(recall_report(index, embs, synthetic_queries(embs), ks, nprobes))
+    print(f"✅ Saved → {path}")
+    return index
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--embeddings", default=COMP_EMB_PATH)
+    ap.add_argument("--out", default=ANN_INDEX_PATH)
+    ap.add_argument("--nlist", type=int, default=0, help="number of cells (0 = 4*sqrt(N))")
+    ap.add_argument("--nprobe", type=int, nargs="+", default=[4, 8, 16, 32])
+    ap.add_argument("--k", type=int, nargs="+", default=[10, 100])
+    args = ap.parse_args()
+    embs = np.load(args.embeddings).astype(np.float32)
+    build_and_report(embs, args.nlist, args.nprobe, args.k, path=args.out)
+
+
+if __name__ == "__main__":
+    main()
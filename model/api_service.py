@@ -3,19 +3,46 @@ import os
 import re
 import time
 import math
+import asyncio
+import concurrent.futures
+import threading
 from datetime import datetime, timezone
 from typing import List, Tuple, Optional
 
+import httpx
 import numpy as np
 import pandas as pd
 import requests
 from bs4 import BeautifulSoup
 from fastapi import FastAPI, Query, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import JSONResponse
-
-from sentence_transformers import SentenceTransformer
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.preprocessing import normalize as sk_normalize
+from pydantic import BaseModel, Field
+
+from encoder import load_encoder, BACKENDS
+
+from tfidf_engine import TfidfEngine, TFIDF_MODES
+from industry_prior import IndustryPrior, artifacts_present as industry_artifacts_present
+from keyword_index import KeywordIndex, extract_dynamic_terms
+from ann_index import IVFIndex, ANN_INDEX_PATH
+from embedding_store import EmbeddingStore, PRECISIONS, StaleCopy, quantized_paths
+from company_table import CompanyTable
+from artifact_manifest import load_manifest, verify_companies
+from bill_cache import BillCache, text_key
+from http_cache import HttpCache, as_response, cache_key
+from component_loader import ComponentLoader
+import http_client
+import rate_budget
+import circuit_breaker
+from circuit_breaker import BreakerOpen
+from rate_budget import INTERACTIVE, BACKGROUND, with_priority
+import single_flight
+from single_flight import SingleFlight, AsyncSingleFlight, FlightTimeout
+from match_index import MatchIndex, MATCH_INDEX_PATH
+import sponsor_index
+from sponsor_index import SponsorIndex, SPONSOR_INDEX_PATH
+from bill_extract import html_to_text, xml_to_text
+from statute_cleaner import clean_statute_text
 
 from typing import Dict, Any, Set
 
@@ -26,6 +53,10 @@ import json
 # =========================
 CONGRESS = 119
 MODEL_NAME = "all-mpnet-base-v2"
+# sentence-transformers | onnx | onnx-int8 (see encoder.py / encoder_bench.py)
+ENCODER_BACKEND = os.getenv("ENCODER_BACKEND", "sentence-transformers")
+if ENCODER_BACKEND not in BACKENDS:
+    raise RuntimeError(f"ENCODER_BACKEND must be one of {BACKENDS}")
 
 # Optional precomputed artifacts (company embeddings, company texts, companies df)
 ARTIFACT_DIR = "artifacts"
@@ -33,10 +64,50 @@ COMP_EMB_PATH    = os.path.join(ARTIFACT_DIR, "company_embeddings.npy")  # optio
 COMP_DF_PATH     = os.path.join(ARTIFACT_DIR, "companies.parquet")
 COMP_TEXTS_PATH  = os.path.join(ARTIFACT_DIR, "company_texts.json")
 
+# Company embeddings precision: float32 | float16 | int8 (memory-mapped, shared by workers;
+# build with precompute_companies.py --emb-precision, compare with embedding_store.py)
+COMP_EMB_PRECISION = os.getenv("COMP_EMB_PRECISION", "float32")
+if COMP_EMB_PRECISION not in PRECISIONS:
+    raise RuntimeError(f"COMP_EMB_PRECISION must be one of {PRECISIONS}")
+
+# TF-IDF: "transform" uses artifacts/tfidf_vectorizer.pkl + tfidf_matrix_norm.npz,
+# "parity" refits on every request like the script (see tfidf_parity_report.py)
+TFIDF_MODE = os.getenv("TFIDF_MODE", "transform")
+
+# Dense term: "query" embeds bill_query_text only (script behaviour); "max" / "mean" also
+# embed every chunk (one batched encode, cached per chunk) and pool the per-view
+# company similarities, so long bills are not cut at the encoder's token limit
+DENSE_POOLINGS = ("query", "max", "mean")
+DENSE_POOLING = os.getenv("DENSE_POOLING", "query")
+
+# ANN shortlist (artifacts/ann_ivf.npz from precompute_companies.py --ann). Only used
+# once the universe is large; below that brute force is both exact and faster.
+ANN_MIN_COMPANIES = int(os.getenv("ANN_MIN_COMPANIES", "5000"))
+ANN_CANDIDATES = int(os.getenv("ANN_CANDIDATES", "1000"))
+ANN_NPROBE = int(os.getenv("ANN_NPROBE", "16"))
+
 # Where to save cleaned bill text
 BILL_TEXT_DIR = "bill_texts"
 os.makedirs(BILL_TEXT_DIR, exist_ok=True)
 
+# Bill processing cache: raw/cleaned text, chunks, CRS summary and query embeddings,
+# keyed by (congress, type, number, text-version date, format URL)
+BILL_CACHE_DIR = os.getenv("BILL_CACHE_DIR", os.path.join("cache", "bills"))
+BILL_CACHE_MAX_MB = int(os.getenv("BILL_CACHE_MAX_MB", "256"))
+BILL_CACHE_DISK_MAX_MB = int(os.getenv("BILL_CACHE_DISK_MAX_MB", "4096"))  # 0 = unbounded
+BILL_VERSION_TTL = float(os.getenv("BILL_VERSION_TTL", "3600"))  # seconds before re-listing text versions
+BILL_CACHE = BillCache(BILL_CACHE_DIR, max_bytes=BILL_CACHE_MAX_MB * 1024 * 1024, version_ttl=BILL_VERSION_TTL,
+                       disk_max_bytes=BILL_CACHE_DISK_MAX_MB * 1024 * 1024)
+HTTP_CACHE = HttpCache()  # upstream responses (bill metadata, cosponsors, text listings/documents, ...)
+
+# Identical concurrent calls share one execution (single_flight.py); /singleflight/stats
+UPSTREAM_FLIGHTS = SingleFlight("upstream")                     # _get() of the same URL + params
+UPSTREAM_ASYNC_FLIGHTS = AsyncSingleFlight("upstream_async")    # _aget() (async endpoints), same keys
+BILL_FLIGHTS = SingleFlight("bill_query")                       # prepare_bill_query() per bill
+MATCH_FLIGHTS = AsyncSingleFlight("match")                      # full /match payload per bill + mode + pooling
+MARKET_FLIGHTS = AsyncSingleFlight("polymarket_bills")          # fetch_bills(): Polymarket markets + bill info
+MEMBER_FLIGHTS = AsyncSingleFlight("member_bootstrap")          # sponsor index bootstrap per member
+
 # Chunking
 TARGET_CHUNKS = 8
 MIN_WORDS = 300
@@ -44,6 +115,37 @@ MAX_WORDS = 1500
 OVERLAP_FRACTION = 0.05
 TOPK_RESULTS = 5
 
+# Startup: components load in parallel after the server is up (see /readyz); /match and
+# /match/batch wait up to READY_WAIT seconds for them before answering 503 + Retry-After
+READY_WAIT = float(os.getenv("READY_WAIT", "30"))
+READY_RETRY_AFTER = 5
+
+# POST /match/batch
+MAX_BATCH_BILLS = 100
+BATCH_FETCH_WORKERS = 8
+
+# Upstream fetch stage of /match: text listing -> text download runs next to the CRS
+# summary on a shared pool; each stage has its own deadline (seconds from request start)
+FETCH_WORKERS = int(os.getenv("FETCH_WORKERS", "16"))
+TEXT_STAGE_DEADLINE = float(os.getenv("TEXT_STAGE_DEADLINE", "20"))
+CRS_STAGE_DEADLINE = float(os.getenv("CRS_STAGE_DEADLINE", "10"))
+FETCH_EXECUTOR = concurrent.futures.ThreadPoolExecutor(max_workers=FETCH_WORKERS, thread_name_prefix="fetch")
+
+# Endpoints are async; CPU-bound scoring (encode + bills x companies matrix) runs on this
+# bounded pool instead of the event loop or the request thread pool
+SCORE_WORKERS = int(os.getenv("SCORE_WORKERS", "2"))
+SCORE_EXECUTOR = concurrent.futures.ThreadPoolExecutor(max_workers=SCORE_WORKERS, thread_name_prefix="score")
+
+# Hedged duplicates of latency-critical (interactive) upstream calls (circuit_breaker.hedge_delay)
+HEDGE_WORKERS = int(os.getenv("HEDGE_WORKERS", "32"))
+HEDGE_EXECUTOR = concurrent.futures.ThreadPoolExecutor(max_workers=HEDGE_WORKERS, thread_name_prefix="hedge")
+
+# Concurrent upstream calls of one /graph request
+GRAPH_CONCURRENCY = int(os.getenv("GRAPH_CONCURRENCY", "8"))
+
+# /member_bills: sponsor index (sponsor_index.py), synced in the background once this old
+SPONSOR_SYNC_INTERVAL = float(os.getenv("SPONSOR_SYNC_INTERVAL", "900"))
+
 # ---- Keep original scoring weights exactly ----
 ALPHA = 0.65   # dense
 BETA  = 0.30   # tfidf
@@ -60,22 +162,267 @@ POLYMARKET_EVENT_URL = (
 # =========================
 # HTTP helper
 # =========================
-def _get(url, params=None, max_retries=3, backoff=1.5, timeout=30):
+class StageTimeout(RuntimeError):
+    """A fetch stage did not finish before its deadline."""
+
+# a coalesced call failing with these failed on its leader's deadline / budget wait, not for everyone
+LEADER_FAILURES = (StageTimeout, rate_budget.BudgetTimeout)
+
+def _sleep_until(delay: float, deadline: Optional[float]) -> None:
+    if deadline is not None:
+        delay = min(delay, max(0.0, deadline - time.monotonic()))
+    time.sleep(delay)
+
+def _get(url, params=None, max_retries=3, backoff=1.5, timeout=30, deadline: Optional[float] = None):
+    """
+    GET with retries; with a deadline (time.monotonic()), no attempt or backoff runs past it.
+    Rate-limited hosts (rate_budget.BUCKETS) hand out a token per attempt, by the caller's
+    priority class; a 429 pauses that host's bucket for Retry-After.
+    Cacheable resources (http_cache.RULES) are served from HTTP_CACHE while fresh and
+    revalidated with ETag / Last-Modified once stale.
+    Concurrent calls for the same URL + params (api_key aside) and priority class share
+    one upstream request; a caller's deadline still bounds its own wait, and one that
+    got the leader's deadline or budget timeout tries again itself.
+    Each host has a circuit breaker: while it is open, or once the retries are spent,
+    a stale cache entry is served if there is one, else the error (BreakerOpen) is raised
+    right away. 4xx answers are not retried. Interactive callers hedge slow attempts.
+    """
+    kind, cached, fresh = HTTP_CACHE.lookup(url, params)
+    if fresh:
+        return as_response(cached)
+    _, flight_key = cache_key(url, params)
+    wait = None if deadline is None else max(0.0, deadline - time.monotonic())
+    try:
+        return UPSTREAM_FLIGHTS.do(
+            (flight_key, rate_budget.current_priority()),
+            lambda: _fetch_upstream(url, params, kind, cached, max_retries, backoff, timeout, deadline),
+            timeout=wait, retry=LEADER_FAILURES)
+    except FlightTimeout as e:
+        raise StageTimeout(f"GET {url}: deadline exceeded waiting for an identical in-flight request") from e
+
+_QUERY_RE = re.compile(r"(https?://[^\s?#'\"]+)\?[^\s'\"]*")
+
+def _redact(text: Any) -> str:
+    """str(text) with URL query strings (api_key among them) cut, for logs and error details."""
+    return _QUERY_RE.sub(r"\1", str(text))
+
+def _upstream_http_error(e: Exception, detail: str) -> HTTPException:
+    """HTTPException for a failed upstream GET: 503 while the host's circuit is open, 504 on a deadline or budget timeout, else 404."""
+    if isinstance(e, BreakerOpen):
+        return HTTPException(status_code=503, detail=_redact(e))
+    if isinstance(e, LEADER_FAILURES):
+        return HTTPException(status_code=504, detail=_redact(e))
+    return HTTPException(status_code=404, detail=f"{detail}: {_redact(e)}")
+
+def _stale_or_raise(kind: Optional[str], url: str, cached: Optional[Dict[str, Any]], exc: Exception):
+    """Upstream unavailable: the stale cache entry if there is one, else raise exc."""
+    if cached is None:
+        raise exc
+    print(f"[upstream] {_redact(url)}: {_redact(exc)}; serving the cached copy from {time.ctime(cached['fetched_at'])}")
+    return HTTP_CACHE.serve_stale(kind, cached)
+
+def _send(url, params, timeout: float, headers, breaker: Optional[circuit_breaker.CircuitBreaker]):
+    """
+    http_client.get(); given the host's breaker (latency-critical call), a duplicate goes out
+    once the first request has taken the host's p95 and the first good answer wins.
+    """
+    delay = breaker.hedge_delay() if breaker is not None else None
+    if delay is None or delay >= timeout:
+        return http_client.get(url, params=params, timeout=timeout, headers=headers)
+    first = HEDGE_EXECUTOR.submit(http_client.get, url, params=params, timeout=timeout, headers=headers)
+    try:
+        return first.result(timeout=delay)
+    except concurrent.futures.TimeoutError:
+        pass
+    bucket = rate_budget.for_url(url)
+    if bucket is not None and not bucket.try_acquire():  # a hedge never waits for budget
+        return first.result()
+    second = HEDGE_EXECUTOR.submit(http_client.get, url, params=params, timeout=timeout, headers=headers)
+    hedges = {first: False, second: True}
+    error = None
+    for f in concurrent.futures.as_completed(hedges):
+        try:
+            r = f.result()
+        except requests.RequestException as e:
+            error = e
+            continue
+        breaker.record_hedge(won=hedges[f])
+        return r
+    breaker.record_hedge(won=False)
+    raise error
+
+def _fetch_upstream(url, params, kind: Optional[str], cached: Optional[Dict[str, Any]], max_retries: int,
+                    backoff: float, timeout: float, deadline: Optional[float]) -> requests.Response:
+    cond_headers = HTTP_CACHE.conditional_headers(cached) or None
+    bucket = rate_budget.for_url(url)
+    breaker = circuit_breaker.for_url(url)
+    hedge = breaker if rate_budget.current_priority() == INTERACTIVE else None
     last_exc = None
     for i in range(max_retries):
+        if not breaker.allow():
+            return _stale_or_raise(kind, url, cached, BreakerOpen(f"GET {url}: {breaker.host} is down (circuit open)"))
+        if bucket is not None:
+            wait = None if deadline is None else max(0.0, deadline - time.monotonic())
+            if not bucket.acquire(timeout=wait):
+                breaker.release()
+                if deadline is not None:
+                    raise StageTimeout(f"GET {url}: deadline exceeded waiting for upstream budget") from last_exc
+                raise rate_budget.BudgetTimeout(f"GET {url}: no upstream budget after {bucket.max_wait:.0f}s")
+        attempt_timeout = timeout
+        if deadline is not None:
+            attempt_timeout = min(timeout, deadline - time.monotonic())
+            if attempt_timeout <= 0:
+                breaker.release()
+                raise StageTimeout(f"GET {url}: deadline exceeded") from last_exc
+        t0 = time.monotonic()
+        try:
+            r = _send(url, params, attempt_timeout, cond_headers, hedge)
+        except requests.RequestException as e:
+            breaker.record_failure()
+            last_exc = e
+            _sleep_until(backoff ** i, deadline)
+            continue
+        if circuit_breaker.is_failure_status(r.status_code):
+            breaker.record_failure()
+        else:
+            breaker.record_success(time.monotonic() - t0)
+        if bucket is not None:
+            bucket.observe(r)
+        if r.status_code == 304 and cached is not None:
+            return HTTP_CACHE.revalidated(kind, url, params, cached)
+        if r.status_code == 429:
+            if bucket is None:  # budgeted hosts wait in acquire() instead
+                retry_after = rate_budget.retry_after_seconds(r.headers)
+                _sleep_until(backoff ** i if retry_after is None else retry_after, deadline)
+            continue
         try:
-            r = requests.get(
-                url, params=params, timeout=timeout,
-                headers={"User-Agent": "bill-matcher-api/1.0"},
-            )
-            if r.status_code == 429:
-                time.sleep(backoff ** i); continue
             r.raise_for_status()
-            return r
         except requests.RequestException as e:
+            if r.status_code < 500:
+                raise
             last_exc = e
-            time.sleep(backoff ** i)
-    raise last_exc
+            _sleep_until(backoff ** i, deadline)
+            continue
+        if kind is not None:
+            HTTP_CACHE.store(kind, url, params, r, stale=cached is not None)
+        return r
+    if last_exc is None:
+        raise requests.HTTPError(f"GET {url}: still rate limited after {max_retries} attempts")
+    return _stale_or_raise(kind, url, cached, last_exc)
+
+async def _asleep_until(delay: float, deadline: Optional[float]) -> None:
+    if deadline is not None:
+        delay = min(delay, max(0.0, deadline - time.monotonic()))
+    await asyncio.sleep(delay)
+
+async def _aget(url, params=None, max_retries=3, backoff=1.5, timeout=30, deadline: Optional[float] = None):
+    """
+    _get() for async endpoints: same cache, upstream budget, breaker, retries, hedging and
+    coalescing, on http_client.aget(). Returns an httpx.Response (a requests.Response from the cache).
+    Cache files are read and written in threads, not on the event loop.
+    """
+    kind, cached, fresh = await HTTP_CACHE.alookup(url, params)
+    if fresh:
+        return as_response(cached)
+    _, flight_key = cache_key(url, params)
+    wait = None if deadline is None else max(0.0, deadline - time.monotonic())
+    try:
+        return await UPSTREAM_ASYNC_FLIGHTS.do(
+            (flight_key, rate_budget.current_priority()),
+            lambda: _afetch_upstream(url, params, kind, cached, max_retries, backoff, timeout, deadline),
+            timeout=wait, retry=LEADER_FAILURES)
+    except FlightTimeout as e:
+        raise StageTimeout(f"GET {url}: deadline exceeded waiting for an identical in-flight request") from e
+
+async def _asend(url, params, timeout: float, headers, breaker: Optional[circuit_breaker.CircuitBreaker]):
+    """_send() for coroutines; the slower of two hedged requests is cancelled."""
+    delay = breaker.hedge_delay() if breaker is not None else None
+    if delay is None or delay >= timeout:
+        return await http_client.aget(url, params=params, timeout=timeout, headers=headers)
+    first = asyncio.ensure_future(http_client.aget(url, params=params, timeout=timeout, headers=headers))
+    done, _ = await asyncio.wait({first}, timeout=delay)
+    bucket = rate_budget.for_url(url)
+    if done or (bucket is not None and not bucket.try_acquire()):
+        return await first
+    second = asyncio.ensure_future(http_client.aget(url, params=params, timeout=timeout, headers=headers))
+    pending = {first, second}
+    error = None
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for t in done:
+                if t.exception() is None:
+                    breaker.record_hedge(won=t is second)
+                    return t.result()
+                error = t.exception()
+    finally:
+        for t in pending:
+            t.cancel()
+    breaker.record_hedge(won=False)
+    raise error
+
+async def _afetch_upstream(url, params, kind: Optional[str], cached: Optional[Dict[str, Any]], max_retries: int,
+                           backoff: float, timeout: float, deadline: Optional[float]):
+    cond_headers = HTTP_CACHE.conditional_headers(cached) or None
+    bucket = rate_budget.for_url(url)
+    breaker = circuit_breaker.for_url(url)
+    hedge = breaker if rate_budget.current_priority() == INTERACTIVE else None
+    last_exc = None
+    for i in range(max_retries):
+        if not breaker.allow():
+            return _stale_or_raise(kind, url, cached, BreakerOpen(f"GET {url}: {breaker.host} is down (circuit open)"))
+        if bucket is not None:
+            wait = None if deadline is None else max(0.0, deadline - time.monotonic())
+            if not await bucket.acquire_async(timeout=wait):
+                breaker.release()
+                if deadline is not None:
+                    raise StageTimeout(f"GET {url}: deadline exceeded waiting for upstream budget") from last_exc
+                raise rate_budget.BudgetTimeout(f"GET {url}: no upstream budget after {bucket.max_wait:.0f}s")
+        attempt_timeout = timeout
+        if deadline is not None:
+            attempt_timeout = min(timeout, deadline - time.monotonic())
+            if attempt_timeout <= 0:
+                breaker.release()
+                raise StageTimeout(f"GET {url}: deadline exceeded") from last_exc
+        t0 = time.monotonic()
+        try:
+            r = await _asend(url, params, attempt_timeout, cond_headers, hedge)
+        except httpx.HTTPError as e:
+            breaker.record_failure()
+            last_exc = e
+            await _asleep_until(backoff ** i, deadline)
+            continue
+        if circuit_breaker.is_failure_status(r.status_code):
+            breaker.record_failure()
+        else:
+            breaker.record_success(time.monotonic() - t0)
+        if bucket is not None:
+            bucket.observe(r)
+        if r.status_code == 304 and cached is not None:
+            return await HTTP_CACHE.arevalidated(kind, url, params, cached)
+        if r.status_code == 429:
+            if bucket is None:  # budgeted hosts wait in acquire_async() instead
+                retry_after = rate_budget.retry_after_seconds(r.headers)
+                await _asleep_until(backoff ** i if retry_after is None else retry_after, deadline)
+            continue
+        try:
+            r.raise_for_status()
+        except httpx.HTTPStatusError as e:
+            if r.status_code < 500:
+                raise
+            last_exc = e
+            await _asleep_until(backoff ** i, deadline)
+            continue
+        if kind is not None:
+            await HTTP_CACHE.astore(kind, url, params, r, stale=cached is not None)
+        return r
+    if last_exc is None:
+        raise requests.HTTPError(f"GET {url}: still rate limited after {max_retries} attempts")
+    return _stale_or_raise(kind, url, cached, last_exc)
+
+async def _on_score_executor(fn, *args):
+    """Run CPU-bound scoring on SCORE_EXECUTOR (keeps the caller's upstream priority)."""
+    return await asyncio.wrap_future(rate_budget.submit(SCORE_EXECUTOR, fn, *args))
 
 # =========================
 # Version/format selection (MATCH THE SCRIPT)
@@ -124,118 +471,6 @@ def _pick_best_format(formats: List[dict]) -> Optional[Tuple[str, str]]:
             return t, by_type[t]
     return None
 
-# =========================
-# HTML / XML extraction
-# =========================
-def _html_to_text(html: str) -> str:
-    soup = BeautifulSoup(html, "html.parser")
-    pres = soup.find_all("pre")
-    if pres:
-        text = "\n".join(p.get_text(" ", strip=True) for p in pres)
-    else:
-        for tag in soup(["script", "style", "nav", "header", "footer"]):
-            tag.decompose()
-        text = soup.get_text(" ", strip=True)
-    lines = [re.sub(r"\s+", " ", ln).strip() for ln in text.splitlines()]
-    lines = [ln for ln in lines if ln]
-    return "\n".join(lines)
-
-def _xml_to_text(xml: str) -> str:
-    soup = BeautifulSoup(xml, "xml")
-    for tag in soup.find_all(["metadata", "toc", "page", "img"]):
-        tag.decompose()
-    text = soup.get_text(" ", strip=True)
-    lines = [re.sub(r"\s+", " ", ln).strip() for ln in text.splitlines()]
-    lines = [ln for ln in lines if ln]
-    return "\n".join(lines)
-
-# =========================
-# Cleaner (your rules)
-# =========================
-PAGE_ARTIFACT_RE = re.compile(r"\[\[\s*Page\s+[0-9A-Z.\- ]+\]\]")
-INLINE_TAG_RE = re.compile(r"<<\s*(?:NOTE:|Deadline[^>]*|Effective\s+date[^>]*)\s*.*?>>", re.IGNORECASE | re.DOTALL)
-ALLCAPS_HEADER_RE = re.compile(r"^(?:[A-Z0-9 ,.'\-]{6,})$", re.MULTILINE)
-LEG_HISTORY_START_RE = re.compile(r"^\s*(?:LEGISLATIVE HISTORY|HISTORY|CONGRESSIONAL RECORD)\b.*$", re.IGNORECASE | re.MULTILINE)
-CERT_STAMP_RE = re.compile(r"^\s*(?:Approved\s+[A-Za-z]+\s+\d{1,2},\s+\d{4}\.?|Be it enacted.*)$", re.IGNORECASE | re.MULTILINE)
-LINE_NUMBER_RE = re.compile(r"^\s*\d{1,4}\s+", re.MULTILINE)
-DECOR_DIVIDER_RE = re.compile(r"^\s*[·\-–—_=]{4,}\s*$", re.MULTILINE)
-
-SEC_LINE_RE = re.compile(r"^\s*Sec\.\s*\d+[A-Za-z\-]*\.\s*", re.IGNORECASE)
-SUBSECTION_LINE_RE = re.compile(r"^\s*\(([a-z]|[0-9]+|[A-Z]|i{1,3}|iv|v|vi{0,3}|ix|x)\)\s")
-STRUCTURAL_START_RE = re.compile(r"^\s*(?:Sec\.\s*\d+[A-Za-z\-]*\.|\([a-zA-Z0-9ivxIVX]+\))")
-
-def _standardize_quotes_dashes(s: str) -> str:
-    s = (s.replace("\u2018", "'").replace("\u2019", "'")
-           .replace("\u201C", '"').replace("\u201D", '"')
-           .replace("\u2013", "—").replace("\u2014", "—"))
-    return s
-
-def _strip_leading_trailing_quotes(line: str) -> str:
-    return re.sub(r'^[\'"“”]+|[\'"“”]+\s*$', "", line).strip()
-
-def _normalize_heading_punct(line: str) -> str:
-    if STRUCTURAL_START_RE.match(line) and re.search(r"—\s*$", line):
-        return re.sub(r"—\s*$", ".", line)
-    return line
-
-def clean_statute_text(raw: str) -> str:
-    text = PAGE_ARTIFACT_RE.sub("", raw)
-    text = DECOR_DIVIDER_RE.sub("", text)
-
-    lines = []
-    for ln in text.splitlines():
-        if ALLCAPS_HEADER_RE.match(ln) and not ln.strip().startswith("SEC."):
-            continue
-        if CERT_STAMP_RE.match(ln):
-            continue
-        ln = INLINE_TAG_RE.sub("", ln)
-        lines.append(ln)
-    text = "\n".join(lines)
-
-    parts = re.split(r"(?im)^\s*table of contents\s*$", text, maxsplit=1)
-    if len(parts) == 2:
-        head, rest = parts
-        rest_parts = re.split(r"\n\s*\n", rest, maxsplit=1)
-        text = head + ("\n\n" + (rest_parts[1] if len(rest_parts) > 1 else ""))
-
-    m = LEG_HISTORY_START_RE.search(text)
-    if m:
-        text = text[:m.start()]
-
-    text = _standardize_quotes_dashes(text)
-    text = LINE_NUMBER_RE.sub("", text)
-
-    cleaned_lines = []
-    for ln in text.splitlines():
-        ln = ln.strip()
-        if not ln:
-            cleaned_lines.append("")
-            continue
-        ln = _strip_leading_trailing_quotes(ln)
-        ln = _normalize_heading_punct(ln)
-        cleaned_lines.append(ln)
-    text = "\n".join(cleaned_lines)
-
-    def _merge_preserving_structure(t: str) -> str:
-        out = []; buf = []
-        def flush_buf():
-            if buf:
-                out.append(" ".join(buf).strip()); buf.clear()
-        for ln in t.splitlines():
-            if not ln.strip():
-                flush_buf(); out.append(""); continue
-            if SEC_LINE_RE.match(ln) or SUBSECTION_LINE_RE.match(ln):
-                flush_buf(); out.append(ln.strip())
-            else:
-                buf.append(ln.strip())
-        flush_buf()
-        return re.sub(r"(?:\n\s*){3,}", "\n\n", "\n".join(out)).strip()
-
-    text = _merge_preserving_structure(text)
-    text = re.sub(r"[ \t]+", " ", text)
-    text = re.sub(r"\n{3,}", "\n\n", text).strip()
-    return text
-
 # =========================
 # Chunker (on CLEANED text)
 # =========================
@@ -272,13 +507,13 @@ def chunk_text_few(text: str,
 # =========================
 # CRS summary (MATCH THE SCRIPT)
 # =========================
-def get_crs_summary(bill_type: str, bill_number: int) -> Optional[str]:
+def get_crs_summary(bill_type: str, bill_number: int, deadline: Optional[float] = None) -> Optional[str]:
     api_key = CONGRESS_API_KEY
     if not api_key:
         return None
     normalized_type = normalize_bill_type(bill_type)
     url = f"https://api.congress.gov/v3/bill/{CONGRESS}/{normalized_type}/{bill_number}/summaries"
-    r = _get(url, params={"api_key": api_key, "format": "json", "limit": 50})
+    r = _get(url, params={"api_key": api_key, "format": "json", "limit": 50}, deadline=deadline)
     data = r.json()
 
     items = []
@@ -308,37 +543,6 @@ def get_crs_summary(bill_type: str, bill_number: int) -> Optional[str]:
             pass
     return cand or None
 
-# =========================
-# Keyword prior helpers (MATCH THE SCRIPT)
-# =========================
-from collections import Counter
-def extract_dynamic_terms(bill_text: str, top_ngrams: int = 40, ngram_range=(1, 2), stopwords: Optional[set] = None) -> dict:
-    stop = stopwords or set()
-    text = bill_text.lower()
-    text = re.sub(r'\s+', ' ', text)
-    tokens = re.findall(r"[a-z][a-z0-9\-]+", text)
-    tokens = [t for t in tokens if t not in stop and len(t) > 2]
-    bigrams = [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
-    grams = tokens + bigrams
-    def ok(g):
-        n = len(g.split()); return n >= ngram_range[0] and n <= ngram_range[1]
-    freq = Counter(g for g in grams if ok(g))
-    most = freq.most_common(top_ngrams)
-    if not most: return {}
-    maxf = most[0][1]
-    return {g: 1.0 + (c / maxf) for g, c in most}
-
-def keyword_prior_scores(comp_texts: List[str], term_weights: dict, cap: float = 0.15, per_hit: float = 0.02) -> np.ndarray:
-    out = np.zeros(len(comp_texts), dtype=float)
-    if not term_weights:
-        return out
-    for i, t in enumerate(comp_texts):
-        T = t.lower(); score = 0.0
-        for k, wgt in term_weights.items():
-            if k in T: score += per_hit * wgt * 10
-        out[i] = min(cap, score)
-    return out
-
 # =========================
 # Fetch newest bill (by your priority), clean, chunk
 # =========================
@@ -367,12 +571,17 @@ def normalize_bill_type(bill_type: str) -> str:
     return bill_type.lower()
 
 
-def fetch_clean_and_chunk(bill_type: str, bill_number: int) -> Tuple[str, str, List[str], str]:
+def resolve_text_version(bill_type: str, bill_number: int, deadline: Optional[float] = None) -> Dict[str, Any]:
+    """Pick the newest text version + format (script priority); cached for BILL_VERSION_TTL seconds."""
     if not CONGRESS_API_KEY:
         raise RuntimeError("Congress API key missing.")
     normalized_type = normalize_bill_type(bill_type)
+    rec = BILL_CACHE.get_version(CONGRESS, normalized_type, bill_number)
+    if rec is not None:
+        return rec
+
     endpoint = f"https://api.congress.gov/v3/bill/{CONGRESS}/{normalized_type}/{bill_number}/text"
-    resp = _get(endpoint, params={"api_key": CONGRESS_API_KEY, "format": "json", "limit": 250})
+    resp = _get(endpoint, params={"api_key": CONGRESS_API_KEY, "format": "json", "limit": 250}, deadline=deadline)
     data = resp.json()
     versions = data.get("textVersions", []) or []
     if not versions:
@@ -382,324 +591,691 @@ def fetch_clean_and_chunk(bill_type: str, bill_number: int) -> Tuple[str, str, L
     if not chosen:
         raise RuntimeError("No supported format (Plain/Formatted/XML/PDF) in the selected version.")
     fmt, url = chosen
+    return BILL_CACHE.put_version(CONGRESS, normalized_type, bill_number, best_version.get("date"), fmt, url)
 
-    r = _get(url)
+def _download_bill_text(fmt: str, url: str, deadline: Optional[float] = None) -> str:
+    r = _get(url, deadline=deadline)
     if fmt == "Plain Text":
         raw = "\n".join([ln.strip() for ln in r.text.splitlines() if ln.strip()])
     elif fmt == "Formatted Text":
-        raw = _html_to_text(r.text)
+        raw = html_to_text(r.text)
     elif fmt == "Formatted XML":
-        raw = _xml_to_text(r.text)
+        raw = xml_to_text(r.text)
     else:
         raise RuntimeError("PDF-only for best version; add a PDF-to-text step if needed.")
     if not raw or len(raw) < 50:
         raise RuntimeError("Fetched bill text is unexpectedly short/empty.")
+    return raw
+
+def _write_if_changed(path: str, text: str) -> None:
+    data = text.encode("utf-8")
+    try:
+        if os.path.getsize(path) == len(data):
+            with open(path, "rb") as f:
+                if f.read() == data:
+                    return
+    except OSError:
+        pass
+    with open(path, "wb") as f:
+        f.write(data)
+
+def load_bill_text(bill_type: str, bill_number: int, deadline: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Raw -> cleaned -> chunks for the chosen text version, each layer served from
+    BILL_CACHE when that version was processed before.
+    """
+    version = resolve_text_version(bill_type, bill_number, deadline=deadline)
+    key = version["content_key"]
+
+    cleaned = BILL_CACHE.get("clean", key)
+    if cleaned is None:
+        raw = BILL_CACHE.get("raw", key)
+        if raw is None:
+            raw = _download_bill_text(version["format"], version["url"], deadline=deadline)
+            BILL_CACHE.put("raw", key, raw)
+        cleaned = clean_statute_text(raw)
+        BILL_CACHE.put("clean", key, cleaned)
+
+    chunks = BILL_CACHE.get("chunks", key)
+    if chunks is None:
+        chunks = chunk_text_few(cleaned, target_chunks=TARGET_CHUNKS,
+                                min_words=MIN_WORDS, max_words=MAX_WORDS,
+                                overlap_fraction=OVERLAP_FRACTION)
+        BILL_CACHE.put("chunks", key, chunks)
 
-    cleaned = clean_statute_text(raw)
     bill_id = f"{bill_type.upper()}.{bill_number}"
     bill_text_path = os.path.join(BILL_TEXT_DIR, f"{bill_id.lower()}_clean.txt")
-    with open(bill_text_path, "w", encoding="utf-8") as f:
-        f.write(cleaned)
+    _write_if_changed(bill_text_path, cleaned)
+    return {
+        "bill_id": bill_id,
+        "clean_text": cleaned,
+        "chunks": chunks,
+        "clean_path": bill_text_path,
+        "cache_key": key,
+    }
+
+def fetch_clean_and_chunk(bill_type: str, bill_number: int) -> Tuple[str, str, List[str], str]:
+    t = load_bill_text(bill_type, bill_number)
+    return t["bill_id"], t["clean_text"], t["chunks"], t["clean_path"]
 
-    chunks = chunk_text_few(cleaned, target_chunks=TARGET_CHUNKS,
-                            min_words=MIN_WORDS, max_words=MAX_WORDS,
-                            overlap_fraction=OVERLAP_FRACTION)
-    return bill_id, cleaned, chunks, bill_text_path
+def _stage_result(future: concurrent.futures.Future, deadline: float, stage: str) -> Any:
+    try:
+        return future.result(timeout=max(0.0, deadline - time.monotonic()))
+    except concurrent.futures.TimeoutError:
+        raise StageTimeout(f"{stage} stage exceeded its deadline")
+
+def fetch_bill_inputs(bill_type: str, bill_number: int) -> Tuple[Dict[str, Any], Optional[str], List[str]]:
+    """
+    Fetch stage of /match: (text, CRS summary, warnings). The CRS summary only needs
+    the bill id, so it is requested alongside the text listing/download instead of
+    after it; the summary is then stored under the text version it goes with.
+    A CRS summary that misses CRS_STAGE_DEADLINE is skipped (bill text is used, as
+    when no summary exists) and not cached; a late text stage raises StageTimeout.
+    """
+    start = time.monotonic()
+    text_deadline = start + TEXT_STAGE_DEADLINE
+    crs_deadline = start + CRS_STAGE_DEADLINE
+
+    text_f = rate_budget.submit(FETCH_EXECUTOR, load_bill_text, bill_type, bill_number, text_deadline)
+    pointer = BILL_CACHE.get_version(CONGRESS, normalize_bill_type(bill_type), bill_number)
+    crs_rec = BILL_CACHE.get("crs", pointer["content_key"]) if pointer else None
+    crs_f = None if crs_rec is not None else rate_budget.submit(FETCH_EXECUTOR, get_crs_summary, bill_type, bill_number, crs_deadline)
+
+    text = _stage_result(text_f, text_deadline, "bill text")
+    warnings: List[str] = []
+    if crs_rec is None:
+        crs_rec = BILL_CACHE.get("crs", text["cache_key"])
+    if crs_rec is None:
+        try:
+            crs_rec = {"summary": _stage_result(crs_f, crs_deadline, "CRS summary")}
+            BILL_CACHE.put("crs", text["cache_key"], crs_rec)
+        except (StageTimeout, requests.Timeout) as e:
+            print(f"[fetch] {bill_type.upper()}.{bill_number}: {e}; matching without CRS summary")
+            warnings.append("crs_summary_timeout")
+            crs_rec = {"summary": None}
+        except BreakerOpen as e:
+            print(f"[fetch] {bill_type.upper()}.{bill_number}: {e}; matching without CRS summary")
+            warnings.append("crs_summary_unavailable")
+            crs_rec = {"summary": None}
+    return text, crs_rec["summary"], warnings
 
 # =========================
-# App (model + artifacts loaded ONCE)
+# App (model + artifacts loaded ONCE, in parallel, after the server is up)
 # =========================
 app = FastAPI(title="Bill→S&P500 Matcher (parity with script)", version="1.3.0")
-
-@app.on_event("startup")
-def _startup():
-    app.state.model = SentenceTransformer(MODEL_NAME)
-
-    # Load companies + prebuilt texts
+STARTUP = ComponentLoader()
+STARTED_AT = time.time()
+MATCH_INDEX = MatchIndex(MATCH_INDEX_PATH, readonly=True)  # written by bulk_match.py
+
+def _load_model():
+    app.state.model = load_encoder(ENCODER_BACKEND, MODEL_NAME)
+    return app.state.model
+
+def _load_companies():
+    # Reject artifacts built from another companies.parquet
+    manifest = verify_companies(ARTIFACT_DIR, COMP_DF_PATH)
+    if manifest.get("encoder", ENCODER_BACKEND) != ENCODER_BACKEND:
+        print(f"[encoder] company embeddings were built with {manifest['encoder']}, queries use {ENCODER_BACKEND}")
     app.state.df = pd.read_parquet(COMP_DF_PATH)
+    app.state.companies = CompanyTable(app.state.df)  # result columns only, no per-request df copies
+    return app.state.df
+
+def _load_comp_texts():
     with open(COMP_TEXTS_PATH, "r", encoding="utf-8") as f:
         app.state.comp_texts = list(json.load(f))
-
-    # OPTIONAL: load precomputed company embeddings if available; else compute at first request
-    if os.path.exists(COMP_EMB_PATH):
-        app.state.comp_embs = np.load(COMP_EMB_PATH)  # normalized already
+    return app.state.comp_texts
+
+def _load_comp_embs():
+    # Memory-map precomputed company embeddings if available
+    precision = COMP_EMB_PRECISION
+    codes = quantized_paths(COMP_EMB_PATH, precision)["codes"]
+    if precision != "float32" and not os.path.exists(codes) and os.path.exists(COMP_EMB_PATH):
+        # a missing quantized copy must not mean re-encoding every company
+        print(f"[embeddings] COMP_EMB_PRECISION={precision} but no {codes} (precompute_companies.py "
+              f"--emb-precision {precision}); using the float32 embeddings")
+        precision = "float32"
+    elif precision != "float32" and os.path.exists(codes):
+        # a copy left over from an earlier precompute must not serve another company set
+        try:
+            app.state.comp_embs = EmbeddingStore.open(
+                precision, COMP_EMB_PATH, source_digest=load_manifest(ARTIFACT_DIR).get("embeddings_sha256"))
+            return app.state.comp_embs
+        except StaleCopy as e:
+            print(f"[embeddings] {e}; using the float32 embeddings")
+            precision = "float32"
+    if os.path.exists(quantized_paths(COMP_EMB_PATH, precision)["codes"]):
+        app.state.comp_embs = EmbeddingStore.open(precision, COMP_EMB_PATH)  # normalized already
     else:
-        # Compute once at startup if artifacts missing (slower first boot)
-        comp_texts = app.state.comp_texts
-        app.state.comp_embs = app.state.model.encode(
-            comp_texts, convert_to_numpy=True, normalize_embeddings=True,
+        # Compute once if artifacts missing (slower first boot, float32 in RAM)
+        app.state.comp_embs = EmbeddingStore.from_array(STARTUP.get("model").encode(
+            STARTUP.get("comp_texts"), convert_to_numpy=True, normalize_embeddings=True,
             batch_size=64, show_progress_bar=False
-        )
-
-@app.get("/match")
-def match(bill_type: str = Query(..., min_length=1), bill_number: int = Query(..., ge=1)):
-    try:
-        bill_id, clean_text, chunks, clean_path = fetch_clean_and_chunk(bill_type, bill_number)
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=str(e))
+        ))
+    return app.state.comp_embs
+
+def _load_tfidf():
+    # TF-IDF vectorizer + normalized company matrix (fit once here if artifacts missing)
+    app.state.tfidf = TfidfEngine.load(STARTUP.get("comp_texts"))
+    return app.state.tfidf
+
+def _load_industry_prior():
+    # Industry|Sector label embeddings (version-checked against the companies table)
+    model = None if industry_artifacts_present() else STARTUP.get("model")
+    app.state.industry_prior = IndustryPrior.load(STARTUP.get("companies"), cap=INDUSTRY_PRIOR_CAP, model=model)
+    return app.state.industry_prior
+
+def _load_keyword_index():
+    # Trigram term index over company texts for the keyword prior
+    app.state.keyword_index = KeywordIndex(STARTUP.get("comp_texts"))
+    return app.state.keyword_index
+
+def _load_ann():
+    # IVF index for the dense shortlist on large universes (checked against comp_embs)
+    n = len(STARTUP.get("companies"))
+    app.state.ann = None
+    if n >= ANN_MIN_COMPANIES:
+        if os.path.exists(ANN_INDEX_PATH):
+            app.state.ann = IVFIndex.load(ANN_INDEX_PATH, embs=STARTUP.get("comp_embs"))
+        else:
+            print(f"[ann] {n} companies but no {ANN_INDEX_PATH}; using brute force")
+    return app.state.ann
+
+def warm_up() -> None:
+    """One throwaway query through every scorer so the first request pays no lazy initialization."""
+    text = "warm up query for the bill matcher"
+    q = np.asarray(STARTUP.get("model").encode([text], convert_to_numpy=True, normalize_embeddings=True))
+    STARTUP.get("comp_embs").matmul(q)
+    STARTUP.get("tfidf").sims_matrix([text], mode=TFIDF_MODE)
+    STARTUP.get("industry_prior").boosts_matrix(q)
+    STARTUP.get("keyword_index").scores(extract_dynamic_terms(text), cap=0.15, per_hit=0.02)
+
+for _name, _fn in (("model", _load_model), ("companies", _load_companies), ("comp_texts", _load_comp_texts),
+                   ("comp_embs", _load_comp_embs), ("tfidf", _load_tfidf),
+                   ("industry_prior", _load_industry_prior), ("keyword_index", _load_keyword_index),
+                   ("ann", _load_ann), ("warmup", warm_up)):
+    STARTUP.add(_name, _fn)
+
+def load_state() -> None:
+    """Load every component and wait for it (serve.py calls this before forking)."""
+    STARTUP.start()
+    if STARTUP.wait():
+        raise RuntimeError(f"startup failed: {STARTUP.failed()}")
 
-    model: SentenceTransformer = app.state.model
-    df: pd.DataFrame = app.state.df
-    comp_texts: List[str] = app.state.comp_texts
-    comp_embs: np.ndarray = app.state.comp_embs
+@app.on_event("startup")
+def _startup():
+    # Non-blocking: /recent_bills, /bill_info, /bills, ... serve while the model loads;
+    # /readyz reports progress. Already loaded in workers forked by serve.py.
+    STARTUP.start()
+
+@app.on_event("shutdown")
+async def _shutdown():
+    await http_client.aclose()
+
+def _require_ready() -> None:
+    """Wait up to READY_WAIT for the scoring components; 503 if they are still loading or failed."""
+    missing = STARTUP.wait(timeout=READY_WAIT)
+    if not missing:
+        return
+    failed = STARTUP.failed()
+    if failed:
+        raise HTTPException(status_code=503, detail=f"Startup failed: {failed}")
+    raise HTTPException(status_code=503, detail=f"Warming up; still loading {missing}",
+                        headers={"Retry-After": str(READY_RETRY_AFTER)})
 
-    # ---- Build bill_query_text EXACTLY like the script ----
-    crs = get_crs_summary(bill_type, bill_number)
+# =========================
+# Matching pipeline (shared by /match and /match/batch)
+# =========================
+def prepare_bill_query(bill_type: str, bill_number: int) -> Dict[str, Any]:
+    """Fetch/clean/chunk the bill and build bill_query_text EXACTLY like the script."""
+    key = (normalize_bill_type(bill_type), int(bill_number), rate_budget.current_priority())
+    return BILL_FLIGHTS.do(key, lambda: _prepare_bill_query(bill_type, bill_number), retry=LEADER_FAILURES)
+
+def _prepare_bill_query(bill_type: str, bill_number: int) -> Dict[str, Any]:
+    text, crs, warnings = fetch_bill_inputs(bill_type, bill_number)
+    chunks = text["chunks"]
     if crs:
         long_chunk = max(chunks, key=len) if chunks else ""
         bill_query_text = (crs + "\n\n" + long_chunk)[:6000]
     else:
         bill_query_text = " ".join(sorted(chunks, key=len, reverse=True)[:3])
+    return {
+        "bill_id": text["bill_id"],
+        "clean_text": text["clean_text"],
+        "clean_path": text["clean_path"],
+        "crs": crs,
+        "chunks": chunks,
+        "query_text": bill_query_text,
+        "warnings": warnings,
+    }
 
-    # ---- Dense (company embeddings vs q_emb)
-    q_emb = model.encode([bill_query_text], convert_to_numpy=True, normalize_embeddings=True)
-    dense_sims = (q_emb @ comp_embs.T).ravel()
-
-    # ---- TF-IDF: FIT PER REQUEST on comp_texts + bill_query_text (parity)
-    vect = TfidfVectorizer(min_df=2, ngram_range=(1, 2))
-    X = vect.fit_transform(comp_texts + [bill_query_text])
-    D, q = X[:-1], X[-1]
-    D = sk_normalize(D); q = sk_normalize(q)
-    tfidf_sims = (D @ q.T).toarray().ravel()
-
-    # ---- Keyword prior from (CRS or cleaned bill) (parity with script)
-    source_text = crs if crs else clean_text
-    dyn_terms = extract_dynamic_terms(source_text, top_ngrams=40, ngram_range=(1, 2))
-    kprior = keyword_prior_scores(comp_texts, dyn_terms, cap=0.15, per_hit=0.02)
-
-    # ---- Industry prior (re-embed uniq labels per request like the script)
-    labels = (df["industry"].fillna("") + " | " + df["sector"].fillna("")).tolist()
-    uniq = sorted(set(labels))
-    if uniq:
-        uniq_label_embs = model.encode(uniq, convert_to_numpy=True, normalize_embeddings=True)
-        sims_to_labels = (q_emb @ uniq_label_embs.T).ravel()
-        lbl2sim = {l: s for l, s in zip(uniq, sims_to_labels)}
-        ind_raw = np.array([lbl2sim.get(l, 0.0) for l in labels], dtype=float)
-        if ind_raw.max() > ind_raw.min():
-            ind_boosts = INDUSTRY_PRIOR_CAP * (ind_raw - ind_raw.min()) / (ind_raw.max() - ind_raw.min())
-        else:
-            ind_boosts = np.zeros_like(ind_raw)
+def encode_queries(query_texts: List[str]) -> np.ndarray:
+    """Normalized query embeddings; only texts not seen before go through the encoder."""
+    model = app.state.model
+    keys = [text_key(model.name, t) for t in query_texts]
+    embs = [BILL_CACHE.get("qemb", k) for k in keys]
+    todo = [i for i, e in enumerate(embs) if e is None]
+    if todo:
+        fresh = model.encode([query_texts[i] for i in todo], convert_to_numpy=True,
+                             normalize_embeddings=True, batch_size=64, show_progress_bar=False)
+        for i, e in zip(todo, fresh):
+            embs[i] = e
+            BILL_CACHE.put("qemb", keys[i], e.copy())  # a row view would keep all of fresh alive
+    return np.vstack(embs)
+
+def pool_dense(view_sims: np.ndarray, pooling: str) -> np.ndarray:
+    """(views x companies) similarities -> one dense score per company."""
+    if pooling == "max":
+        return view_sims.max(axis=0)
+    if pooling == "mean":
+        return view_sims.mean(axis=0)
+    raise ValueError(f"Unknown dense pooling: {pooling}")
+
+def encode_views(bills: List[Dict[str, Any]]) -> List[np.ndarray]:
+    """Per bill, embeddings of [query_text] + chunks, from one batched encode call."""
+    views = [[b["query_text"]] + list(b["chunks"]) for b in bills]
+    V = encode_queries([t for v in views for t in v])
+    bounds = np.cumsum([0] + [len(v) for v in views])
+    return [V[a:z] for a, z in zip(bounds[:-1], bounds[1:])]
+
+def bill_features(bills: List[Dict[str, Any]], pooling: str = "query") -> Tuple[np.ndarray, List[np.ndarray], List[dict]]:
+    """
+    (Q, views, terms): query embeddings (one batched encode, cached queries skipped),
+    per-bill dense views (chunk embeddings when pooling) and keyword prior terms.
+    """
+    query_texts = [b["query_text"] for b in bills]
+    if pooling == "query":
+        Q = encode_queries(query_texts)
+        views = [q[None, :] for q in Q]
     else:
-        ind_boosts = np.zeros(len(df))
+        views = encode_views(bills)
+        Q = np.vstack([v[0] for v in views])  # the query-text embedding drives the industry prior
+
+    # Keyword prior terms from (CRS or cleaned bill) (parity with script)
+    terms = [extract_dynamic_terms(b["crs"] or b["clean_text"], top_ngrams=40, ngram_range=(1, 2)) for b in bills]
+    return Q, views, terms
+
+def score_bill_queries(bills: List[Dict[str, Any]], mode: str, pooling: str = "query",
+                       features: Optional[Tuple[np.ndarray, List[np.ndarray], List[dict]]] = None) -> np.ndarray:
+    """
+    Hybrid scores as a (bills x companies) matrix. All query texts are encoded in
+    one batched call; dense, TF-IDF, keyword and industry terms are matrices.
+    With an ANN index loaded, only each bill's shortlist is scored (others are -inf,
+    and top_k_indices never returns them).
+    """
+    comp_embs: EmbeddingStore = app.state.comp_embs
+    tfidf: TfidfEngine = app.state.tfidf
+    keyword_index: KeywordIndex = app.state.keyword_index
+    industry_prior: IndustryPrior = app.state.industry_prior
+
+    query_texts = [b["query_text"] for b in bills]
+    Q, views, terms = features if features is not None else bill_features(bills, pooling)
+
+    if app.state.ann is not None:
+        return _score_shortlists(bills, Q, views, terms, mode, pooling)
+
+    if pooling == "query":
+        dense_sims = comp_embs.matmul(Q)
+    else:
+        dense_sims = np.vstack([pool_dense(comp_embs.matmul(v), pooling) for v in views])
+
+    # ---- TF-IDF: transform queries against cached matrix (or refit per bill in parity mode)
+    tfidf_sims = tfidf.sims_matrix(query_texts, mode=mode)
+
+    kprior = np.vstack([keyword_index.scores(t, cap=0.15, per_hit=0.02) for t in terms])
+
+    # ---- Industry prior (precomputed label embeddings: one matmul + gather)
+    ind_boosts = industry_prior.boosts_matrix(Q)
 
     # ---- FINAL SCORING (unchanged)
     base = (ALPHA * dense_sims) + (BETA * tfidf_sims) + (GAMMA_K * kprior)
-    final_scores = base + ind_boosts
+    return base + ind_boosts
 
-    out = df.copy()
-    out["dense_sim"] = dense_sims
-    out["tfidf_sim"] = tfidf_sims
-    out["hybrid_score"] = final_scores
+def _score_shortlists(bills: List[Dict[str, Any]], Q: np.ndarray, views: List[np.ndarray],
+                      terms: List[dict], mode: str, pooling: str) -> np.ndarray:
+    """
+    Same hybrid formula, restricted to the top ANN_CANDIDATES dense neighbours per
+    bill (per view when pooling chunks; the shortlist is their union).
+    """
+    comp_embs: EmbeddingStore = app.state.comp_embs
+    ann: IVFIndex = app.state.ann
+    out = np.full((len(bills), len(comp_embs)), -np.inf)
+    for r, (b, q, v, t) in enumerate(zip(bills, Q, views, terms)):
+        if pooling == "query":
+            ids, dense = ann.search(comp_embs, q, ANN_CANDIDATES, ANN_NPROBE)
+        else:
+            ids = np.unique(np.concatenate([ann.search(comp_embs, e, ANN_CANDIDATES, ANN_NPROBE)[0] for e in v]))
+            dense = pool_dense(v @ comp_embs[ids].T, pooling)
+        tfidf_sims = app.state.tfidf.sims_subset(b["query_text"], ids, mode=mode)
+        kprior = app.state.keyword_index.scores_subset(t, ids, cap=0.15, per_hit=0.02)
+        ind_boosts = app.state.industry_prior.boosts_subset(q, ids)
+        out[r, ids] = (ALPHA * dense) + (BETA * tfidf_sims) + (GAMMA_K * kprior) + ind_boosts
+    return out
 
-    top = out.nlargest(TOPK_RESULTS, "hybrid_score")[["ticker", "name", "sector", "industry", "hybrid_score"]]
-    snippet = (crs or clean_text)[:280] + ("..." if len((crs or clean_text)) > 280 else "")
+def score_breakdown(bill: Dict[str, Any], q: np.ndarray, view: np.ndarray, terms: dict, ids: np.ndarray,
+                    mode: str, pooling: str) -> Dict[str, np.ndarray]:
+    """
+    Unweighted hybrid terms for companies ids (one bill's row of bill_features):
+    hybrid = ALPHA*dense + BETA*tfidf + GAMMA_K*keyword + industry.
+    """
+    comp_embs: EmbeddingStore = app.state.comp_embs
+    rows = comp_embs[ids]
+    dense = rows @ q if pooling == "query" else pool_dense(view @ rows.T, pooling)
+    return {
+        "dense": dense,
+        "tfidf": app.state.tfidf.sims_subset(bill["query_text"], ids, mode=mode),
+        "keyword": app.state.keyword_index.scores_subset(terms, ids, cap=0.15, per_hit=0.02),
+        "industry": app.state.industry_prior.boosts_subset(q, ids),
+    }
 
-    return JSONResponse({
-        "bill_id": bill_id,
+def match_payload(bill: Dict[str, Any], final_scores: np.ndarray, mode: str, pooling: str,
+                  topk: int = TOPK_RESULTS) -> Dict[str, Any]:
+    """Response body of /match for one scored bill (top-k rows joined from the string tables)."""
+    companies: CompanyTable = app.state.companies
+    snippet_source = bill["crs"] or bill["clean_text"]
+    snippet = snippet_source[:280] + ("..." if len(snippet_source) > 280 else "")
+
+    payload = {
+        "bill_id": bill["bill_id"],
         "congress": CONGRESS,
         "weights": {"alpha_dense": ALPHA, "beta_tfidf": BETA, "gamma_kprior": GAMMA_K},
         "industry_prior_cap": INDUSTRY_PRIOR_CAP,
-        "clean_text_path": clean_path,
-        "topk": TOPK_RESULTS,
+        "tfidf_mode": mode,
+        "dense_pooling": pooling,
+        "clean_text_path": bill["clean_path"],
+        "topk": topk,
         "snippet": snippet,
-        "results": top.to_dict(orient="records"),
+        "results": companies.top_records(final_scores, topk),
+    }
+    if bill.get("warnings"):
+        payload["warnings"] = bill["warnings"]
+    return payload
+
+def _check_tfidf_mode(tfidf_mode: Optional[str]) -> str:
+    mode = tfidf_mode or TFIDF_MODE
+    if mode not in TFIDF_MODES:
+        raise HTTPException(status_code=400, detail=f"tfidf_mode must be one of {TFIDF_MODES}")
+    return mode
+
+def _check_dense_pooling(dense_pooling: Optional[str]) -> str:
+    pooling = dense_pooling or DENSE_POOLING
+    if pooling not in DENSE_POOLINGS:
+        raise HTTPException(status_code=400, detail=f"dense_pooling must be one of {DENSE_POOLINGS}")
+    return pooling
+
+@app.get("/match")
+@with_priority(INTERACTIVE)
+async def match(
+    bill_type: str = Query(..., min_length=1),
+    bill_number: int = Query(..., ge=1),
+    tfidf_mode: Optional[str] = Query(None, description="transform (default) | parity"),
+    dense_pooling: Optional[str] = Query(None, description="query (default) | max | mean over bill chunks"),
+):
+    mode = _check_tfidf_mode(tfidf_mode)
+    pooling = _check_dense_pooling(dense_pooling)
+    key = (normalize_bill_type(bill_type), bill_number, mode, pooling)
+    try:
+        payload = await MATCH_FLIGHTS.do(key, lambda: _match_payload(bill_type, bill_number, mode, pooling),
+                                         retry=LEADER_FAILURES)
+    except LEADER_FAILURES as e:
+        raise HTTPException(status_code=504, detail=str(e))
+    except BreakerOpen as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    return JSONResponse(payload)
+
+async def _match_payload(bill_type: str, bill_number: int, mode: str, pooling: str) -> Dict[str, Any]:
+    # the fetch stage keeps its threads + deadlines (shared with bulk_match.py / top5companies.py)
+    try:
+        bill = await run_in_threadpool(prepare_bill_query, bill_type, bill_number)
+    except (*LEADER_FAILURES, BreakerOpen):
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return await _on_score_executor(_score_one, bill, mode, pooling)
+
+def _score_one(bill: Dict[str, Any], mode: str, pooling: str) -> Dict[str, Any]:
+    _require_ready()  # the bill fetch above overlaps a cold start
+    final_scores = score_bill_queries([bill], mode, pooling)[0]
+    return match_payload(bill, final_scores, mode, pooling)
+
+
+@app.get("/cache/stats")
+def cache_stats():
+    """
+    Hit/miss counters of the bill processing cache, per layer, and of the upstream
+    HTTP cache, per resource kind (http_cache.RULES).
+    """
+    return JSONResponse({**BILL_CACHE.stats(), "http": HTTP_CACHE.stats()})
+
+
+@app.get("/http/stats")
+def http_stats():
+    """Upstream requests per host and how many of them reused a pooled connection (this worker)."""
+    return JSONResponse(http_client.stats())
+
+
+@app.get("/singleflight/stats")
+def singleflight_stats():
+    """Calls per coalescing group and how many of them waited on an identical in-flight call (this worker)."""
+    return JSONResponse(single_flight.stats())
+
+
+@app.get("/upstream/health")
+def upstream_health():
+    """Circuit breaker per upstream host of this worker: state, failures, latency p50/p95, hedged calls."""
+    return JSONResponse(circuit_breaker.status())
+
+@app.get("/upstream/budget")
+def upstream_budget():
+    """Remaining Congress.gov budget of this worker: tokens, queued callers and 429s per priority class."""
+    return JSONResponse(rate_budget.budget_status())
+
+
+@app.get("/healthz")
+def healthz():
+    """Liveness: the process is up and serving (the model may still be loading)."""
+    return JSONResponse({"status": "ok", "pid": os.getpid(), "uptime_s": round(time.time() - STARTED_AT, 1)})
+
+
+@app.get("/readyz")
+def readyz():
+    """
+    Readiness for /match: 200 once every component is loaded, else 503. Per component:
+    state and seconds from startup to ready (including waits on the components it needs).
+    """
+    ready = STARTUP.ready()
+    payload = {
+        "ready": ready,
+        "failed": bool(STARTUP.failed()),
+        "encoder": ENCODER_BACKEND,
+        "components": STARTUP.status(),
+    }
+    return JSONResponse(payload, status_code=200 if ready else 503)
+
+
+class BillRef(BaseModel):
+    bill_type: str = Field(..., min_length=1)
+    bill_number: int = Field(..., ge=1)
+
+class BatchMatchRequest(BaseModel):
+    bills: List[BillRef] = Field(..., min_length=1, max_length=MAX_BATCH_BILLS)
+    topk: int = Field(TOPK_RESULTS, ge=1, le=100)
+    tfidf_mode: Optional[str] = None
+    dense_pooling: Optional[str] = None
+
+@app.post("/match/batch")
+@with_priority(INTERACTIVE)
+async def match_batch(req: BatchMatchRequest):
+    """
+    Match many bills at once: texts are fetched concurrently, all query texts are
+    encoded in a single batch and scored as (bills x companies) matrices.
+    Each result has the /match shape; bills that fail carry an 'error' instead.
+    """
+    mode = _check_tfidf_mode(req.tfidf_mode)
+    pooling = _check_dense_pooling(req.dense_pooling)
+
+    prepared, errors = await run_in_threadpool(_prepare_bills, req.bills)
+    ok = [i for i, b in enumerate(prepared) if b is not None]
+    payloads = await _on_score_executor(_score_batch, [prepared[i] for i in ok], mode, pooling, req.topk) if ok else []
+
+    results = []
+    row = {i: r for r, i in enumerate(ok)}
+    for i, ref in enumerate(req.bills):
+        if i in errors:
+            results.append({
+                "bill_id": f"{ref.bill_type.upper()}.{ref.bill_number}",
+                "error": errors[i],
+            })
+        else:
+            results.append(payloads[row[i]])
+
+    return JSONResponse({"count": len(results), "failed": len(errors), "results": results})
+
+def _prepare_bills(refs: List[BillRef]) -> Tuple[List[Optional[Dict[str, Any]]], Dict[int, str]]:
+    prepared: List[Optional[Dict[str, Any]]] = [None] * len(refs)
+    errors: Dict[int, str] = {}
+    with concurrent.futures.ThreadPoolExecutor(max_workers=BATCH_FETCH_WORKERS) as executor:
+        futures = {
+            rate_budget.submit(executor, prepare_bill_query, b.bill_type, b.bill_number): i
+            for i, b in enumerate(refs)
+        }
+        for future in concurrent.futures.as_completed(futures):
+            i = futures[future]
+            try:
+                prepared[i] = future.result()
+            except Exception as e:
+                errors[i] = str(e)
+    return prepared, errors
+
+def _score_batch(bills: List[Dict[str, Any]], mode: str, pooling: str, topk: int) -> List[Dict[str, Any]]:
+    _require_ready()
+    scores = score_bill_queries(bills, mode, pooling)
+    return [match_payload(b, scores[r], mode, pooling, topk=topk) for r, b in enumerate(bills)]
+
+
+@app.get("/company/{ticker}/bills")
+def company_bills(
+    ticker: str,
+    limit: int = Query(20, ge=1, le=200),
+    min_score: Optional[float] = Query(None, description="only matches with hybrid_score >= this"),
+):
+    """
+    Bills whose precomputed top-k (bulk_match.py) contains ticker, best match first.
+    Served from the match index only; the model does not need to be loaded.
+    """
+    if not MATCH_INDEX.exists():
+        raise HTTPException(status_code=503, detail="Match index not built yet; run bulk_match.py")
+    bills = MATCH_INDEX.bills_for_ticker(ticker, limit, min_score)
+    last = MATCH_INDEX.last_run()
+    return JSONResponse({
+        "ticker": ticker.upper(),
+        "congress": CONGRESS,
+        "count": len(bills),
+        "index_updated_at": last["finished_at"] if last else None,
+        "bills": bills,
     })
 
 
+SPONSOR_INDEX = SponsorIndex(SPONSOR_INDEX_PATH)
+_SPONSOR_SYNC = threading.Lock()
+
+def congress_json(url: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """GET a Congress.gov API URL (api_key + JSON format added) through _get()."""
+    r = _get(url, params={"api_key": CONGRESS_API_KEY, "format": "json", **(params or {})})
+    r.raise_for_status()
+    return r.json()
+
+async def acongress_json(url: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """congress_json() through _aget(), for async endpoints."""
+    r = await _aget(url, params={"api_key": CONGRESS_API_KEY, "format": "json", **(params or {})})
+    r.raise_for_status()
+    return r.json()
+
+async def _abootstrap_member(bioguide_id: str) -> None:
+    await MEMBER_FLIGHTS.do(
+        bioguide_id, lambda: sponsor_index.abootstrap_member(SPONSOR_INDEX, acongress_json, bioguide_id))
+
+@with_priority(BACKGROUND)
+def _sync_sponsor_index() -> None:
+    try:
+        stats = sponsor_index.sync(SPONSOR_INDEX, congress_json)
+        print(f"[sponsor_index] synced: {stats}")
+    except Exception as e:
+        SPONSOR_INDEX.drop_lease()
+        print(f"[sponsor_index] sync failed: {e}")
+    finally:
+        _SPONSOR_SYNC.release()
+
+def _maybe_sync_sponsor_index() -> None:
+    """Start a background sync when the last one is SPONSOR_SYNC_INTERVAL old (one per deployment)."""
+    through = SPONSOR_INDEX.synced_through()
+    if through is None or time.time() - through < SPONSOR_SYNC_INTERVAL:
+        return
+    if not _SPONSOR_SYNC.acquire(blocking=False):
+        return
+    if not SPONSOR_INDEX.take_lease():
+        _SPONSOR_SYNC.release()
+        return
+    threading.Thread(target=_sync_sponsor_index, name="sponsor-sync", daemon=True).start()
+
 @app.get("/member_bills")
-def get_member_bills(
+async def get_member_bills(
     bioguide_id: str = Query(..., description="Bioguide ID of the congressman (e.g., 'P000197')"),
-    limit: int = Query(5, ge=1, le=20, description="Number of bills to return (max 20)"),
+    limit: int = Query(5, ge=1, le=250, description="Number of bills to return"),
+    offset: int = Query(0, ge=0),
     congress: Optional[int] = Query(None, description="Congress number (default: 119)")
 ):
     """
-    Fetch the most recent bills sponsored by a specific congressman.
-    Returns up to 'limit' bills (default 5, max 20) sorted by introduced date (most recent first).
+    Bills sponsored by a specific congressman in a congress, sorted by introduced date
+    (most recent first), from the local sponsor index. A member's first request
+    bootstraps the index from their Congress.gov sponsored-legislation listing.
+    cosponsors_count is null for bills indexed from that listing (it has no count).
     """
     congress_num = congress or CONGRESS
     bioguide_id_upper = bioguide_id.upper().strip()
     
     if not bioguide_id_upper:
         raise HTTPException(status_code=400, detail="bioguide_id is required")
-    
-    # Strategy: Fetch recent bills and check sponsors
-    # To be efficient, we fetch a smaller batch to reduce API calls
-    # Congress.gov API returns bills sorted by latest action, but we want by introduced date
-    # Reduce fetch_limit to avoid timeout - check fewer bills
-    fetch_limit = min(50, limit * 5)  # Fetch smaller batch to reduce timeout risk
-    
-    try:
-        # Fetch recent bills
-        url = "https://api.congress.gov/v3/bill"
-        r = _get(
-            url,
-            params={
-                "api_key": CONGRESS_API_KEY,
-                "format": "json",
-                "congress": congress_num,
-                "limit": fetch_limit,
-                "sort": "updateDate",  # Sort by update date
-                "sortOrder": "desc",
-            },
-        )
-    except Exception as e:
-        raise HTTPException(status_code=502, detail=f"Congress API error: {e}")
-    
-    data = r.json()
-    all_bills = data.get("bills", []) or []
-    
-    # Filter bills by sponsor bioguide ID
-    # We need to check each bill's detailed info to get sponsors
-    # Use shorter timeout per bill to avoid overall timeout
-    matching_bills = []
-    
-    # Import threading for parallel requests (optional optimization)
-    import concurrent.futures
-    
-    def check_bill_sponsor(bill, default_congress, bioguide_id_upper):
-        """Check if a bill is sponsored by the given bioguide ID"""
+
+    # index reads are sqlite calls (they can wait on the sync writer): keep them off the event loop
+    if await run_in_threadpool(SPONSOR_INDEX.bootstrapped_at, bioguide_id_upper) is None:
         try:
-            bill_type = bill.get("type", "").lower()
-            bill_number = bill.get("number")
-            
-            if not bill_type or not bill_number:
-                return None
-            
-            # Get congress from bill object if available, otherwise use default
-            bill_congress = bill.get("congress") or default_congress
-            
-            # Try fetching with the bill's congress number, fallback to nearby congresses if 404
-            congresses_to_try = [bill_congress]
-            if bill_congress != default_congress:
-                congresses_to_try.append(default_congress)
-            # Add nearby congresses as fallback (try 1-2 congresses earlier)
-            if bill_congress > 115:
-                congresses_to_try.extend([bill_congress - 1, bill_congress - 2])
-            
-            bill_detail = None
-            for congress_num_attempt in congresses_to_try:
-                try:
-                    # Fetch bill details to get sponsor info with shorter timeout
-                    bill_detail_url = f"https://api.congress.gov/v3/bill/{congress_num_attempt}/{bill_type}/{bill_number}"
-                    bill_detail_resp = _get(
-                        bill_detail_url,
-                        params={
-                            "api_key": CONGRESS_API_KEY,
-                            "format": "json",
-                        },
-                        timeout=5,  # 5 second timeout per bill
-                    )
-                    bill_detail = bill_detail_resp.json()
-                    
-                    # Check if we got an error response
-                    if "error" in bill_detail:
-                        continue  # Try next congress number
-                    
-                    # Successfully fetched, break out of loop
-                    break
-                except Exception as e:
-                    # If it's a 404, try next congress number
-                    if hasattr(e, 'response') and e.response is not None and e.response.status_code == 404:
-                        continue
-                    # For other errors, log and continue to next congress
-                    print(f"Error fetching bill {bill_type}.{bill_number} from Congress {congress_num_attempt}: {e}")
-                    continue
-            
-            if not bill_detail or "error" in bill_detail:
-                # Could not find bill in any congress we tried
-                return None
-            
-            # Check if any sponsor matches
-            sponsors = bill_detail.get("sponsors", []) or []
-            is_sponsored = any(
-                sponsor.get("bioguideId", "").upper() == bioguide_id_upper
-                for sponsor in sponsors
-            )
-            
-            if is_sponsored:
-                # Get status
-                actions = bill_detail.get("actions", []) or []
-                latest_action = bill_detail.get("latestAction", {})
-                latest_action_text = latest_action.get("text", "")
-                
-                status = determine_bill_status(actions, latest_action_text)
-                
-                # Build result
-                normalized_type = normalize_bill_type(bill_type).upper()
-                bill_id = f"{normalized_type}.{bill_number}"
-                
-                return {
-                    "bill_id": bill_id,
-                    "title": bill_detail.get("title") or bill.get("title"),
-                    "introduced_date": bill_detail.get("introducedDate") or bill.get("introducedDate"),
-                    "latest_action": {
-                        "date": latest_action.get("actionDate") or bill_detail.get("introducedDate"),
-                        "text": latest_action_text,
-                    },
-                    "status": status,
-                    "cosponsors_count": (bill_detail.get("cosponsors") or {}).get("count", 0),
-                    "url": bill_detail.get("url") or bill.get("url"),
-                    "summary": bill_detail.get("summary", {}).get("text", "") if isinstance(bill_detail.get("summary"), dict) else "",
-                    "committees": [
-                        c.get("name", "") 
-                        for c in (bill_detail.get("committees", []) or [])
-                    ],
-                }
-            
-            return None
+            await _abootstrap_member(bioguide_id_upper)
+        except (requests.HTTPError, httpx.HTTPStatusError) as e:
+            if e.response is not None and e.response.status_code == 404:
+                raise HTTPException(status_code=404, detail=f"Unknown member {bioguide_id_upper}")
+            raise HTTPException(status_code=502, detail=f"Congress API error: {_redact(e)}")
         except Exception as e:
-            # Skip bills that fail to fetch (might be invalid or missing)
-            print(f"Error processing bill {bill.get('type', 'unknown')}.{bill.get('number', 'unknown')}: {e}")
-            return None
-    
-    # Process bills with limited concurrency to avoid overwhelming the API
-    # Use ThreadPoolExecutor with max 5 concurrent requests
-    with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
-        # Submit all bill checks
-        future_to_bill = {
-            executor.submit(check_bill_sponsor, bill, congress_num, bioguide_id_upper): bill
-            for bill in all_bills[:fetch_limit]  # Only check the first fetch_limit bills
-        }
-        
-        # Collect results as they complete
-        for future in concurrent.futures.as_completed(future_to_bill):
-            if len(matching_bills) >= limit:
-                # Cancel remaining tasks if we have enough (best effort - may not cancel running tasks)
-                for f in future_to_bill:
-                    if not f.done():
-                        f.cancel()
-                break
-                
-            try:
-                result = future.result(timeout=10)  # 10 second timeout per future
-                if result:
-                    matching_bills.append(result)
-            except concurrent.futures.CancelledError:
-                # Task was cancelled, skip it
-                continue
-            except Exception as e:
-                print(f"Error processing bill: {e}")
-                continue
-    
-    # Sort by introduced date (most recent first)
-    matching_bills.sort(
-        key=lambda x: x.get("introduced_date") or "", 
-        reverse=True
-    )
-    
-    # Limit results
-    results = matching_bills[:limit]
-    
+            raise HTTPException(status_code=502, detail=f"Congress API error: {_redact(e)}")
+    await run_in_threadpool(_maybe_sync_sponsor_index)
+
+    rows, total = await run_in_threadpool(SPONSOR_INDEX.bills_for_member, bioguide_id_upper,
+                                          congress_num, limit, offset)
+    results = [{
+        "bill_id": f"{r['bill_type'].upper()}.{r['bill_number']}",
+        "title": r["title"],
+        "introduced_date": r["introduced_date"],
+        "latest_action": r["latest_action"],
+        "status": determine_bill_status([], r["latest_action"]["text"] or ""),
+        "policy_area": r["policy_area"],
+        "cosponsors_count": r["cosponsors_count"],  # None: not in the listing (bootstrapped); /bill_info has it
+        "url": r["url"],
+        "summary": "",  # not in the listing; /bill_info has the details
+        "committees": [],
+    } for r in rows]
+    through = await run_in_threadpool(SPONSOR_INDEX.synced_through)
+
     return {
         "count": len(results),
+        "total": total,
         "bioguide_id": bioguide_id_upper,
         "congress": congress_num,
+        "index_synced_through": through,
         "bills": results,
     }
 
 
 @app.get("/recent_bills")
-def recent_bills(
+async def recent_bills(
     limit: int = Query(10, ge=1, le=100, description="Number of bills to return"),
     offset: int = Query(0, ge=0, description="Offset for pagination"),
 ):
@@ -720,7 +1296,7 @@ def recent_bills(
     
     try:
         # Congress.gov API v3 supports offset parameter directly
-        r = _get(
+        r = await _aget(
             url,
             params={
                 "api_key": CONGRESS_API_KEY,
@@ -807,7 +1383,7 @@ def recent_bills(
 
 
 @app.get("/bill_info")
-def get_bill_info(
+async def get_bill_info(
     bill_type: str = Query(..., description="Bill type (e.g., 'hr', 's', 'hjres')"),
     bill_number: int = Query(..., description="Bill number", ge=1),
     congress: Optional[int] = Query(None, description="Congress number (default: 117)")
@@ -818,10 +1394,10 @@ def get_bill_info(
     params = {"api_key": CONGRESS_API_KEY, "format": "json"}
 
     try:
-        response = _get(bill_url, params=params)
+        response = await _aget(bill_url, params=params)
         data = response.json()
     except Exception as e:
-        raise HTTPException(status_code=404, detail=f"Bill not found: {str(e)}")
+        raise _upstream_http_error(e, "Bill not found")
 
     bill = data.get("bill", {}) or {}
     latest_action = bill.get("latestAction") or {}
@@ -861,7 +1437,7 @@ def get_bill_info(
 
 
 @app.get("/polymarket_bills")
-def get_polymarket_bills():
+async def get_polymarket_bills():
     """
     Fetch bill odds from Polymarket event page.
     Scrapes the specific Polymarket event page for bills and their odds.
@@ -870,7 +1446,7 @@ def get_polymarket_bills():
     
     try:
         # Fetch the page
-        response = _get(url, timeout=30)
+        response = await _aget(url, timeout=30)
         soup = BeautifulSoup(response.text, 'html.parser')
         
         # Parse bill data from the page
@@ -1141,7 +1717,7 @@ def determine_bill_status(actions: list, latest_action_text: str = "") -> str:
     return "Pending"
 
 
-def get_bill_info_data(
+async def get_bill_info_data(
     bill_type: str,
     bill_number: int,
     congress: Optional[int] = None,
@@ -1153,7 +1729,7 @@ def get_bill_info_data(
     params = {"api_key": CONGRESS_API_KEY, "format": "json"}
 
     try:
-        response = _get(bill_url, params=params)
+        response = await _aget(bill_url, params=params)
         data = response.json()
     except Exception as e:
         # Surface a compact error payload instead of failing the whole list
@@ -1209,14 +1785,38 @@ def get_bill_info_data(
 # ---------------------------
 # 3) Polymarket fetch + enrich
 # ---------------------------
-def fetch_bills(congress: Optional[int] = None):
+async def fetch_bills(congress: Optional[int] = None):
     """
     Fetch markets from Polymarket; for each market, parse bill id and enrich
-    with Congress.gov bill info (same as /bill_info).
+    with Congress.gov bill info (same as /bill_info), all bills concurrently.
+    Concurrent calls (/bills, every /bills/{bill_id}/price-history) share one run.
     """
+    return await MARKET_FLIGHTS.do(congress, lambda: _fetch_bills(congress))
+
+async def _market_bill_info(bill_type: Optional[str], bill_number, bill_id: Optional[str], bill_label: str,
+                            congress: Optional[int]) -> Optional[Dict[str, Any]]:
+    # Enrich with bill_info if we could parse a bill id
+    if not (bill_type and bill_number):
+        print(f"[fetch_bills] Skipping bill info fetch - could not parse bill_id from label: '{bill_label}'")
+        return None
     try:
-        resp = requests.get(POLYMARKET_EVENT_URL, timeout=20)
-    except requests.RequestException as e:
+        info = await get_bill_info_data(bill_type=bill_type, bill_number=bill_number, congress=congress)
+        # If we got an error dict, set info to None to avoid breaking the response
+        if isinstance(info, dict) and "error" in info:
+            print(f"[fetch_bills] Error fetching bill info for {bill_id}: {info.get('error')}")
+            return None
+        print(f"[fetch_bills] Successfully fetched bill info for {bill_id}: title='{info.get('title')[:60] if info and info.get('title') else 'None'}...'")
+        return info
+    except Exception as e:
+        print(f"[fetch_bills] Exception fetching bill info for {bill_id}: {e}")
+        import traceback
+        traceback.print_exc()
+        return None
+
+async def _fetch_bills(congress: Optional[int] = None):
+    try:
+        resp = await _aget(POLYMARKET_EVENT_URL, timeout=20)  # cached briefly; stale copy while gamma is down
+    except (httpx.HTTPError, requests.RequestException, BreakerOpen) as e:
         raise HTTPException(status_code=502, detail=f"Upstream fetch error: {e}")
 
     if resp.status_code != 200:
@@ -1228,6 +1828,7 @@ def fetch_bills(congress: Optional[int] = None):
         raise HTTPException(status_code=502, detail=f"Invalid JSON from upstream: {e}")
 
     results = []
+    lookups = []
     for m in data.get("markets", []):
         bill_label = m.get("groupItemTitle") or m.get("question") or m.get("title") or "Unknown"
         # Parse prices
@@ -1245,24 +1846,7 @@ def fetch_bills(congress: Optional[int] = None):
         if not bill_type or not bill_number:
             print(f"[fetch_bills] Could not parse bill from label: '{bill_label}' -> bill_type={bill_type}, bill_number={bill_number}")
 
-        # Enrich with bill_info if we could parse a bill id
-        info = None
-        if bill_type and bill_number:
-            try:
-                info = get_bill_info_data(bill_type=bill_type, bill_number=bill_number, congress=congress)
-                # If we got an error dict, set info to None to avoid breaking the response
-                if isinstance(info, dict) and "error" in info:
-                    print(f"[fetch_bills] Error fetching bill info for {bill_id}: {info.get('error')}")
-                    info = None
-                else:
-                    print(f"[fetch_bills] Successfully fetched bill info for {bill_id}: title='{info.get('title')[:60] if info and info.get('title') else 'None'}...'")
-            except Exception as e:
-                print(f"[fetch_bills] Exception fetching bill info for {bill_id}: {e}")
-                import traceback
-                traceback.print_exc()
-                info = None
-        else:
-            print(f"[fetch_bills] Skipping bill info fetch - could not parse bill_id from label: '{bill_label}'")
+        lookups.append(_market_bill_info(bill_type, bill_number, bill_id, bill_label, congress))
 
         # Extract CLOB token IDs for price history fetching
         # clobTokenIds can be a list or JSON string
@@ -1284,12 +1868,15 @@ def fetch_bills(congress: Optional[int] = None):
             "bill_type": bill_type,
             "bill_number": bill_number,
             "bill_id": bill_id,
-            "info": info,  # dict or None
+            "info": None,  # dict or None, filled in below
             "clob_token_ids": clob_token_ids,  # [yes_token, no_token]
             "condition_id": condition_id,  # Polymarket condition ID
             "market_id": market_id,  # Polymarket market ID
         })
 
+    for rec, info in zip(results, await asyncio.gather(*lookups)):
+        rec["info"] = info
+
     results.sort(key=lambda x: (-x["yes_percent"], x["bill"] or ""))
     return results
 
@@ -1297,30 +1884,30 @@ def fetch_bills(congress: Optional[int] = None):
 # 4) Endpoints
 # ---------------------------
 @app.get("/bill_info")
-def get_bill_info(
+async def get_bill_info(
     bill_type: str = Query(..., description="Bill type (e.g., 'hr', 's', 'hjres')"),
     bill_number: int = Query(..., description="Bill number", ge=1),
     congress: Optional[int] = Query(None, description="Congress number (default: 117)")
 ):
     """Single-bill info (unchanged shape)."""
-    info = get_bill_info_data(bill_type=bill_type, bill_number=bill_number, congress=congress)
+    info = await get_bill_info_data(bill_type=bill_type, bill_number=bill_number, congress=congress)
     # If we returned an error dict, surface 404; else JSON
     if isinstance(info, dict) and "error" in info:
         raise HTTPException(status_code=404, detail=info["error"])
     return JSONResponse(info)
 
 @app.get("/bills")
-def get_bills(
+async def get_bills(
     congress: Optional[int] = Query(None, description="Congress number override (default: 117)")
 ):
     """
     List Polymarket markets with Yes% and normalized bill IDs,
     enriched with Congress.gov bill info in the 'info' field.
     """
-    return JSONResponse(fetch_bills(congress=congress))
+    return JSONResponse(await fetch_bills(congress=congress))
 
 
-def fetch_price_history(token_id: str, interval: str = "1d", start_ts: Optional[int] = None, end_ts: Optional[int] = None):
+async def fetch_price_history(token_id: str, interval: str = "1d", start_ts: Optional[int] = None, end_ts: Optional[int] = None):
     """
     Fetch historical price data for a Polymarket CLOB token.
     
@@ -1358,7 +1945,7 @@ def fetch_price_history(token_id: str, interval: str = "1d", start_ts: Optional[
         params["endTs"] = end_ts
     
     try:
-        response = _get(url, params=params, timeout=10)
+        response = await _aget(url, params=params, timeout=10)
         data = response.json()
         
         # Check for error response
@@ -1401,7 +1988,7 @@ def fetch_price_history(token_id: str, interval: str = "1d", start_ts: Optional[
 
 
 @app.get("/bills/{bill_id}/price-history")
-def get_bill_price_history(
+async def get_bill_price_history(
     bill_id: str,
     interval: str = Query("1d", description="Time interval: 1m, 1h, 6h, 1d, 1w, max"),
     start_ts: Optional[int] = Query(None, description="Start timestamp (Unix seconds, UTC)"),
@@ -1413,7 +2000,7 @@ def get_bill_price_history(
     Returns YES price history.
     """
     # First, fetch bills to find the market for this bill_id
-    bills = fetch_bills()
+    bills = await fetch_bills()
     
     # Normalize bill_id for matching (handle various formats like HR.1234, H.R.1234, HR1234, etc.)
     def normalize_bill_id(bid):
@@ -1458,7 +2045,7 @@ def get_bill_price_history(
     yes_token_id = str(clob_token_ids[0])  # Ensure it's a string
     
     # Fetch price history (fidelity is auto-set in fetch_price_history based on interval)
-    history = fetch_price_history(yes_token_id, interval=interval, start_ts=start_ts, end_ts=end_ts)
+    history = await fetch_price_history(yes_token_id, interval=interval, start_ts=start_ts, end_ts=end_ts)
     
     if history is None:
         raise HTTPException(status_code=502, detail="Failed to fetch price history from Polymarket")
@@ -1484,7 +2071,7 @@ def get_bill_price_history(
     return JSONResponse({"history": formatted_history})
 
 @app.get("/cosponsors")
-def get_bill_cosponsors(
+async def get_bill_cosponsors(
     bill_type: str = Query(..., description="Bill type (e.g., 'hr', 's', 'hjres')"),
     bill_number: int = Query(..., description="Bill number", ge=1),
     congress: Optional[int] = Query(None, description="Congress number (default: 117)")
@@ -1499,10 +2086,10 @@ def get_bill_cosponsors(
     params = {"api_key": CONGRESS_API_KEY, "format": "json", "limit": 250}
 
     try:
-        resp = _get(endpoint, params=params)
+        resp = await _aget(endpoint, params=params)
         data = resp.json()
     except Exception as e:
-        raise HTTPException(status_code=404, detail=f"Cosponsors not found: {str(e)}")
+        raise _upstream_http_error(e, "Cosponsors not found")
 
     cosponsors = []
     # Congress.gov can return "cosponsors" or "items" depending on version
@@ -1529,7 +2116,7 @@ def get_bill_cosponsors(
     })
 
 # ---------- Helpers: cosponsor fetch as an internal function ----------
-def get_cosponsors_data(
+async def get_cosponsors_data(
     bill_type: str,
     bill_number: int,
     congress: Optional[int] = None,
@@ -1539,7 +2126,7 @@ def get_cosponsors_data(
     endpoint = f"https://api.congress.gov/v3/bill/{congress_num}/{bill_type.lower()}/{bill_number}/cosponsors"
     params = {"api_key": CONGRESS_API_KEY, "format": "json", "limit": 250}
     try:
-        resp = _get(endpoint, params=params)
+        resp = await _aget(endpoint, params=params)
         data = resp.json()
     except Exception:
         return []
@@ -1584,18 +2171,19 @@ def _bill_node_id(bill_type: str, bill_number: int) -> str:
     return f"bill:{bill_type.upper()}.{bill_number}"
 
 # ---------- Graph builder for one bill ----------
-def build_bill_graph_for_single(
+async def build_bill_graph_for_single(
     bill_type: str,
     bill_number: int,
     congress: Optional[int] = None,
 ) -> Dict[str, Any]:
-    info = get_bill_info_data(bill_type=bill_type, bill_number=bill_number, congress=congress)
+    info, cosponsors = await asyncio.gather(
+        get_bill_info_data(bill_type=bill_type, bill_number=bill_number, congress=congress),
+        get_cosponsors_data(bill_type=bill_type, bill_number=bill_number, congress=congress),
+    )
     if isinstance(info, dict) and "error" in info:
         # return empty graph for this bill if not found
         return {"nodes": [], "edges": []}
 
-    cosponsors = get_cosponsors_data(bill_type=bill_type, bill_number=bill_number, congress=congress)
-
     bill_id = info["bill_id"]
     bill_node_id = _bill_node_id(bill_type, bill_number)
     bill_title = info.get("title") or bill_id
@@ -1664,18 +2252,22 @@ def build_bill_graph_for_single(
     return {"nodes": list(uniq_nodes.values()), "edges": uniq_edges}
 
 # ---------- Graph builder for many bills ----------
-def build_bill_graph(
+async def build_bill_graph(
     bills: list,      # list of dicts with keys bill_type, bill_number
     congress: Optional[int] = None
 ) -> Dict[str, Any]:
+    slots = asyncio.Semaphore(GRAPH_CONCURRENCY)
+
+    async def one(bt: str, bn: int) -> Dict[str, Any]:
+        async with slots:
+            return await build_bill_graph_for_single(bt, bn, congress=congress)
+
+    refs = [(b.get("bill_type"), b.get("bill_number")) for b in bills]
+    graphs = await asyncio.gather(*(one(bt, int(bn)) for bt, bn in refs if bt and bn))
+
     all_nodes: Dict[str, Dict[str, Any]] = {}
     all_edges: Set[tuple] = set()
-    for b in bills:
-        bt = b.get("bill_type")
-        bn = b.get("bill_number")
-        if not bt or not bn:
-            continue
-        g = build_bill_graph_for_single(bt, int(bn), congress=congress)
+    for g in graphs:  # bill order, as before
         for n in g["nodes"]:
             all_nodes[n["id"]] = n
         for e in g["edges"]:
@@ -1685,7 +2277,7 @@ def build_bill_graph(
         "edges": [{"source": s, "target": t, "relation": r} for (s, t, r) in sorted(all_edges)],
     }
 
-def fetch_recent_bills(congress: Optional[int] = None, limit: int = 20) -> list:
+async def fetch_recent_bills(congress: Optional[int] = None, limit: int = 20) -> list:
     """
     Fetch recent bills for a given Congress from Congress.gov (client-side sorted by introducedDate desc).
     Returns a list of dicts: [{"bill_type": "hr", "bill_number": 3076}, ...]
@@ -1696,7 +2288,7 @@ def fetch_recent_bills(congress: Optional[int] = None, limit: int = 20) -> list:
     params = {"api_key": CONGRESS_API_KEY, "format": "json", "congress": congress_num, "limit": 250}
 
     try:
-        resp = _get(endpoint, params=params)
+        resp = await _aget(endpoint, params=params)
         data = resp.json()
     except Exception as e:
         # Fail soft: return empty set if upstream fails
@@ -1743,7 +2335,8 @@ def fetch_recent_bills(congress: Optional[int] = None, limit: int = 20) -> list:
 
 # ---------- Endpoint: GET /graph ----------
 @app.get("/graph")
-def get_graph(
+@with_priority(BACKGROUND)
+async def get_graph(
     source: str = Query("combined", description="combined|polymarket|manual|recent"),
     bills: Optional[str] = Query(
         None,
@@ -1775,7 +2368,7 @@ def get_graph(
             bill_list.append({"bill_type": m.group(1).lower(), "bill_number": int(m.group(2))})
 
     elif src == "polymarket":
-        markets = fetch_bills(congress=congress)  # already parses bill ids
+        markets = await fetch_bills(congress=congress)  # already parses bill ids
         for mkt in markets:
             if mkt.get("bill_type") and mkt.get("bill_number"):
                 bill_list.append({"bill_type": mkt["bill_type"], "bill_number": int(mkt["bill_number"])})
@@ -1783,18 +2376,22 @@ def get_graph(
                 break
 
     elif src == "recent":
-        bill_list = fetch_recent_bills(congress=congress, limit=recent_limit)
+        bill_list = await fetch_recent_bills(congress=congress, limit=recent_limit)
 
     else:  # "combined" (default)
-        # 1) polymarket slice
-        markets = fetch_bills(congress=congress)
+        # 1) polymarket slice (the graph still builds from recent bills without it)
+        try:
+            markets = await fetch_bills(congress=congress)
+        except HTTPException as e:
+            print(f"[graph] Polymarket unavailable ({e.detail}); recent bills only")
+            markets = []
         for mkt in markets:
             if mkt.get("bill_type") and mkt.get("bill_number"):
                 bill_list.append({"bill_type": mkt["bill_type"], "bill_number": int(mkt["bill_number"])})
             if len(bill_list) >= limit:
                 break
         # 2) recent slice
-        recents = fetch_recent_bills(congress=congress, limit=recent_limit)
+        recents = await fetch_recent_bills(congress=congress, limit=recent_limit)
         bill_list.extend(recents)
 
     # Deduplicate before building graph
@@ -1804,5 +2401,5 @@ def get_graph(
         uniq[key] = {"bill_type": b["bill_type"], "bill_number": int(b["bill_number"])}
     merged_bill_list = list(uniq.values())
 
-    graph = build_bill_graph(merged_bill_list, congress=congress)
+    graph = await build_bill_graph(merged_bill_list, congress=congress)
     return JSONResponse(graph)
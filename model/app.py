@@ -4,9 +4,10 @@ from typing import Optional, Dict, Any
 
 import numpy as np
 import pandas as pd
-import requests
 import yfinance as yf
+import http_client
 from fastapi import FastAPI, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
 
 # =========================
 # Load latest artifacts
@@ -89,15 +90,35 @@ def safe_int(v, default=0):
 # =========================
 # External data fetch
 # =========================
-def fetch_bill(congress: int, bill_type: str, bill_number: int, api_key: str) -> Dict[str, Any]:
+async def fetch_bill(congress: int, bill_type: str, bill_number: int, api_key: str) -> Dict[str, Any]:
     url = f"https://api.congress.gov/v3/bill/{congress}/{bill_type.lower()}/{bill_number}"
-    r = requests.get(url, params={"api_key": api_key, "format": "json"}, timeout=30)
+    r = await http_client.aget(url, params={"api_key": api_key, "format": "json"}, timeout=30)
     r.raise_for_status()
     return (r.json() or {}).get("bill", {})
 
 # =========================
 # Stock feature builder
 # =========================
+YAHOO_CHART_URL = "https://query1.finance.yahoo.com/v8/finance/chart/{symbol}"
+
+def etf_closes(symbol: str, start: datetime.datetime, end: datetime.datetime) -> pd.Series:
+    """
+    Daily closes of symbol in [start, end). yfinance downloads on its own HTTP stack, so
+    under HTTP_UPSTREAM_OVERRIDE (upstream_sim.py) the same Yahoo chart API is read
+    through http_client instead.
+    """
+    if not http_client.UPSTREAM_OVERRIDE:
+        return yf.Ticker(symbol).history(start=start, end=end)["Close"]
+    r = http_client.get(YAHOO_CHART_URL.format(symbol=symbol), timeout=30, params={
+        "period1": int(start.replace(tzinfo=datetime.timezone.utc).timestamp()),
+        "period2": int(end.replace(tzinfo=datetime.timezone.utc).timestamp()),
+        "interval": "1d",
+    })
+    r.raise_for_status()
+    res = (r.json().get("chart", {}).get("result") or [{}])[0]
+    closes = ((res.get("indicators") or {}).get("quote") or [{}])[0].get("close") or []
+    return pd.Series(closes, index=pd.to_datetime(res.get("timestamp") or [], unit="s"), dtype=float).dropna()
+
 def stock_features(from_date: Optional[str], policy_area: Optional[str]) -> Dict[str, float]:
     """
     Compute stock features from reference date forward 30 days for mapped sector ETF.
@@ -116,15 +137,15 @@ def stock_features(from_date: Optional[str], policy_area: Optional[str]) -> Dict
         start_dt = datetime.datetime.strptime(from_date, "%Y-%m-%d")
         etf = sector_from_policy(policy_area or "")
 
-        hist = yf.Ticker(etf).history(start=start_dt, end=start_dt + datetime.timedelta(days=30))
-        if len(hist) < 2:
+        close = etf_closes(etf, start_dt, start_dt + datetime.timedelta(days=30))
+        if len(close) < 2:
             return out
 
-        initial = float(hist["Close"].iloc[0])
-        ret7  = (float(hist["Close"].iloc[7]) / initial - 1) * 100.0 if len(hist) > 7 else 0.0
-        ret30 = (float(hist["Close"].iloc[-1]) / initial - 1) * 100.0
+        initial = float(close.iloc[0])
+        ret7  = (float(close.iloc[7]) / initial - 1) * 100.0 if len(close) > 7 else 0.0
+        ret30 = (float(close.iloc[-1]) / initial - 1) * 100.0
 
-        daily = hist["Close"].pct_change().dropna()
+        daily = close.pct_change().dropna()
         if daily.empty:
             pct_pos = 0.0
             vol = 0.0
@@ -215,22 +236,23 @@ def align_and_predict(feats: Dict[str, Any], threshold: float):
 app = FastAPI(title="Predict Bill Passage", version="1.0.0")
 
 @app.get("/predict_bill")
-def predict_bill(
+async def predict_bill(
     congress: int = Query(..., ge=1),
     bill_type: str = Query(..., pattern="^(hr|s|hres|sres|hjres|sjres|hconres|sconres)$"),
     bill_number: int = Query(..., ge=1),
     threshold: float = Query(0.5, ge=0.0, le=1.0),
 ):
-    api_key = 
+    api_key = os.getenv("CONGRESS_API_KEY")
     if not api_key:
         raise HTTPException(status_code=500, detail="Set CONGRESS_API_KEY env variable.")
 
     try:
-        bill = fetch_bill(congress, bill_type, bill_number, api_key)
+        bill = await fetch_bill(congress, bill_type, bill_number, api_key)
         if not bill:
             raise HTTPException(status_code=404, detail="Bill not found")
 
-        feats = engineer_16_features_from_bill(bill)
+        # yfinance history download (blocking) runs off the event loop
+        feats = await run_in_threadpool(engineer_16_features_from_bill, bill)
 
         # Validate against model artifacts (helps catch training/inference mismatch)
         missing = [c for c in FEATURE_NAMES if c not in feats]
@@ -241,7 +263,7 @@ def predict_bill(
                 detail=f"Feature mismatch with model artifacts. Missing: {missing}. Extra: {extra}"
             )
 
-        pred, proba_pass = align_and_predict(feats, threshold)
+        pred, proba_pass = await run_in_threadpool(align_and_predict, feats, threshold)
 
         response = {
             "bill_id": f"{(bill.get('type') or '').upper()}.{bill.get('number') or ''}",
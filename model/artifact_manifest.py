@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+import hashlib
+import json
+import os
+from typing import Dict, Any
+
+MANIFEST_NAME = "manifest.json"
+
+
+def file_sha256(path: str, block: int = 1 << 20) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for buf in iter(lambda: f.read(block), b""):
+            h.update(buf)
+    return h.hexdigest()
+
+
+def write_manifest(artifact_dir: str, companies_path: str, **fields: Any) -> Dict[str, Any]:
+    """
+    Record which companies.parquet the other artifacts were built from.
+    Extra fields (model name, counts, ...) are stored as-is.
+    """
+    manifest = {"companies_sha256": file_sha256(companies_path), **fields}
+    with open(os.path.join(artifact_dir, MANIFEST_NAME), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def load_manifest(artifact_dir: str) -> Dict[str, Any]:
+    path = os.path.join(artifact_dir, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def verify_companies(artifact_dir: str, companies_path: str) -> Dict[str, Any]:
+    """Raise if the manifest was written for a different companies.parquet."""
+    manifest = load_manifest(artifact_dir)
+    expected = manifest.get("companies_sha256")
+    if expected and expected != file_sha256(companies_path):
+        raise RuntimeError(
+            f"Stale artifacts in {artifact_dir}: built from a different {os.path.basename(companies_path)}. "
+            "Re-run precompute_companies.py."
+        )
+    return manifest
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+# Layers kept per bill text version (content key) or per query text (embedding key)
+TEXT_LAYERS = ("raw", "clean", "chunks", "crs")
+ARRAY_LAYERS = ("qemb",)
+POINTER_LAYER = "version"   # (congress, type, number) -> chosen text version, TTL-bound
+
+_MISSING = object()
+
+
+def content_key(congress: int, bill_type: str, bill_number: int, version_date: str, format_url: str) -> str:
+    """Stable key of one bill text version: (congress, type, number, version date, format URL)."""
+    ident = f"{congress}|{bill_type.lower()}|{int(bill_number)}|{version_date or ''}|{format_url}"
+    return hashlib.sha256(ident.encode("utf-8")).hexdigest()
+
+
+def text_key(*parts: str) -> str:
+    """Key addressed by content (e.g. model id + query text)."""
+    h = hashlib.sha256()
+    for p in parts:
+        h.update(p.encode("utf-8")); h.update(b"\x00")
+    return h.hexdigest()
+
+
+def _sizeof(value: Any) -> int:
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, (list, tuple)):
+        return sum(_sizeof(v) for v in value) + sys.getsizeof(value)
+    if isinstance(value, dict):
+        return sum(_sizeof(k) + _sizeof(v) for k, v in value.items()) + sys.getsizeof(value)
+    return sys.getsizeof(value)
+
+
+class LRUCache:
+    """Thread-safe LRU bounded by approximate value size in bytes."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.evictions = 0
+        self._data: "OrderedDict[Tuple[str, str], Tuple[Any, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple[str, str], default: Any = None) -> Any:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+            self._data.move_to_end(key)
+            return item[0]
+
+    def put(self, key: Tuple[str, str], value: Any) -> None:
+        size = _sizeof(value)
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self.bytes -= old[1]
+            if size > self.max_bytes:
+                return  # too large to keep in memory; disk layer still has it
+            self._data[key] = (value, size)
+            self.bytes += size
+            while self.bytes > self.max_bytes and self._data:
+                _, (_, s) = self._data.popitem(last=False)
+                self.bytes -= s
+                self.evictions += 1
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class BillCache:
+    """
+    Layered cache for bill processing: raw text -> cleaned text -> chunks, plus the
+    CRS summary and the normalized query embedding. Memory LRU in front of an
+    on-disk store (cache_dir/<layer>/<key[:2]>/<key>.json|.npy).
+    The disk store is bounded by disk_max_bytes (0 = unbounded): once a tenth of that
+    has been written since the last sweep, a background sweep deletes the least
+    recently used files (mtime, refreshed on every disk hit) down to 90% of it.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int, version_ttl: float, disk_max_bytes: int = 0):
+        self.cache_dir = cache_dir
+        self.version_ttl = version_ttl
+        self.mem = LRUCache(max_bytes)
+        self.disk_max_bytes = disk_max_bytes
+        self.disk_bytes: Optional[int] = None  # as of the last sweep
+        self.disk_evictions = 0
+        self._written = disk_max_bytes // 10  # the first write sweeps what a previous run left
+        self._sweeping = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, int]] = {}
+        os.makedirs(cache_dir, exist_ok=True)
+
+    # ---- stats
+    def _count(self, layer: str, what: str) -> None:
+        with self._stats_lock:
+            s = self._stats.setdefault(layer, {"memory_hits": 0, "disk_hits": 0, "misses": 0, "puts": 0})
+            s[what] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            layers = {k: dict(v) for k, v in self._stats.items()}
+        for s in layers.values():
+            looks = s["memory_hits"] + s["disk_hits"] + s["misses"]
+            s["hit_ratio"] = round((s["memory_hits"] + s["disk_hits"]) / looks, 4) if looks else None
+        return {
+            "memory_bytes": self.mem.bytes,
+            "memory_max_bytes": self.mem.max_bytes,
+            "memory_entries": len(self.mem),
+            "evictions": self.mem.evictions,
+            "disk_bytes": self.disk_bytes,
+            "disk_max_bytes": self.disk_max_bytes,
+            "disk_evictions": self.disk_evictions,
+            "layers": layers,
+        }
+
+    # ---- disk
+    def _path(self, layer: str, key: str) -> str:
+        ext = ".npy" if layer in ARRAY_LAYERS else ".json"
+        return os.path.join(self.cache_dir, layer, key[:2], key + ext)
+
+    def _read_disk(self, layer: str, key: str) -> Any:
+        path = self._path(layer, key)
+        try:
+            if layer in ARRAY_LAYERS:
+                value = np.load(path)
+            else:
+                with open(path, "r", encoding="utf-8") as f:
+                    value = json.load(f)["value"]
+            if self.disk_max_bytes:
+                os.utime(path)  # recently used, for sweep()
+            return value
+        except (OSError, ValueError, KeyError):
+            return _MISSING
+
+    def _write_disk(self, layer: str, key: str, value: Any) -> None:
+        path = self._path(layer, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            if layer in ARRAY_LAYERS:
+                with open(tmp, "wb") as f:
+                    np.save(f, value)
+            else:
+                with open(tmp, "w", encoding="utf-8") as f:
+                    json.dump({"value": value}, f, ensure_ascii=False)
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"[bill_cache] Could not persist {layer}/{key[:12]}: {e}")
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            return
+        if self.disk_max_bytes:
+            self._after_write(path)
+
+    def _after_write(self, path: str) -> None:
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            return
+        with self._stats_lock:
+            self._written += size
+            due = self._written >= self.disk_max_bytes // 10
+        if due and self._sweeping.acquire(blocking=False):
+            with self._stats_lock:
+                self._written = 0
+            threading.Thread(target=self._sweep_and_release, name="bill-cache-sweep", daemon=True).start()
+
+    def _sweep_and_release(self) -> None:
+        try:
+            self.sweep()
+        finally:
+            self._sweeping.release()
+
+    def sweep(self) -> int:
+        """Delete least recently used files until the disk store is under 90% of disk_max_bytes."""
+        files = []
+        for root, _, names in os.walk(self.cache_dir):
+            for name in names:
+                if name.endswith(".tmp"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                files.append((st.st_mtime, st.st_size, path))
+        total = sum(size for _, size, _ in files)
+        removed = 0
+        target = int(self.disk_max_bytes * 0.9)
+        for _, size, path in sorted(files):
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        self.disk_bytes = total
+        self.disk_evictions += removed
+        if removed:
+            print(f"[bill_cache] disk sweep removed {removed} files; {total / 1e6:.1f} MB kept")
+        return removed
+
+    # ---- public API
+    def _lookup(self, layer: str, key: str) -> Tuple[Any, str]:
+        """(value or _MISSING, the stats counter this lookup belongs to)."""
+        value = self.mem.get((layer, key), _MISSING)
+        if value is not _MISSING:
+            return value, "memory_hits"
+        value = self._read_disk(layer, key)
+        if value is not _MISSING:
+            self.mem.put((layer, key), value)
+            return value, "disk_hits"
+        return _MISSING, "misses"
+
+    def get(self, layer: str, key: str, default: Any = None) -> Any:
+        value, what = self._lookup(layer, key)
+        self._count(layer, what)
+        return default if value is _MISSING else value
+
+    def put(self, layer: str, key: str, value: Any) -> None:
+        self._count(layer, "puts")
+        self.mem.put((layer, key), value)
+        self._write_disk(layer, key, value)
+
+    def get_version(self, congress: int, bill_type: str, bill_number: int) -> Optional[Dict[str, Any]]:
+        """Last chosen text version for a bill, if resolved within version_ttl seconds."""
+        key = text_key(str(congress), bill_type.lower(), str(int(bill_number)))
+        rec, what = self._lookup(POINTER_LAYER, key)
+        if rec is not _MISSING and time.time() - rec.get("resolved_at", 0) > self.version_ttl:
+            rec, what = _MISSING, "misses"  # expired: one miss, not a hit and a miss
+        self._count(POINTER_LAYER, what)
+        return None if rec is _MISSING else rec
+
+    def put_version(self, congress: int, bill_type: str, bill_number: int,
+                    version_date: str, fmt: str, url: str) -> Dict[str, Any]:
+        key = text_key(str(congress), bill_type.lower(), str(int(bill_number)))
+        rec = {
+            "version_date": version_date or "",
+            "format": fmt,
+            "url": url,
+            "content_key": content_key(congress, bill_type, bill_number, version_date, url),
+            "resolved_at": time.time(),
+        }
+        self.put(POINTER_LAYER, key, rec)
+        return rec
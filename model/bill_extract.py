@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Bill text extraction for the "Formatted Text" (HTML) and "Formatted XML" versions,
+shared by api_service.py and top5companies.py.
+
+html_to_text() / xml_to_text() run lxml's parser with a target object: parse events
+go straight to a collector of get_text(" ", strip=True) strings, so no element tree
+(lxml or BeautifulSoup) is ever built and nothing has to be cleared afterwards.
+Same rules as before:
+  HTML  text of every <pre> block if there is one, else the whole page without
+        script/style/nav/header/footer
+  XML   whole document without metadata/toc/page/img
+XML is parsed strictly; a document lxml rejects (undefined entity, broken markup)
+goes through the BeautifulSoup versions (soup_html_to_text / soup_xml_to_text),
+which are kept as the reference.
+
+Benchmark + agreement across bill sizes (synthetic bills built from bill_texts/):
+  python bill_extract.py                     # 10 / 100 / 1000 pages
+  python bill_extract.py --pages 50 500 --fuzz 500
+"""
+import argparse
+import glob
+import html
+import os
+import random
+import re
+import time
+import tracemalloc
+from typing import List, Optional, Tuple
+
+from bs4 import BeautifulSoup
+from lxml import etree
+
+XML_SKIP_TAGS = frozenset({"metadata", "toc", "page", "img"})
+HTML_SKIP_TAGS = frozenset({"script", "style", "nav", "header", "footer"})
+# html.parser gives strings in these tags their own classes, which get_text() leaves out
+HTML_NON_TEXT_TAGS = frozenset({"script", "style", "template", "rt", "rp"})
+FEED_CHARS = 1 << 20
+
+
+def _normalize_lines(text: str) -> str:
+    lines = [re.sub(r"\s+", " ", ln).strip() for ln in text.splitlines()]
+    lines = [ln for ln in lines if ln]
+    return "\n".join(lines)
+
+
+def _normalize_lines_fast(text: str) -> str:
+    # str.split() and re's \s use the same whitespace set
+    lines = (" ".join(ln.split()) for ln in text.splitlines())
+    return "\n".join(ln for ln in lines if ln)
+
+
+# =========================
+# BeautifulSoup (reference / fallback)
+# =========================
+def soup_html_to_text(html: str) -> str:
+    soup = BeautifulSoup(html, "html.parser")
+    pres = soup.find_all("pre")
+    if pres:
+        text = "\n".join(p.get_text(" ", strip=True) for p in pres)
+    else:
+        for tag in soup(["script", "style", "nav", "header", "footer"]):
+            tag.decompose()
+        text = soup.get_text(" ", strip=True)
+    return _normalize_lines(text)
+
+
+def soup_xml_to_text(xml: str) -> str:
+    soup = BeautifulSoup(xml, "xml")
+    for tag in soup.find_all(["metadata", "toc", "page", "img"]):
+        tag.decompose()
+    text = soup.get_text(" ", strip=True)
+    return _normalize_lines(text)
+
+
+# =========================
+# lxml parser target
+# =========================
+def _local(tag) -> str:
+    return tag.rsplit("}", 1)[-1] if isinstance(tag, str) else ""
+
+
+class _TextTarget:
+    """
+    Collects the stripped, non-empty text strings of a document in order.
+    parts: strings outside skip_tags (and outside non_text_tags)
+    pres:  strings of each <pre> (in start order; only non_text_tags excluded)
+    """
+
+    def __init__(self, skip_tags=frozenset(), non_text_tags=frozenset(), collect_pre: bool = False):
+        self.skip_tags = skip_tags
+        self.non_text_tags = non_text_tags
+        self.collect_pre = collect_pre
+        self.parts: List[str] = []
+        self.pres: List[List[str]] = []
+        self._open_pres: List[List[str]] = []
+        self._skipped = 0      # depth inside a skip tag
+        self._non_text = 0     # depth inside a non-text tag
+        self._buf: List[str] = []
+
+    def _flush(self):
+        if not self._buf:
+            return
+        s = "".join(self._buf).strip()
+        self._buf = []
+        if not s or self._non_text:
+            return
+        if not self._skipped:
+            self.parts.append(s)
+        for p in self._open_pres:
+            p.append(s)
+
+    def start(self, tag, attrib, nsmap=None):
+        self._flush()
+        name = _local(tag)
+        if self._skipped or name in self.skip_tags:
+            self._skipped += 1
+        if self._non_text or name in self.non_text_tags:
+            self._non_text += 1
+        if self.collect_pre and name == "pre":
+            self.pres.append([])
+            self._open_pres.append(self.pres[-1])
+
+    def end(self, tag):
+        self._flush()
+        if self.collect_pre and _local(tag) == "pre" and self._open_pres:
+            self._open_pres.pop()
+        if self._skipped:
+            self._skipped -= 1
+        if self._non_text:
+            self._non_text -= 1
+
+    def data(self, data):
+        self._buf.append(data)
+
+    # Comments and processing instructions end a text string (get_text skips them)
+    def comment(self, text):
+        self._flush()
+
+    def pi(self, target, data=None):
+        self._flush()
+
+    def close(self):
+        self._flush()
+        return self
+
+
+def _parse(parser, doc: str) -> None:
+    for s in range(0, len(doc), FEED_CHARS):
+        parser.feed(doc[s:s + FEED_CHARS])
+    parser.close()
+
+
+def lxml_html_to_text(doc: str) -> str:
+    target = _TextTarget(HTML_SKIP_TAGS, HTML_NON_TEXT_TAGS, collect_pre=True)
+    _parse(etree.HTMLParser(target=target, remove_comments=False, huge_tree=True), doc)
+    if target.pres:
+        text = "\n".join(" ".join(p) for p in target.pres)
+    else:
+        text = " ".join(target.parts)
+    return _normalize_lines_fast(text)
+
+
+def lxml_xml_to_text(doc: str) -> str:
+    target = _TextTarget(XML_SKIP_TAGS)
+    _parse(etree.XMLParser(target=target, recover=False, strip_cdata=False,
+                           resolve_entities=False, no_network=True, huge_tree=True), doc)
+    return _normalize_lines_fast(" ".join(target.parts))
+
+
+def html_to_text(doc: str) -> str:
+    try:
+        return lxml_html_to_text(doc)
+    except (etree.LxmlError, ValueError):
+        return soup_html_to_text(doc)
+
+
+def xml_to_text(doc: str) -> str:
+    try:
+        return lxml_xml_to_text(doc)
+    except (etree.LxmlError, ValueError):
+        return soup_xml_to_text(doc)
+
+
+# =========================
+# Benchmark
+# =========================
+def synthetic_formatted(base: str, pages: int, seed: int = 0) -> Tuple[str, str]:
+    """(Formatted Text HTML, Formatted XML) for a `pages`-page bill built from base's words."""
+    rng = random.Random(seed)
+    words = base.split() or ["lorem"]
+    pre_lines, sections = [], []
+    for page in range(1, pages + 1):
+        pre_lines.append(f"[[Page {page} STAT. {1000 + page}]]")
+        body = []
+        for line_no in range(1, 41):
+            line = " ".join(rng.sample(words, min(len(words), 12)))
+            pre_lines.append(f"{line_no}   {line}")
+            body.append(line)
+        sections.append(
+            f'<section id="S{page}"><enum>{page}.</enum><header>{html.escape(body[0][:60])}</header>'
+            f'<page>{page}</page>'
+            + "".join(f'<subsection><enum>({chr(97 + i % 26)})</enum><text>{html.escape(b)}'
+                      f'<external-xref legal-doc="usc">15 U.S.C. {i}</external-xref>.</text></subsection>'
+                      for i, b in enumerate(body[1:]))
+            + "</section>"
+        )
+    page_html = ("<html><head><title>Bill</title><style>pre{}</style></head><body>"
+                 "<nav>Congress.gov</nav><pre id=\"billTextContainer\">\n"
+                 + html.escape("\n".join(pre_lines)) + "\n</pre><footer>footer</footer></body></html>")
+    page_xml = ('<?xml version="1.0" encoding="UTF-8"?>\n<bill bill-stage="Enrolled-Bill">'
+                "<metadata><dublinCore><dc:title xmlns:dc=\"http://purl.org/dc/elements/1.1/\">T</dc:title>"
+                "</dublinCore></metadata><form><congress>117th CONGRESS</congress></form>"
+                "<legis-body><toc><toc-entry>Sec. 1. Short title.</toc-entry></toc>"
+                + "\n".join(sections) + "</legis-body><!-- end --></bill>")
+    return page_html, page_xml
+
+
+def fuzz_doc(rng: random.Random, kind: str) -> str:
+    tags = ["p", "div", "span", "b", "pre", "nav", "footer", "script", "style", "section", "text", "toc",
+            "metadata", "page", "img", "header", "enum"]
+    texts = ["", " ", "word", "two words", "a\nb", " \n ", "x &amp; y", "&lt;tag&gt;", "\xa0", "tab\there"]
+    out = []
+    stack = []
+    for _ in range(rng.randint(0, 30)):
+        r = rng.random()
+        if r < 0.35:
+            t = rng.choice(tags)
+            if kind == "html" and t in ("script", "style"):
+                out.append(f"<{t}>{rng.choice(['var a;', '', 'p{}'])}</{t}>")
+                continue
+            stack.append(t)
+            out.append(f"<{t}>")
+        elif r < 0.55 and stack:
+            out.append(f"</{stack.pop()}>")
+        elif r < 0.6:
+            out.append("<!-- note -->")
+        elif r < 0.63 and kind == "xml":
+            out.append("<![CDATA[ raw <b> ]]>")
+        else:
+            out.append(rng.choice(texts))
+    while stack:
+        out.append(f"</{stack.pop()}>")
+    body = "".join(out)
+    if kind == "xml":
+        return f'<?xml version="1.0"?><bill>{body}</bill>'
+    return f"<html><body>{body}</body></html>"
+
+
+def _bench(fn, doc: str, repeats: int) -> Tuple[float, int]:
+    tracemalloc.start()
+    fn(doc)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    t0 = time.perf_counter()
+    for _ in range(repeats):
+        fn(doc)
+    return (time.perf_counter() - t0) / repeats, peak
+
+
+def main(argv: Optional[List[str]] = None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--pages", type=int, nargs="+", default=[10, 100, 1000])
+    ap.add_argument("--repeats", type=int, default=3)
+    ap.add_argument("--fuzz", type=int, default=0, help="also compare on N random small documents per format")
+    args = ap.parse_args(argv)
+
+    if args.fuzz:
+        rng = random.Random(0)
+        for kind, fast, ref in (("html", lxml_html_to_text, soup_html_to_text),
+                                ("xml", xml_to_text, soup_xml_to_text)):
+            bad = [d for d in (fuzz_doc(rng, kind) for _ in range(args.fuzz)) if fast(d) != ref(d)]
+            print(f"{'✅' if not bad else '⚠️'} {kind}: {args.fuzz - len(bad)}/{args.fuzz} fuzz documents identical")
+            if bad:
+                # libxml2 repairs invalid nesting (<p>/<pre> inside <p>) differently from html.parser
+                print(f"   e.g. {bad[0]!r}")
+
+    base = ""
+    for p in sorted(glob.glob(os.path.join("bill_texts", "*.txt"))):
+        with open(p, "r", encoding="utf-8") as f:
+            base += f.read() + "\n"
+    print(f"{'document':<14} {'MB':>6} {'soup MB/s':>10} {'peak MB':>8} {'lxml MB/s':>10} {'peak MB':>8} {'same':>5}")
+    for pages in args.pages:
+        page_html, page_xml = synthetic_formatted(base, pages)
+        for kind, doc, fast, ref in (("html", page_html, html_to_text, soup_html_to_text),
+                                     ("xml", page_xml, xml_to_text, soup_xml_to_text)):
+            mb = len(doc.encode("utf-8")) / 1e6
+            t_ref, peak_ref = _bench(ref, doc, args.repeats)
+            t_fast, peak_fast = _bench(fast, doc, args.repeats)
+            same = "yes" if fast(doc) == ref(doc) else "NO"
+            print(f"{kind + f'-{pages}p':<14} {mb:>6.2f} {mb / t_ref:>10.2f} {peak_ref / 1e6:>8.2f} "
+                  f"{mb / t_fast:>10.2f} {peak_fast / 1e6:>8.2f} {same:>5}")
+    print("(peak = Python allocations seen by tracemalloc; libxml2's own parse buffers are not included)")
+
+
+if __name__ == "__main__":
+    main()
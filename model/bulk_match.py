@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Nightly bill -> company precomputation: runs the /match scoring over every bill of
+the current congress that has text and stores each bill's top-k companies (with the
+dense / TF-IDF / keyword / industry terms of the hybrid score) in match_index.py's
+store, which also serves the reverse company -> bills lookup.
+
+  python bulk_match.py                          # incremental (cron this nightly)
+  python bulk_match.py --full                   # re-match everything (new model/weights/artifacts)
+  python bulk_match.py --limit 200 --processes 8 --batch 64 --topk 25
+
+Pipeline:
+  1. page through /bill/{CONGRESS}; a bill whose listing updateDate is unchanged
+     since the last run is skipped without any request
+  2. a fork()ed process pool resolves each remaining bill's text version; if its
+     content key is the one already matched the bill is left as is, else the text
+     is fetched, cleaned and chunked (BILL_CACHE layers are shared on disk)
+  3. the parent encodes --batch bills per encoder call and scores them as one
+     (bills x companies) matrix (score_bill_queries, same as /match/batch)
+Encoding stays in the parent: the model is loaded once and torch already uses
+every core for a batch, so the processes only take the network/parsing work.
+"""
+import argparse
+import multiprocessing
+import os
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import api_service
+import rate_budget
+from company_table import top_k_indices
+from match_index import MatchIndex, MATCH_INDEX_PATH, MATCHED, NO_TEXT, FAILED
+
+LIST_PAGE_SIZE = 250
+DEFAULT_TOPK = 25
+DEFAULT_BATCH = 32
+
+# worker outcomes
+READY, UNCHANGED = "ready", "unchanged"
+
+
+# =========================
+# Listing
+# =========================
+def list_congress_bills(limit: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """Every bill of api_service.CONGRESS (listing fields only), in API order."""
+    endpoint = f"https://api.congress.gov/v3/bill/{api_service.CONGRESS}"
+    offset, seen = 0, 0
+    while True:
+        params = {"api_key": api_service.CONGRESS_API_KEY, "format": "json",
+                  "limit": LIST_PAGE_SIZE, "offset": offset}
+        data = api_service._get(endpoint, params=params).json()
+        items = data.get("bills") or []
+        for b in items:
+            try:
+                number = int(str(b.get("number")))
+            except (TypeError, ValueError):
+                continue
+            bill_type = (b.get("type") or "").lower()
+            if not bill_type:
+                continue
+            yield {
+                "bill_id": f"{bill_type.upper()}.{number}",
+                "congress": api_service.CONGRESS,
+                "bill_type": bill_type,
+                "bill_number": number,
+                "title": b.get("title"),
+                "update_date": b.get("updateDateIncludingText") or b.get("updateDate"),
+            }
+            seen += 1
+            if limit is not None and seen >= limit:
+                return
+        total = (data.get("pagination") or {}).get("count")
+        offset += LIST_PAGE_SIZE
+        if not items or (total is not None and offset >= total):
+            return
+
+
+# =========================
+# Worker (fetch / clean / chunk)
+# =========================
+def _init_worker() -> None:
+    # forked after run() took the parent's share: each worker inherits 1 / (processes + 1)
+    rate_budget.set_priority(rate_budget.BACKGROUND)
+
+
+def _prepare(task: Tuple[Dict[str, Any], Optional[str]]) -> Tuple[str, Dict[str, Any], Any]:
+    bill, matched_key = task
+    try:
+        version = api_service.resolve_text_version(bill["bill_type"], bill["bill_number"])
+    except Exception as e:
+        status = NO_TEXT if "No text versions" in str(e) or "No supported format" in str(e) else FAILED
+        return status, bill, str(e)
+    bill = dict(bill, content_key=version["content_key"], version_date=version["version_date"])
+    if matched_key is not None and matched_key == version["content_key"]:
+        return UNCHANGED, bill, None
+    try:
+        return READY, bill, api_service.prepare_bill_query(bill["bill_type"], bill["bill_number"])
+    except Exception as e:
+        return FAILED, bill, str(e)
+
+
+# =========================
+# Scoring
+# =========================
+def match_batch(batch: List[Tuple[Dict[str, Any], Dict[str, Any]]], mode: str, pooling: str,
+                topk: int) -> List[List[Dict[str, Any]]]:
+    """Top-k rows (ticker, name, ..., hybrid_score + its terms) for each (bill, prepared) in batch."""
+    prepared = [p for _, p in batch]
+    features = api_service.bill_features(prepared, pooling)
+    scores = api_service.score_bill_queries(prepared, mode, pooling, features=features)
+    Q, views, terms = features
+    companies = api_service.app.state.companies
+    out = []
+    for r, p in enumerate(prepared):
+        ids = top_k_indices(scores[r], topk)
+        parts = api_service.score_breakdown(p, Q[r], views[r], terms[r], ids, mode, pooling)
+        rows = companies.records(ids, scores[r])
+        for j, row in enumerate(rows):
+            row["dense"] = float(parts["dense"][j])
+            row["tfidf"] = float(parts["tfidf"][j])
+            row["keyword"] = float(parts["keyword"][j])
+            row["industry_boost"] = float(parts["industry"][j])
+        out.append(rows)
+    return out
+
+
+# =========================
+# Run
+# =========================
+def run(args) -> Dict[str, Any]:
+    rate_budget.set_priority(rate_budget.BACKGROUND)
+    # the parent (listing) and each worker get an equal share of the key's budget; an API
+    # serving on the same key is not counted here (its own budget plus this job's may
+    # briefly overshoot the hourly quota, and the 429 + Retry-After handling absorbs it)
+    rate_budget.share(1.0 / (args.processes + 1))
+    index = MatchIndex(args.index)
+    run_id = index.start_run()
+    t0 = time.perf_counter()
+    api_service.load_state()
+    print(f"[bulk] model + artifacts loaded in {time.perf_counter() - t0:.1f}s")
+
+    known = index.known_bills(api_service.CONGRESS)
+    stats = {"listed": 0, "skipped": 0, UNCHANGED: 0, MATCHED: 0, NO_TEXT: 0, FAILED: 0,
+             "mode": args.tfidf_mode, "pooling": args.dense_pooling, "topk": args.topk}
+    tasks = []
+    for bill in list_congress_bills(args.limit):
+        stats["listed"] += 1
+        prev = known.get(bill["bill_id"])
+        if args.full or prev is None:
+            tasks.append((bill, None))
+        elif prev["update_date"] == bill["update_date"] and prev["status"] in (MATCHED, NO_TEXT):
+            stats["skipped"] += 1
+        else:
+            tasks.append((bill, prev["content_key"] if prev["status"] == MATCHED else None))
+    print(f"[bulk] {stats['listed']} bills listed, {len(tasks)} to check, {stats['skipped']} unchanged listings")
+
+    t_work = time.perf_counter()
+    batch: List[Tuple[Dict[str, Any], Dict[str, Any]]] = []
+
+    def flush():
+        if not batch:
+            return
+        for (bill, _), rows in zip(batch, match_batch(batch, args.tfidf_mode, args.dense_pooling, args.topk)):
+            index.put_matches(bill, rows)
+        stats[MATCHED] += len(batch)
+        done = sum(stats[k] for k in (UNCHANGED, MATCHED, NO_TEXT, FAILED))
+        print(f"[bulk] {done}/{len(tasks)} checked, {stats[MATCHED]} matched "
+              f"({done / (time.perf_counter() - t_work):.1f} bills/s)")
+        batch.clear()
+
+    # fork: workers start with the parent's imports/config; FETCH_EXECUTOR has no threads yet
+    with multiprocessing.get_context("fork").Pool(args.processes, _init_worker) as pool:
+        for status, bill, result in pool.imap_unordered(_prepare, tasks, chunksize=4):
+            if status == READY:
+                batch.append((bill, result))
+                if len(batch) >= args.batch:
+                    flush()
+            elif status == UNCHANGED:
+                stats[UNCHANGED] += 1
+                index.touch(bill["congress"], [bill["bill_id"]], [bill["update_date"]])
+            else:
+                stats[status] += 1
+                index.put_status(bill, status, result)
+                if status == FAILED:
+                    print(f"[bulk] {bill['bill_id']}: {result}")
+        flush()
+
+    stats["seconds"] = round(time.perf_counter() - t0, 1)
+    index.finish_run(run_id, stats)
+    return stats
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--index", default=MATCH_INDEX_PATH)
+    ap.add_argument("--limit", type=int, default=None, help="only the first N listed bills")
+    ap.add_argument("--full", action="store_true", help="ignore stored versions and re-match every bill")
+    ap.add_argument("--processes", type=int, default=max(1, os.cpu_count() or 1))
+    ap.add_argument("--batch", type=int, default=DEFAULT_BATCH, help="bills per encode/score call")
+    ap.add_argument("--topk", type=int, default=DEFAULT_TOPK)
+    ap.add_argument("--tfidf-mode", default=api_service.TFIDF_MODE, choices=api_service.TFIDF_MODES)
+    ap.add_argument("--dense-pooling", default=api_service.DENSE_POOLING, choices=api_service.DENSE_POOLINGS)
+    args = ap.parse_args()
+
+    stats = run(args)
+    print(f"[bulk] done in {stats['seconds']}s: {stats[MATCHED]} matched, {stats[UNCHANGED]} text unchanged, "
+          f"{stats['skipped']} skipped, {stats[NO_TEXT]} without text, {stats[FAILED]} failed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Per-host circuit breakers and latency tracking for upstream calls (Congress.gov,
+Polymarket gamma + CLOB, congress.gov text documents, ...).
+
+  closed     calls go through; BREAKER_FAILURES failures in a row open the breaker
+  open       calls fail at once (BreakerOpen) for BREAKER_COOLDOWN seconds;
+             api_service serves a stale HTTP_CACHE entry instead when it has one
+  half_open  after the cooldown one probe call goes through: success closes the
+             breaker, failure opens it for another cooldown
+
+A failure is a connection error, a timeout or a 5xx; 4xx answers (404 bill) and
+429s (rate_budget.py's business) count as the host being up.
+
+The latencies of successful calls (last LATENCY_WINDOW) give hedge_delay(): a
+latency-critical call (interactive priority) still waiting after the host's p95
+sends one duplicate request and takes whichever answers first.
+
+  breaker = circuit_breaker.for_url(url)
+  if not breaker.allow(): ...                 # open: fail fast / serve stale
+  breaker.record_success(seconds) / record_failure()
+  circuit_breaker.status()                    # per host: state, failures, p50/p95, hedges
+"""
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+BREAKER_FAILURES = int(os.getenv("BREAKER_FAILURES", "5"))
+BREAKER_COOLDOWN = float(os.getenv("BREAKER_COOLDOWN", "30"))
+LATENCY_WINDOW = 200
+HEDGE_MIN_SAMPLES = int(os.getenv("HEDGE_MIN_SAMPLES", "20"))  # no hedging before the p95 means something
+HEDGE_MIN_DELAY = float(os.getenv("HEDGE_MIN_DELAY", "0.05"))
+
+
+class BreakerOpen(RuntimeError):
+    """The upstream host's breaker is open: the call was not attempted."""
+
+
+class CircuitBreaker:
+    def __init__(self, host: str, failures: int = BREAKER_FAILURES, cooldown: float = BREAKER_COOLDOWN):
+        self.host = host
+        self.threshold = failures
+        self.cooldown = cooldown
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probing = False
+        self.latencies: deque = deque(maxlen=LATENCY_WINDOW)
+        self.counts = {"calls": 0, "failures": 0, "rejected": 0, "trips": 0, "hedged": 0, "hedge_wins": 0}
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """May a call go out now? (False while open; one probe at a time when half-open.)"""
+        with self._lock:
+            if self.state == OPEN and time.monotonic() - self.opened_at >= self.cooldown:
+                self.state = HALF_OPEN
+            if self.state == CLOSED or (self.state == HALF_OPEN and not self.probing):
+                self.probing = self.state == HALF_OPEN
+                self.counts["calls"] += 1
+                return True
+            self.counts["rejected"] += 1
+            return False
+
+    def release(self) -> None:
+        """An allowed call did not go out after all (e.g. no upstream budget)."""
+        with self._lock:
+            self.probing = False
+
+    def record_success(self, seconds: Optional[float] = None) -> None:
+        with self._lock:
+            if seconds is not None:
+                self.latencies.append(seconds)
+            self.failures = 0
+            self.probing = False
+            self.state = CLOSED
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.counts["failures"] += 1
+            self.failures += 1
+            if self.state == HALF_OPEN or (self.state == CLOSED and self.failures >= self.threshold):
+                if self.state == CLOSED:
+                    print(f"[breaker] {self.host}: {self.failures} failures in a row, open for {self.cooldown:.0f}s")
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+                self.counts["trips"] += 1
+            self.probing = False
+
+    def _quantile(self, q: float) -> Optional[float]:
+        if not self.latencies:
+            return None
+        xs = sorted(self.latencies)
+        return xs[min(len(xs) - 1, int(q * len(xs)))]
+
+    def hedge_delay(self) -> Optional[float]:
+        """Seconds to wait before a duplicate request (host p95); None = don't hedge."""
+        with self._lock:
+            if self.state != CLOSED or len(self.latencies) < HEDGE_MIN_SAMPLES:
+                return None
+            return max(HEDGE_MIN_DELAY, self._quantile(0.95))
+
+    def record_hedge(self, won: bool) -> None:
+        with self._lock:
+            self.counts["hedged"] += 1
+            self.counts["hedge_wins"] += won
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            now = time.monotonic()
+            if self.state == OPEN and now - self.opened_at >= self.cooldown:
+                self.state = HALF_OPEN
+            p50, p95 = self._quantile(0.5), self._quantile(0.95)
+            return {
+                "state": self.state,
+                "consecutive_failures": self.failures,
+                "retry_in_s": round(max(0.0, self.opened_at + self.cooldown - now), 1) if self.state == OPEN else 0.0,
+                "latency_p50_ms": None if p50 is None else round(p50 * 1000, 1),
+                "latency_p95_ms": None if p95 is None else round(p95 * 1000, 1),
+                **self.counts,
+            }
+
+
+BREAKERS: Dict[str, CircuitBreaker] = {}
+_lock = threading.Lock()
+
+
+def for_url(url: str) -> CircuitBreaker:
+    host = urlsplit(url).hostname or ""
+    b = BREAKERS.get(host)
+    if b is None:
+        with _lock:
+            b = BREAKERS.setdefault(host, CircuitBreaker(host))
+    return b
+
+
+def is_failure_status(status_code: int) -> bool:
+    return status_code >= 500
+
+
+def status() -> Dict[str, Any]:
+    return {"pid": os.getpid(), "hosts": {h: b.status() for h, b in sorted(BREAKERS.items())}}
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Compact result side of the scoring core: the string columns /match returns, held
+as plain object arrays, and a top-k that only touches the k winning rows.
+
+Scores stay in the arrays built by the scorers (embedding store, TF-IDF CSR,
+label indices); nothing here copies the companies DataFrame per request.
+
+Micro-benchmark (allocations + latency, DataFrame path vs this one):
+  python company_table.py --scale 1 10 100
+"""
+import argparse
+import time
+import tracemalloc
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+RESULT_COLUMNS = ("ticker", "name", "sector", "industry")
+COMP_DF_PATH = "artifacts/companies.parquet"
+
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Indices of the k largest scores in DataFrame.nlargest(k) order (ties keep the
+    lower index first). Partition finds the k-th value; only rows at or above it
+    are sorted. Unscored rows (-inf, outside an ANN shortlist) are left out, so
+    fewer than k may come back.
+    """
+    n = len(scores)
+    k = min(k, n)
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    kth = np.partition(scores, n - k)[n - k]
+    cand = np.flatnonzero(scores >= kth)
+    order = np.lexsort((cand, -scores[cand]))
+    top = cand[order[:k]]
+    return top[np.isfinite(scores[top])]
+
+
+class CompanyTable:
+    def __init__(self, df: pd.DataFrame, columns: Sequence[str] = RESULT_COLUMNS):
+        self.columns = tuple(columns)
+        self.n = len(df)
+        self._cols = {c: df[c].to_numpy(dtype=object) for c in self.columns}
+
+    def __len__(self) -> int:
+        return self.n
+
+    def records(self, idx: np.ndarray, scores: np.ndarray, score_col: str = "hybrid_score") -> List[Dict[str, Any]]:
+        """Response rows for idx, same shape as df.iloc[idx][columns + score].to_dict('records')."""
+        cols = [(c, self._cols[c][idx]) for c in self.columns]
+        out = []
+        for r, i in enumerate(idx):
+            rec = {c: vals[r] for c, vals in cols}
+            rec[score_col] = float(scores[i])
+            out.append(rec)
+        return out
+
+    def top_records(self, scores: np.ndarray, k: int) -> List[Dict[str, Any]]:
+        return self.records(top_k_indices(scores, k), scores)
+
+
+# =========================
+# Micro-benchmark
+# =========================
+def dataframe_top(df: pd.DataFrame, scores: np.ndarray, k: int) -> List[Dict[str, Any]]:
+    """Previous match_payload path: full copy + new column + nlargest."""
+    out = df.copy()
+    out["hybrid_score"] = scores
+    top = out.nlargest(k, "hybrid_score")[list(RESULT_COLUMNS) + ["hybrid_score"]]
+    return top.to_dict(orient="records")
+
+
+def _measure(fn, repeats: int):
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    t0 = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - t0) * 1000 / repeats, peak
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--scale", type=int, nargs="+", default=[1, 10, 100],
+                    help="tile the companies table this many times (1 = S&P 500)")
+    ap.add_argument("--topk", type=int, default=5)
+    ap.add_argument("--repeats", type=int, default=50)
+    args = ap.parse_args()
+
+    base = pd.read_parquet(COMP_DF_PATH)
+    rng = np.random.default_rng(0)
+    print(f"{'companies':>10} {'df ms':>8} {'df peak MB':>11} {'core ms':>8} {'core peak KB':>13} {'same':>5}")
+    for scale in args.scale:
+        df = pd.concat([base] * scale, ignore_index=True)
+        table = CompanyTable(df)
+        scores = rng.random(len(df))
+        scores[rng.integers(len(df), size=20)] = scores.max()  # ties at the top
+        same = dataframe_top(df, scores, args.topk) == table.top_records(scores, args.topk)
+        df_ms, df_peak = _measure(lambda: dataframe_top(df, scores, args.topk), args.repeats)
+        core_ms, core_peak = _measure(lambda: table.top_records(scores, args.topk), args.repeats)
+        print(f"{len(df):>10} {df_ms:>8.2f} {df_peak / 1e6:>11.2f} {core_ms:>8.3f} {core_peak / 1e3:>13.1f} {str(same):>5}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Named startup components loaded in parallel, one thread each.
+
+A loader function may call get(other) to wait for a component it needs, so
+dependencies are just calls (including ones only needed on some paths, like the
+model when an artifact is missing). Threads exit when their component is done,
+so nothing is left running when serve.py forks.
+
+  loader = ComponentLoader()
+  loader.add("texts", lambda: json.load(...))
+  loader.add("tfidf", lambda: TfidfEngine.load(loader.get("texts")))
+  loader.start()
+  loader.wait(["tfidf"], timeout=30)
+  loader.status()   # {"tfidf": {"state": "ready", "seconds": 0.4}, ...}
+"""
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+PENDING, LOADING, READY, FAILED = "pending", "loading", "ready", "failed"
+
+
+class ComponentFailed(RuntimeError):
+    pass
+
+
+class _Component:
+    def __init__(self, name: str, fn: Callable[[], Any]):
+        self.name = name
+        self.fn = fn
+        self.state = PENDING
+        self.value: Any = None
+        self.error: Optional[str] = None
+        self.started: Optional[float] = None
+        self.seconds: Optional[float] = None
+        self.done = threading.Event()
+
+
+class ComponentLoader:
+    def __init__(self):
+        self._components: Dict[str, _Component] = {}
+        self._started = False
+        self._lock = threading.Lock()
+
+    def add(self, name: str, fn: Callable[[], Any]) -> None:
+        if self._started:
+            raise RuntimeError("components must be added before start()")
+        self._components[name] = _Component(name, fn)
+
+    @property
+    def names(self) -> List[str]:
+        return list(self._components)
+
+    def _run(self, c: _Component) -> None:
+        c.started = time.perf_counter()
+        c.state = LOADING
+        try:
+            c.value = c.fn()
+            c.seconds = time.perf_counter() - c.started
+            c.state = READY
+            print(f"[startup] {c.name} ready in {c.seconds:.1f}s")
+        except BaseException as e:
+            c.seconds = time.perf_counter() - c.started
+            c.error = f"{type(e).__name__}: {e}"
+            c.state = FAILED
+            print(f"[startup] {c.name} failed after {c.seconds:.1f}s: {c.error}")
+        finally:
+            c.done.set()
+
+    def start(self) -> None:
+        """Start every component (idempotent)."""
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+        for c in self._components.values():
+            threading.Thread(target=self._run, args=(c,), name=f"load-{c.name}", daemon=True).start()
+
+    def get(self, name: str, timeout: Optional[float] = None) -> Any:
+        """Value of a component, waiting for it; ComponentFailed if it (or what it needed) failed."""
+        c = self._components[name]
+        if not c.done.wait(timeout):
+            raise TimeoutError(f"{name} not loaded after {timeout}s")
+        if c.state == FAILED:
+            raise ComponentFailed(f"{name}: {c.error}")
+        return c.value
+
+    def wait(self, names: Optional[Iterable[str]] = None, timeout: Optional[float] = None) -> List[str]:
+        """Wait until names (default: all) are done or timeout passes; returns those not ready."""
+        names = list(names) if names is not None else self.names
+        end = None if timeout is None else time.monotonic() + timeout
+        for n in names:
+            left = None if end is None else max(0.0, end - time.monotonic())
+            if not self._components[n].done.wait(left):
+                break
+        return [n for n in names if self._components[n].state != READY]
+
+    def ready(self, names: Optional[Iterable[str]] = None) -> bool:
+        names = list(names) if names is not None else self.names
+        return all(self._components[n].state == READY for n in names)
+
+    def failed(self) -> Dict[str, str]:
+        return {n: c.error for n, c in self._components.items() if c.state == FAILED}
+
+    def status(self) -> Dict[str, Dict[str, Any]]:
+        now = time.perf_counter()
+        out = {}
+        for n, c in self._components.items():
+            row: Dict[str, Any] = {"state": c.state}
+            if c.seconds is not None:
+                row["seconds"] = round(c.seconds, 3)
+            elif c.started is not None:
+                row["elapsed"] = round(now - c.started, 3)
+            if c.error:
+                row["error"] = c.error
+            out[n] = row
+        return out
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Company embedding store: float32, float16 or int8 with a per-row scale, opened
+with np.load(mmap_mode="r") so uvicorn workers share one copy in the page cache.
+
+Dense similarity runs on the stored representation block by block (only one
+block is widened to float32 at a time); for int8, q . x_i = scale_i * (q . codes_i).
+
+Files (next to company_embeddings.npy):
+  company_embeddings.f16.npy                               float16
+  company_embeddings.i8.npy + company_embeddings.i8_scale.npy   int8 codes + float32 scales
+  company_embeddings.<f16|i8>.json                          source digest (ties the ANN index)
+
+A quantized copy whose source digest is not that of company_embeddings.npy
+(left over from an earlier precompute) is refused (StaleCopy).
+
+Ranking drift vs float32 on held-out bills (needs the model):
+  python embedding_store.py --precision float16 int8 --topk 5
+  python embedding_store.py --precision int8 --save    # also write the int8 files
+"""
+import argparse
+import glob
+import json
+import os
+import time
+from typing import List, Optional
+
+import numpy as np
+
+ARTIFACT_DIR = "artifacts"
+COMP_EMB_PATH = os.path.join(ARTIFACT_DIR, "company_embeddings.npy")
+PRECISIONS = ("float32", "float16", "int8")
+SUFFIX = {"float16": "f16", "int8": "i8"}
+BLOCK_ROWS = 16384   # rows widened to float32 at a time in matmul()
+ALPHA = 0.65         # dense weight in the hybrid score (api_service.ALPHA)
+
+
+def quantized_paths(base: str, precision: str) -> dict:
+    stem = base[:-len(".npy")] if base.endswith(".npy") else base
+    if precision == "float32":
+        return {"codes": base}
+    sfx = SUFFIX[precision]
+    paths = {"codes": f"{stem}.{sfx}.npy", "meta": f"{stem}.{sfx}.json"}
+    if precision == "int8":
+        paths["scale"] = f"{stem}.{sfx}_scale.npy"
+    return paths
+
+
+def quantize(embs: np.ndarray, precision: str):
+    """(codes, scale) for precision; scale is None unless int8."""
+    embs = np.asarray(embs, dtype=np.float32)
+    if precision == "float32":
+        return embs, None
+    if precision == "float16":
+        return embs.astype(np.float16), None
+    if precision == "int8":
+        scale = np.abs(embs).max(axis=1) / 127.0
+        scale[scale == 0] = 1.0
+        codes = np.clip(np.rint(embs / scale[:, None]), -127, 127).astype(np.int8)
+        return codes, scale.astype(np.float32)
+    raise ValueError(f"Unknown precision: {precision}")
+
+
+def save_quantized(embs: np.ndarray, precision: str, base: str = COMP_EMB_PATH) -> dict:
+    """Write the quantized copy of embs next to base; returns the paths written."""
+    from ann_index import embeddings_digest
+    paths = quantized_paths(base, precision)
+    codes, scale = quantize(embs, precision)
+    np.save(paths["codes"], codes)
+    if scale is not None:
+        np.save(paths["scale"], scale)
+    if "meta" in paths:
+        with open(paths["meta"], "w", encoding="utf-8") as f:
+            json.dump({"precision": precision, "source_sha256": embeddings_digest(embs),
+                       "shape": list(embs.shape)}, f, indent=2)
+    return paths
+
+
+class StaleCopy(RuntimeError):
+    """A quantized copy built from other float32 embeddings than the current ones."""
+
+
+class EmbeddingStore:
+    """Read-only (companies x dim) matrix; rows() and matmul() return float32."""
+
+    def __init__(self, codes: np.ndarray, precision: str = "float32",
+                 scale: Optional[np.ndarray] = None, digest: Optional[str] = None):
+        self.codes = codes
+        self.precision = precision
+        self.scale = scale
+        self._digest = digest
+
+    @classmethod
+    def open(cls, precision: str = "float32", base: str = COMP_EMB_PATH, mmap: bool = True,
+             source_digest: Optional[str] = None) -> "EmbeddingStore":
+        """
+        source_digest: embeddings_digest() of the float32 matrix (manifest embeddings_sha256);
+        hashed from base when not given and base exists.
+        """
+        if precision not in PRECISIONS:
+            raise ValueError(f"precision must be one of {PRECISIONS}")
+        paths = quantized_paths(base, precision)
+        if not os.path.exists(paths["codes"]):
+            raise FileNotFoundError(f"{paths['codes']} missing; run precompute_companies.py --emb-precision {precision}")
+        mode = "r" if mmap else None
+        codes = np.load(paths["codes"], mmap_mode=mode)
+        scale = np.load(paths["scale"], mmap_mode=mode) if "scale" in paths else None
+        digest = None
+        if "meta" in paths:
+            with open(paths["meta"], "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            if list(codes.shape) != meta.get("shape"):
+                raise RuntimeError(f"{paths['codes']} shape {codes.shape} does not match {paths['meta']}")
+            digest = meta.get("source_sha256")
+            if source_digest is None and os.path.exists(base):
+                from ann_index import embeddings_digest
+                source_digest = embeddings_digest(np.load(base, mmap_mode="r"))
+            if source_digest is not None and digest != source_digest:
+                raise StaleCopy(f"{paths['codes']} was built from other embeddings than {base}; "
+                                f"run precompute_companies.py --emb-precision {precision}")
+        return cls(codes, precision, scale, digest)
+
+    @classmethod
+    def from_array(cls, embs: np.ndarray) -> "EmbeddingStore":
+        return cls(np.asarray(embs, dtype=np.float32))
+
+    def __len__(self) -> int:
+        return self.codes.shape[0]
+
+    @property
+    def shape(self):
+        return self.codes.shape
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.codes.nbytes + (self.scale.nbytes if self.scale is not None else 0))
+
+    @property
+    def digest(self) -> str:
+        """sha256 of the float32 source matrix (used to match the ANN index)."""
+        if self._digest is None:
+            from ann_index import embeddings_digest
+            self._digest = embeddings_digest(self.codes)
+        return self._digest
+
+    def rows(self, ids) -> np.ndarray:
+        """Dequantized float32 rows."""
+        out = np.asarray(self.codes[ids], dtype=np.float32)
+        if self.scale is not None:
+            out *= self.scale[ids][..., None]
+        return out
+
+    def __getitem__(self, ids) -> np.ndarray:
+        return self.rows(ids)
+
+    def matmul(self, Q: np.ndarray) -> np.ndarray:
+        """(queries x companies) inner products, i.e. Q @ embs.T."""
+        Q = np.asarray(Q, dtype=np.float32)
+        if self.precision == "float32":
+            return Q @ self.codes.T
+        out = np.empty((Q.shape[0], len(self)), dtype=np.float32)
+        for s in range(0, len(self), BLOCK_ROWS):
+            block = np.asarray(self.codes[s:s + BLOCK_ROWS], dtype=np.float32)
+            out[:, s:s + BLOCK_ROWS] = Q @ block.T
+        if self.scale is not None:
+            out *= self.scale[None, :]
+        return out
+
+
+# =========================
+# Ranking drift report
+# =========================
+def drift(ref: np.ndarray, got: np.ndarray, topk: int) -> dict:
+    from scipy.stats import spearmanr
+    top_ref = list(np.argsort(-ref, kind="stable")[:topk])
+    top_got = list(np.argsort(-got, kind="stable")[:topk])
+    head = np.argsort(-ref, kind="stable")[:100]
+    return {
+        "max_abs_diff": float(np.abs(ref - got).max()),
+        "max_hybrid_shift": float(ALPHA * np.abs(ref - got).max()),
+        "spearman_top100": float(spearmanr(ref[head], got[head]).correlation),
+        f"top{topk}_overlap": len(set(top_ref) & set(top_got)) / float(topk),
+        f"top{topk}_same_order": top_ref == top_got,
+    }
+
+
+def drift_report(embs: np.ndarray, queries: np.ndarray, precisions: List[str], topk: int) -> dict:
+    ref = queries @ np.asarray(embs, dtype=np.float32).T
+    report = {}
+    for p in precisions:
+        codes, scale = quantize(embs, p)
+        store = EmbeddingStore(codes, p, scale)
+        t0 = time.perf_counter()
+        got = store.matmul(queries)
+        ms = (time.perf_counter() - t0) * 1000 / len(queries)
+        rows = [drift(r, g, topk) for r, g in zip(ref, got)]
+        key = f"top{topk}_overlap"
+        report[p] = {
+            "bytes": store.nbytes,
+            "ms_per_query": ms,
+            "worst_max_abs_diff": max(r["max_abs_diff"] for r in rows),
+            "worst_hybrid_shift": max(r["max_hybrid_shift"] for r in rows),
+            "mean_spearman_top100": float(np.mean([r["spearman_top100"] for r in rows])),
+            f"mean_{key}": float(np.mean([r[key] for r in rows])),
+            f"top{topk}_same_order_rate": float(np.mean([r[f"top{topk}_same_order"] for r in rows])),
+        }
+    return report
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--precision", nargs="+", default=["float16", "int8"], choices=PRECISIONS)
+    ap.add_argument("--bills-dir", default="bill_texts", help="held-out cleaned bill .txt files")
+    ap.add_argument("--topk", type=int, default=5)
+    ap.add_argument("--json", default=None, help="optional path to write the report")
+    ap.add_argument("--save", action="store_true", help="write the quantized files from company_embeddings.npy")
+    args = ap.parse_args()
+
+    from sentence_transformers import SentenceTransformer
+    embs = np.load(COMP_EMB_PATH)
+    if args.save:
+        for p in args.precision:
+            if p != "float32":
+                print(f"Saved {p} embeddings → {save_quantized(embs, p)['codes']}")
+
+    texts = []
+    for p in sorted(glob.glob(os.path.join(args.bills_dir, "*.txt"))):
+        with open(p, "r", encoding="utf-8") as f:
+            texts.append(f.read()[:6000])
+    if not texts:
+        raise SystemExit(f"No .txt files in {args.bills_dir}")
+    with open(os.path.join(ARTIFACT_DIR, "manifest.json"), "r", encoding="utf-8") as f:
+        model_name = json.load(f).get("model", "all-mpnet-base-v2")
+    model = SentenceTransformer(model_name)
+    queries = model.encode(texts, convert_to_numpy=True, normalize_embeddings=True, show_progress_bar=False)
+
+    report = drift_report(embs, queries, args.precision, args.topk)
+    print(f"{len(texts)} held-out bills vs float32 ({embs.nbytes / 1e6:.1f} MB):")
+    for p, r in report.items():
+        print(f"  {p:<8} {r['bytes'] / 1e6:>7.1f} MB  max|Δ| {r['worst_max_abs_diff']:.5f}  "
+              f"hybridΔ {r['worst_hybrid_shift']:.5f}  spearman@100 {r['mean_spearman_top100']:.4f}  "
+              f"top{args.topk} overlap {r[f'mean_top{args.topk}_overlap']:.2f}  "
+              f"same order {r[f'top{args.topk}_same_order_rate']:.2f}  {r['ms_per_query']:.2f} ms/query")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"✅ Report saved to '{args.json}'")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Sentence encoders behind one interface: encode(texts, ...) -> normalized float32
+embeddings, same keyword arguments as SentenceTransformer.encode.
+
+Backends (ENCODER_BACKEND):
+  sentence-transformers   PyTorch model, as before (default)
+  onnx                    ONNX Runtime export of the same transformer + mean pooling
+  onnx-int8               same graph with dynamic int8 weight quantization
+
+Export the ONNX models once (needs torch + transformers + onnxruntime):
+  python encoder.py --export                 # -> onnx/all-mpnet-base-v2/{model,model-int8}.onnx, export.json
+load_encoder() checks that an ONNX export is of the requested model (export.json, or the
+directory name for exports without it).
+Compare backends on the company texts with encoder_bench.py.
+"""
+import argparse
+import json
+import os
+from typing import List
+
+import numpy as np
+
+MODEL_NAME = "all-mpnet-base-v2"
+BACKENDS = ("sentence-transformers", "onnx", "onnx-int8")
+ONNX_DIR = os.getenv("ONNX_MODEL_DIR", os.path.join("onnx", MODEL_NAME))
+MAX_SEQ_LENGTH = 384  # all-mpnet-base-v2's sentence-transformers max_seq_length
+EXPORT_INPUTS = ("input_ids", "attention_mask")  # graph inputs written by export_onnx()
+EXPORT_META = "export.json"  # {"model_name", "dim"} written by export_onnx()
+
+
+def _normalize(embs: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(embs, axis=1, keepdims=True)
+    return embs / np.maximum(norms, 1e-12)
+
+
+class SentenceTransformerEncoder:
+    def __init__(self, model_name: str = MODEL_NAME):
+        from sentence_transformers import SentenceTransformer
+        self.model = SentenceTransformer(model_name)
+        self.name = f"{model_name}:sentence-transformers"
+
+    def encode(self, texts: List[str], convert_to_numpy: bool = True, normalize_embeddings: bool = True,
+               batch_size: int = 32, show_progress_bar: bool = False) -> np.ndarray:
+        return self.model.encode(texts, convert_to_numpy=True, normalize_embeddings=normalize_embeddings,
+                                 batch_size=batch_size, show_progress_bar=show_progress_bar)
+
+
+class OnnxEncoder:
+    """
+    Exported transformer run by ONNX Runtime on CPU, followed by the same
+    attention-masked mean pooling as the sentence-transformers model.
+    """
+
+    def __init__(self, model_dir: str = ONNX_DIR, quantized: bool = False, threads: int = 0):
+        from transformers import AutoTokenizer
+
+        self.path = os.path.join(model_dir, "model-int8.onnx" if quantized else "model.onnx")
+        if not os.path.exists(self.path):
+            raise RuntimeError(f"{self.path} missing; run `python encoder.py --export` first")
+        self.threads = threads
+        self._sessions = {}
+        self._shared = None
+        self.input_names = set(EXPORT_INPUTS)  # known from the export: no session needed in a parent
+        meta = {}
+        if os.path.exists(os.path.join(model_dir, EXPORT_META)):
+            with open(os.path.join(model_dir, EXPORT_META), "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        self.model_name = meta.get("model_name") or os.path.basename(os.path.normpath(model_dir))
+        self._dim = meta.get("dim")
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        self.name = f"{os.path.basename(os.path.normpath(model_dir))}:onnx{'-int8' if quantized else ''}"
+
+    @property
+    def dim(self) -> int:
+        if self._dim is None:  # exports without export.json: the graph's static hidden size
+            self._dim = int(self.session.get_outputs()[0].shape[-1])
+        return self._dim
+
+    def _new_session(self, threads: int):
+        import onnxruntime as ort
+        opts = ort.SessionOptions()
+        opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads:
+            opts.intra_op_num_threads = threads
+        return ort.InferenceSession(self.path, opts, providers=["CPUExecutionProvider"])
+
+    def share_session(self) -> None:
+        """
+        Build the session now, single-threaded, for the processes forked after this call
+        (serve.py): they use it as is, so its weights are shared copy-on-write. With one
+        intra-op thread ONNX Runtime starts no thread pool (a pool would not survive fork()).
+        """
+        self._shared = self._new_session(threads=1)
+
+    @property
+    def session(self):
+        # Else one session per process, built on first use: a worker forked by serve.py
+        # (--onnx-session per-worker) builds its own, with its own copy of the weights
+        if self._shared is not None:
+            return self._shared
+        pid = os.getpid()
+        if pid not in self._sessions:
+            self._sessions[pid] = self._new_session(self.threads)
+        return self._sessions[pid]
+
+    def _embed(self, texts: List[str]) -> np.ndarray:
+        tok = self.tokenizer(texts, padding=True, truncation=True, max_length=MAX_SEQ_LENGTH, return_tensors="np")
+        feeds = {k: v.astype(np.int64) for k, v in tok.items() if k in self.input_names}
+        hidden = self.session.run(None, feeds)[0]
+        mask = tok["attention_mask"][..., None].astype(np.float32)
+        return (hidden * mask).sum(axis=1) / np.maximum(mask.sum(axis=1), 1e-9)
+
+    def encode(self, texts: List[str], convert_to_numpy: bool = True, normalize_embeddings: bool = True,
+               batch_size: int = 32, show_progress_bar: bool = False) -> np.ndarray:
+        if isinstance(texts, str):
+            texts = [texts]
+        if not texts:
+            return np.empty((0, self.dim), dtype=np.float32)
+        # Longest first, like sentence-transformers, so batches pad to similar lengths
+        order = np.argsort([-len(t) for t in texts], kind="stable")
+        out = [None] * len(texts)
+        for s in range(0, len(texts), batch_size):
+            idx = order[s:s + batch_size]
+            embs = self._embed([texts[i] for i in idx])
+            for i, e in zip(idx, embs):
+                out[i] = e
+        embs = np.vstack(out).astype(np.float32)
+        return _normalize(embs) if normalize_embeddings else embs
+
+
+def _short_name(model_name: str) -> str:
+    # "sentence-transformers/all-mpnet-base-v2" and "all-mpnet-base-v2" are the same model
+    return model_name.rstrip("/").split("/")[-1]
+
+
+def load_encoder(backend: str = "sentence-transformers", model_name: str = MODEL_NAME,
+                 onnx_dir: str = ONNX_DIR):
+    if backend == "sentence-transformers":
+        return SentenceTransformerEncoder(model_name)
+    if backend in ("onnx", "onnx-int8"):
+        enc = OnnxEncoder(onnx_dir, quantized=backend == "onnx-int8")
+        if _short_name(enc.model_name) != _short_name(model_name):
+            raise ValueError(f"{onnx_dir} is an export of {enc.model_name}, not {model_name}; run "
+                             f"`python encoder.py --export --model {model_name} --out <dir>` and set ONNX_MODEL_DIR")
+        return enc
+    raise ValueError(f"Unknown encoder backend {backend!r}; expected one of {BACKENDS}")
+
+
+# =========================
+# Export
+# =========================
+def export_onnx(model_name: str = MODEL_NAME, out_dir: str = ONNX_DIR, quantize: bool = True) -> None:
+    """Export the transformer under the sentence-transformers model to ONNX (+ int8 copy)."""
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    os.makedirs(out_dir, exist_ok=True)
+    st = SentenceTransformer(model_name, device="cpu")
+    hf_model = st[0].auto_model.eval()
+    tokenizer = st.tokenizer
+    tokenizer.save_pretrained(out_dir)
+
+    sample = tokenizer(["export sample"], return_tensors="pt")
+    names = [k for k in EXPORT_INPUTS if k in sample]
+    dynamic = {k: {0: "batch", 1: "seq"} for k in names}
+    dynamic["last_hidden_state"] = {0: "batch", 1: "seq"}
+    path = os.path.join(out_dir, "model.onnx")
+    with torch.no_grad():
+        torch.onnx.export(
+            hf_model, tuple(sample[k] for k in names), path,
+            input_names=names, output_names=["last_hidden_state"],
+            dynamic_axes=dynamic, opset_version=17,
+        )
+    print(f"✅ Exported → {path}")
+    with open(os.path.join(out_dir, EXPORT_META), "w", encoding="utf-8") as f:
+        json.dump({"model_name": model_name, "dim": int(hf_model.config.hidden_size)}, f)
+
+    if quantize:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+        qpath = os.path.join(out_dir, "model-int8.onnx")
+        quantize_dynamic(path, qpath, weight_type=QuantType.QInt8)
+        print(f"✅ Quantized → {qpath}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--export", action="store_true", help="export ONNX (+ int8) models")
+    ap.add_argument("--model", default=MODEL_NAME)
+    ap.add_argument("--out", default=ONNX_DIR)
+    ap.add_argument("--no-quantize", action="store_true")
+    args = ap.parse_args()
+    if not args.export:
+        ap.print_help()
+        return
+    export_onnx(args.model, args.out, quantize=not args.no_quantize)
+
+
+if __name__ == "__main__":
+    main()
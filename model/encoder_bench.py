@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Compare encoder backends on the company texts:
+  - throughput: company texts encoded per second (batch_size as in precompute)
+  - latency:    single-query encode p50/p95 (what /match pays per uncached bill)
+  - agreement:  cosine between each backend's embedding and the reference backend's,
+                plus top-5 company overlap for the single queries
+
+Usage:
+  python encoder_bench.py                                   # all three backends
+  python encoder_bench.py --backends sentence-transformers onnx-int8 --limit 200 --json bench.json
+"""
+import argparse
+import glob
+import json
+import os
+import time
+
+import numpy as np
+
+from encoder import BACKENDS, load_encoder
+
+COMP_TEXTS_PATH = os.path.join("artifacts", "company_texts.json")
+
+
+def bench(encoder, texts, queries, batch_size: int) -> dict:
+    encoder.encode(texts[:batch_size], batch_size=batch_size)  # warm-up
+    t0 = time.perf_counter()
+    embs = encoder.encode(texts, batch_size=batch_size)
+    elapsed = time.perf_counter() - t0
+
+    lat, q_embs = [], []
+    for q in queries:
+        t0 = time.perf_counter()
+        q_embs.append(encoder.encode([q])[0])
+        lat.append((time.perf_counter() - t0) * 1000)
+    return {
+        "embs": embs,
+        "q_embs": np.vstack(q_embs),
+        "texts_per_s": len(texts) / elapsed,
+        "latency_p50_ms": float(np.percentile(lat, 50)),
+        "latency_p95_ms": float(np.percentile(lat, 95)),
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--backends", nargs="+", default=list(BACKENDS), choices=BACKENDS,
+                    help="first one is the reference for agreement")
+    ap.add_argument("--limit", type=int, default=0, help="only the first N company texts (0 = all)")
+    ap.add_argument("--batch-size", type=int, default=64)
+    ap.add_argument("--queries", type=int, default=30, help="single-query latency samples")
+    ap.add_argument("--json", default=None)
+    args = ap.parse_args()
+
+    with open(COMP_TEXTS_PATH, "r", encoding="utf-8") as f:
+        texts = list(json.load(f))
+    if args.limit:
+        texts = texts[:args.limit]
+    queries = []
+    for p in sorted(glob.glob(os.path.join("bill_texts", "*.txt"))):
+        with open(p, "r", encoding="utf-8") as f:
+            queries.append(f.read()[:6000])
+    queries = (queries + texts[::max(1, len(texts) // args.queries)])[:args.queries]
+
+    runs = {}
+    for b in args.backends:
+        t0 = time.perf_counter()
+        enc = load_encoder(b)
+        load_s = time.perf_counter() - t0
+        runs[b] = bench(enc, texts, queries, args.batch_size)
+        runs[b]["load_s"] = load_s
+        print(f"{b:<22} load {load_s:6.1f} s | {runs[b]['texts_per_s']:8.1f} texts/s | "
+              f"query p50 {runs[b]['latency_p50_ms']:7.1f} ms  p95 {runs[b]['latency_p95_ms']:7.1f} ms")
+
+    ref_name = args.backends[0]
+    ref = runs[ref_name]
+    report = {}
+    for b, r in runs.items():
+        cos = np.sum(r["embs"] * ref["embs"], axis=1)
+        top_ref = np.argsort(-(ref["q_embs"] @ ref["embs"].T), axis=1)[:, :5]
+        top_b = np.argsort(-(r["q_embs"] @ r["embs"].T), axis=1)[:, :5]
+        overlap = np.mean([len(set(x) & set(y)) / 5.0 for x, y in zip(top_ref, top_b)])
+        report[b] = {k: v for k, v in r.items() if k not in ("embs", "q_embs")}
+        report[b].update({
+            "cosine_vs_ref_min": float(cos.min()),
+            "cosine_vs_ref_mean": float(cos.mean()),
+            "top5_overlap_vs_ref": float(overlap),
+        })
+    print(f"\nAgreement vs {ref_name} over {len(texts)} company texts / {len(queries)} queries:")
+    for b, r in report.items():
+        print(f"  {b:<22} cos min {r['cosine_vs_ref_min']:.5f}  mean {r['cosine_vs_ref_mean']:.5f}  "
+              f"top5 overlap {r['top5_overlap_vs_ref']:.3f}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"reference": ref_name, "backends": report}, f, indent=2)
+        print(f"✅ Report saved to '{args.json}'")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+HTTP response cache under api_service._get(): memory LRU in front of files on disk
+(cache_dir/<key[:2]>/<key>.json), so a restart starts warm.
+
+Each URL maps to a resource kind with its own TTL (RULES; override with
+HTTP_CACHE_TTL_<KIND> seconds, 0 = never cache):
+  bill_text      text documents (one URL per text version)      30 days
+  text_versions  /bill/{c}/{t}/{n}/text                          1 hour
+  summaries      /bill/{c}/{t}/{n}/summaries                     12 hours
+  cosponsors     /bill/{c}/{t}/{n}/cosponsors                    6 hours
+  actions        /bill/{c}/{t}/{n}/actions                       30 min
+  bill           /bill/{c}/{t}/{n}                               30 min
+  member_bills   /member/{id}/sponsored|cosponsored-legislation  15 min
+  listing        /bill, /bill/{c}, /bill/{c}/{t}                 5 min
+  markets        Polymarket gamma /events/slug/{slug}             1 min
+  price_history  Polymarket CLOB /prices-history                  1 min
+  (anything else is not cached)
+
+A stale entry that came with an ETag / Last-Modified is revalidated with
+If-None-Match / If-Modified-Since; a 304 refreshes it without a new body.
+The api_key query parameter is not part of the key (nor stored). While an
+upstream host is down (circuit_breaker.py) a stale entry is served as is.
+
+  python http_cache.py              # entries on disk per kind
+  python http_cache.py --prune 7    # delete entries stale for more than 7 days
+"""
+import argparse
+import asyncio
+import json
+import os
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlencode, urlsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from bill_cache import LRUCache, text_key
+
+HTTP_CACHE_DIR = os.getenv("HTTP_CACHE_DIR", os.path.join("cache", "http"))
+HTTP_CACHE_MAX_MB = int(os.getenv("HTTP_CACHE_MAX_MB", "64"))
+SECRET_PARAMS = frozenset({"api_key"})
+KEPT_HEADERS = ("Content-Type", "ETag", "Last-Modified")
+
+_BILL = r"/v3/bill/\d+/[a-z]+/\d+"
+RULES: List[Tuple[str, str, str, float]] = [  # (kind, host, path regex, default TTL seconds)
+    ("text_versions", "api.congress.gov", _BILL + r"/text$", 3600),
+    ("summaries", "api.congress.gov", _BILL + r"/summaries$", 12 * 3600),
+    ("cosponsors", "api.congress.gov", _BILL + r"/cosponsors$", 6 * 3600),
+    ("actions", "api.congress.gov", _BILL + r"/actions$", 1800),
+    ("bill", "api.congress.gov", _BILL + r"$", 1800),
+    ("member_bills", "api.congress.gov", r"/v3/member/[A-Za-z0-9]+/(sponsored|cosponsored)-legislation$", 900),
+    ("listing", "api.congress.gov", r"/v3/bill(/\d+(/[a-z]+)?)?$", 300),
+    ("bill_text", "www.congress.gov", r"/\d+/bills/.+\.(htm|html|xml|txt)$", 30 * 86400),
+    ("bill_text", "www.govinfo.gov", r"/.+\.(htm|html|xml|txt)$", 30 * 86400),
+    ("markets", "gamma-api.polymarket.com", r"/events/slug/[^/]+$", 60),
+    ("price_history", "clob.polymarket.com", r"/prices-history$", 60),
+]
+TTLS = {kind: float(os.getenv(f"HTTP_CACHE_TTL_{kind.upper()}", str(ttl))) for kind, _, _, ttl in RULES}
+_COMPILED = [(kind, host, re.compile(rx, re.I)) for kind, host, rx, _ in RULES]
+
+
+def resource_kind(url: str) -> Optional[str]:
+    parts = urlsplit(url)
+    for kind, host, rx in _COMPILED:
+        if parts.hostname == host and rx.search(parts.path.rstrip("/") or "/"):
+            return kind
+    return None
+
+
+def cache_key(url: str, params: Optional[Dict[str, Any]]) -> Tuple[str, str]:
+    """(key, url with the non-secret params) for a GET."""
+    clean = sorted((k, str(v)) for k, v in (params or {}).items() if k not in SECRET_PARAMS and v is not None)
+    full = url + ("?" + urlencode(clean) if clean else "")
+    return text_key("GET", full), full
+
+
+def as_response(entry: Dict[str, Any]) -> requests.Response:
+    """A requests.Response rebuilt from a cache entry (json()/text/content/raise_for_status work)."""
+    r = requests.Response()
+    r.status_code = 200
+    r.reason = "OK"
+    r.url = entry["url"]
+    r.headers = CaseInsensitiveDict(entry["headers"])
+    r.encoding = entry.get("encoding") or "utf-8"
+    r._content = entry["body"].encode("utf-8", "surrogateescape")
+    return r
+
+
+class HttpCache:
+    def __init__(self, cache_dir: str = HTTP_CACHE_DIR, max_bytes: int = HTTP_CACHE_MAX_MB * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.mem = LRUCache(max_bytes)
+        self._stats_lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, int]] = {}
+        os.makedirs(cache_dir, exist_ok=True)
+
+    # ---- stats
+    def _count(self, kind: str, what: str) -> None:
+        with self._stats_lock:
+            s = self._stats.setdefault(kind, {"memory_hits": 0, "disk_hits": 0, "revalidated": 0,
+                                              "misses": 0, "stores": 0, "stale_served": 0})
+            s[what] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            kinds = {k: dict(v) for k, v in self._stats.items()}
+        for s in kinds.values():
+            hits = s["memory_hits"] + s["disk_hits"] + s["revalidated"]
+            looks = hits + s["misses"]
+            s["hit_ratio"] = round(hits / looks, 4) if looks else None
+        return {"memory_bytes": self.mem.bytes, "memory_entries": len(self.mem), "ttls": TTLS, "kinds": kinds}
+
+    # ---- disk
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], key + ".json")
+
+    def _read(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write(self, key: str, entry: Dict[str, Any]) -> None:
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(entry, f)  # ensure_ascii keeps surrogate-escaped bytes round-trippable
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"[http_cache] Could not persist {entry['url'][:80]}: {e}")
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+    # ---- public API
+    def lookup(self, url: str, params=None) -> Tuple[Optional[str], Optional[Dict[str, Any]], bool]:
+        """(kind, entry, fresh); kind None = not cacheable, entry None = nothing stored."""
+        kind = resource_kind(url)
+        if kind is None or TTLS[kind] <= 0:
+            return None, None, False
+        key, _ = cache_key(url, params)
+        entry = self.mem.get(("http", key))
+        tier = "memory_hits"
+        if entry is None:
+            entry = self._read(key)
+            tier = "disk_hits"
+            if entry is not None:
+                self.mem.put(("http", key), entry)
+        if entry is None:
+            self._count(kind, "misses")
+            return kind, None, False
+        fresh = time.time() - entry["fetched_at"] < TTLS[kind]
+        if fresh:
+            self._count(kind, tier)
+        return kind, entry, fresh
+
+    async def alookup(self, url: str, params=None) -> Tuple[Optional[str], Optional[Dict[str, Any]], bool]:
+        """lookup() for coroutines: a memory hit answers on the event loop, a disk read runs in a thread."""
+        kind = resource_kind(url)
+        if kind is None or TTLS[kind] <= 0:
+            return None, None, False
+        key, _ = cache_key(url, params)
+        if self.mem.get(("http", key)) is None:
+            return await asyncio.to_thread(self.lookup, url, params)
+        return self.lookup(url, params)
+
+    @staticmethod
+    def conditional_headers(entry: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        if not entry:
+            return {}
+        h = entry["headers"]
+        out = {}
+        if h.get("ETag"):
+            out["If-None-Match"] = h["ETag"]
+        if h.get("Last-Modified"):
+            out["If-Modified-Since"] = h["Last-Modified"]
+        return out
+
+    def revalidated(self, kind: str, url: str, params, entry: Dict[str, Any]) -> requests.Response:
+        """304 for a stale entry: keep the body, restart its TTL."""
+        entry = dict(entry, fetched_at=time.time())
+        key, _ = cache_key(url, params)
+        self.mem.put(("http", key), entry)
+        self._write(key, entry)
+        self._count(kind, "revalidated")
+        return as_response(entry)
+
+    async def arevalidated(self, kind: str, url: str, params, entry: Dict[str, Any]) -> requests.Response:
+        return await asyncio.to_thread(self.revalidated, kind, url, params, entry)
+
+    def serve_stale(self, kind: str, entry: Dict[str, Any]) -> requests.Response:
+        """The stale entry as is, the upstream being unavailable."""
+        self._count(kind, "stale_served")
+        return as_response(entry)
+
+    def store(self, kind: str, url: str, params, resp: requests.Response, stale: bool = False) -> None:
+        if resp.status_code != 200:
+            return
+        if stale:  # lookup() found a stale entry and counted nothing yet
+            self._count(kind, "misses")
+        key, full = cache_key(url, params)
+        entry = {
+            "url": full,
+            "fetched_at": time.time(),
+            "headers": {h: resp.headers[h] for h in KEPT_HEADERS if h in resp.headers},
+            "encoding": resp.encoding,
+            "body": resp.content.decode("utf-8", "surrogateescape"),
+        }
+        self.mem.put(("http", key), entry)
+        self._write(key, entry)
+        self._count(kind, "stores")
+
+    async def astore(self, kind: str, url: str, params, resp, stale: bool = False) -> None:
+        """store() for coroutines: the file is written in a thread."""
+        await asyncio.to_thread(self.store, kind, url, params, resp, stale)
+
+    def disk_summary(self) -> Dict[str, Dict[str, Any]]:
+        out: Dict[str, Dict[str, Any]] = {}
+        for path, entry in self._iter_disk():
+            kind = resource_kind(entry["url"]) or "other"
+            s = out.setdefault(kind, {"entries": 0, "bytes": 0, "stale": 0})
+            s["entries"] += 1
+            s["bytes"] += os.path.getsize(path)
+            s["stale"] += time.time() - entry["fetched_at"] >= TTLS.get(kind, 0)
+        return out
+
+    def prune(self, older_than: float) -> int:
+        """Delete entries stale for more than older_than seconds; returns how many."""
+        removed = 0
+        for path, entry in self._iter_disk():
+            ttl = TTLS.get(resource_kind(entry["url"]) or "", 0)
+            if time.time() - entry["fetched_at"] > ttl + older_than:
+                os.remove(path)
+                removed += 1
+        return removed
+
+    def _iter_disk(self):
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if name.endswith(".json"):
+                    path = os.path.join(root, name)
+                    try:
+                        with open(path, "r", encoding="utf-8") as f:
+                            yield path, json.load(f)
+                    except (OSError, ValueError):
+                        continue
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--dir", default=HTTP_CACHE_DIR)
+    ap.add_argument("--prune", type=float, default=None, metavar="DAYS",
+                    help="delete entries stale for more than DAYS days")
+    args = ap.parse_args()
+    cache = HttpCache(args.dir)
+    if args.prune is not None:
+        print(f"[http_cache] removed {cache.prune(args.prune * 86400)} entries")
+    print(json.dumps(cache.disk_summary(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
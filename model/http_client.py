@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP client for every upstream call (Congress.gov, Polymarket gamma + CLOB,
+Wikipedia, ...): one requests.Session per process with keep-alive connection
+pools, so repeated calls to a host reuse its TCP/TLS connections instead of
+opening a new one each time.
+
+  http_client.get(url, params=..., timeout=...)          # drop-in for requests.get
+  await http_client.aget(url, params=..., timeout=...)   # same, on an httpx.AsyncClient (async endpoints)
+  http_client.stats()                                   # per host: requests, connections opened / reused
+
+Per host at most HOST_LIMITS[host] (else DEFAULT_HOST_LIMIT) connections are open
+at once; further requests wait for a free one (pool_block; a per-host semaphore on
+the async side) instead of opening extra sockets. Timeouts default to
+(HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT).
+
+HTTP_UPSTREAM_OVERRIDE=http://127.0.0.1:8900 sends every call for
+https://<host>/<path> to <override>/<host>/<path> instead (local stand-ins,
+loadtest.py); host limits, rate budgets and caches still go by the real host.
+
+HTTP/2: the async clients negotiate it over TLS (ALPN; HTTP/1.1 when the host does
+not offer h2) when HTTP2 is on (default) and the h2 package is installed
+(httpx[http2]); stats() counts the calls answered over HTTP/2 (`http2`). The sync
+session stays on HTTP/1.1: requests/urllib3 have no HTTP/2 with fallback (urllib3's
+experimental h2 mode is process-wide and h2-only), and with pooled keep-alive the
+handshake is paid once per connection rather than per call.
+
+The session is created per pid (the async client per pid and event loop): a
+process forked by serve.py / bulk_match.py must not share its parent's sockets.
+"""
+import asyncio
+import importlib.util
+import os
+import threading
+import weakref
+from typing import Any, Dict, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+USER_AGENT = "bill-matcher-api/1.0"
+CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "30"))
+DEFAULT_HOST_LIMIT = int(os.getenv("HTTP_HOST_LIMIT", "8"))
+HOST_LIMITS = {
+    "api.congress.gov": int(os.getenv("CONGRESS_MAX_CONNECTIONS", "16")),
+    "gamma-api.polymarket.com": 8,
+    "clob.polymarket.com": 8,
+}
+MAX_HOSTS = 32  # pools kept (one per host)
+POOL_SHARD = 16  # connections per httpx pool (see _HostClients)
+UPSTREAM_OVERRIDE = os.getenv("HTTP_UPSTREAM_OVERRIDE", "").rstrip("/")
+HTTP2 = os.getenv("HTTP2", "1") != "0" and importlib.util.find_spec("h2") is not None
+
+Timeout = Union[float, Tuple[float, float]]
+
+
+# =========================
+# Counters
+# =========================
+class _Stats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._hosts: Dict[str, Dict[str, int]] = {}
+
+    def _row(self, host: str) -> Dict[str, int]:
+        row = self._hosts.get(host)
+        if row is None:
+            row = self._hosts[host] = {"requests": 0, "opened": 0, "errors": 0, "http2": 0}
+        return row
+
+    def add(self, host: str, key: str) -> None:
+        with self._lock:
+            self._row(host)[key] += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self._hosts.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            hosts = {h: dict(r) for h, r in self._hosts.items()}
+        total = {"requests": 0, "opened": 0, "errors": 0, "http2": 0}
+        for r in hosts.values():
+            r["reused"] = max(0, r["requests"] - r["opened"])
+            for k in total:
+                total[k] += r[k]
+        total["reused"] = max(0, total["requests"] - total["opened"])
+        return {"pid": os.getpid(), "http2": HTTP2, "total": total, "hosts": hosts}
+
+
+STATS = _Stats()
+
+
+class _CountingHTTPConnectionPool(HTTPConnectionPool):
+    def _new_conn(self):
+        STATS.add(self.host, "opened")
+        return super()._new_conn()
+
+
+class _CountingHTTPSConnectionPool(HTTPSConnectionPool):
+    def _new_conn(self):
+        STATS.add(self.host, "opened")
+        return super()._new_conn()
+
+
+class _HostAdapter(HTTPAdapter):
+    """Keep-alive pool with at most `limit` connections per host; counts requests."""
+
+    def __init__(self, limit: int):
+        super().__init__(pool_connections=MAX_HOSTS, pool_maxsize=limit, pool_block=True, max_retries=0)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {"http": _CountingHTTPConnectionPool,
+                                                   "https": _CountingHTTPSConnectionPool}
+
+    def send(self, request, *args, **kwargs):
+        host = urlsplit(request.url).hostname or ""
+        STATS.add(host, "requests")
+        try:
+            return super().send(request, *args, **kwargs)
+        except requests.RequestException:
+            STATS.add(host, "errors")
+            raise
+
+
+# =========================
+# Session
+# =========================
+_sessions: Dict[int, requests.Session] = {}
+_sessions_lock = threading.Lock()
+
+
+def route(url: str) -> str:
+    """Where a call for url is actually sent (HTTP_UPSTREAM_OVERRIDE)."""
+    if not UPSTREAM_OVERRIDE:
+        return url
+    parts = urlsplit(url)
+    return f"{UPSTREAM_OVERRIDE}/{parts.netloc}{parts.path or '/'}" + (f"?{parts.query}" if parts.query else "")
+
+
+def _new_session() -> requests.Session:
+    s = requests.Session()
+    s.headers["User-Agent"] = USER_AGENT
+    s.mount("http://", _HostAdapter(DEFAULT_HOST_LIMIT))
+    s.mount("https://", _HostAdapter(DEFAULT_HOST_LIMIT))
+    for host, limit in HOST_LIMITS.items():
+        s.mount(route(f"https://{host}/"), _HostAdapter(limit))
+    return s
+
+
+def session() -> requests.Session:
+    pid = os.getpid()
+    s = _sessions.get(pid)
+    if s is None:
+        with _sessions_lock:
+            s = _sessions.get(pid)
+            if s is None:
+                if _sessions:  # forked: the parent's sockets and counters are not ours
+                    _sessions.clear()
+                    STATS.reset()
+                s = _sessions[pid] = _new_session()
+    return s
+
+
+def timeout_for(timeout: Optional[Timeout]) -> Tuple[float, float]:
+    """(connect, read) seconds; a single number caps both."""
+    if timeout is None:
+        return CONNECT_TIMEOUT, READ_TIMEOUT
+    if isinstance(timeout, tuple):
+        return timeout
+    return min(CONNECT_TIMEOUT, timeout), timeout
+
+
+def get(url: str, params=None, timeout: Optional[Timeout] = None, headers: Optional[Dict[str, str]] = None,
+        **kwargs) -> requests.Response:
+    """requests.get over the shared pooled session."""
+    return session().get(route(url), params=params, timeout=timeout_for(timeout), headers=headers, **kwargs)
+
+
+# =========================
+# Async client
+# =========================
+class _HostClients:
+    """
+    Async clients of one host: at most `limit` requests at once (semaphore), spread
+    over ceil(limit / POOL_SHARD) httpx pools, each call on the least busy one.
+    httpcore scans every pooled connection for every queued request, so a single
+    pool of a few hundred connections spends its time in that scan.
+    """
+
+    def __init__(self, limit: int):
+        self.slots = asyncio.Semaphore(limit)
+        n = max(1, -(-limit // POOL_SHARD))
+        per_pool = -(-limit // n)
+        self.clients = [
+            httpx.AsyncClient(headers={"User-Agent": USER_AGENT}, follow_redirects=True, http2=HTTP2,
+                              limits=httpx.Limits(max_connections=per_pool, max_keepalive_connections=per_pool))
+            for _ in range(n)
+        ]
+        self.busy = [0] * n
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        async with self.slots:
+            i = min(range(len(self.clients)), key=self.busy.__getitem__)
+            self.busy[i] += 1
+            try:
+                return await self.clients[i].get(url, **kwargs)
+            finally:
+                self.busy[i] -= 1
+
+    async def aclose(self) -> None:
+        for c in self.clients:
+            await c.aclose()
+
+
+class _AsyncState:
+    """Per-host async clients of one event loop in one process."""
+
+    def __init__(self):
+        self.pid = os.getpid()
+        self.hosts: Dict[str, _HostClients] = {}
+
+    def host(self, host: str) -> _HostClients:
+        hc = self.hosts.get(host)
+        if hc is None:
+            hc = self.hosts[host] = _HostClients(HOST_LIMITS.get(host, DEFAULT_HOST_LIMIT))
+        return hc
+
+
+_async_states: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _AsyncState]" = weakref.WeakKeyDictionary()
+
+
+def _async_state() -> _AsyncState:
+    session()  # resets the counters in a fresh fork
+    loop = asyncio.get_running_loop()
+    st = _async_states.get(loop)
+    if st is None or st.pid != os.getpid():
+        st = _async_states[loop] = _AsyncState()
+    return st
+
+
+async def aget(url: str, params=None, timeout: Optional[Timeout] = None,
+               headers: Optional[Dict[str, str]] = None) -> httpx.Response:
+    """get() for async endpoints: httpx.Response (json/text/content/headers/raise_for_status)."""
+    st = _async_state()
+    host = urlsplit(url).hostname or ""
+    connect, read = timeout_for(timeout)
+
+    async def trace(event: str, info) -> None:
+        if event == "connection.connect_tcp.complete":
+            STATS.add(host, "opened")
+
+    STATS.add(host, "requests")
+    try:
+        r = await st.host(host).get(route(url), params=params, headers=headers,
+                                     timeout=httpx.Timeout(read, connect=connect), extensions={"trace": trace})
+    except httpx.HTTPError:
+        STATS.add(host, "errors")
+        raise
+    if r.http_version == "HTTP/2":
+        STATS.add(host, "http2")
+    return r
+
+
+async def aclose() -> None:
+    """Close the current event loop's async client (app shutdown)."""
+    st = _async_states.pop(asyncio.get_running_loop(), None)
+    if st is not None:
+        for hc in st.hosts.values():
+            await hc.aclose()
+
+
+def stats() -> Dict[str, Any]:
+    return STATS.snapshot()
@@ -1,10 +1,11 @@
-import requests
 import json
 
+import http_client
+
 URL = "https://gamma-api.polymarket.com/events/slug/what-bills-will-be-signed-into-law-by-december-31"
 
 # Fetch data
-resp = requests.get(URL)
+resp = http_client.get(URL)
 data = resp.json()
 
 # Extract each market and its probability
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+import json
+import os
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+# =========================
+# Config
+# =========================
+ARTIFACT_DIR = "artifacts"
+UNIQ_LABELS_PATH       = os.path.join(ARTIFACT_DIR, "uniq_labels.json")
+UNIQ_LABEL_EMBS_PATH   = os.path.join(ARTIFACT_DIR, "uniq_label_embs.npy")
+COMPANY_LABEL_IDX_PATH = os.path.join(ARTIFACT_DIR, "company_label_idx.npy")
+
+
+def company_labels(df: pd.DataFrame, sector_col: str = "sector", industry_col: str = "industry") -> List[str]:
+    """'industry | sector' label per company, as built by the script."""
+    return (df[industry_col].fillna("") + " | " + df[sector_col].fillna("")).tolist()
+
+
+def artifacts_present(labels_path: str = UNIQ_LABELS_PATH, embs_path: str = UNIQ_LABEL_EMBS_PATH,
+                      idx_path: str = COMPANY_LABEL_IDX_PATH) -> bool:
+    """True if IndustryPrior.load() can run without a model."""
+    return all(os.path.exists(p) for p in (labels_path, embs_path, idx_path))
+
+
+class IndustryPrior:
+    """
+    Industry|Sector prior served from precomputed label embeddings:
+    one matmul against the unique labels plus a gather by company label index.
+    """
+
+    def __init__(self, uniq_labels: List[str], label_embs: np.ndarray,
+                 company_label_idx: np.ndarray, cap: float):
+        self.uniq_labels = uniq_labels
+        self.label_embs = label_embs
+        self.company_label_idx = company_label_idx.astype(np.intp)
+        self.cap = cap
+
+    @classmethod
+    def load(cls, df: pd.DataFrame, cap: float, model=None,
+             labels_path: str = UNIQ_LABELS_PATH,
+             embs_path: str = UNIQ_LABEL_EMBS_PATH,
+             idx_path: str = COMPANY_LABEL_IDX_PATH) -> "IndustryPrior":
+        """
+        Load the label artifacts and check them against df; a bundle built from a
+        different companies table is rejected. Without artifacts, encode the labels
+        once here (needs model).
+        """
+        labels = company_labels(df)
+        uniq = sorted(set(labels))
+
+        if artifacts_present(labels_path, embs_path, idx_path):
+            with open(labels_path, "r", encoding="utf-8") as f:
+                uniq_labels = list(json.load(f))
+            label_embs = np.load(embs_path)
+            idx = np.load(idx_path)
+
+            problems = []
+            if uniq_labels != uniq:
+                problems.append("uniq_labels.json does not match companies industry|sector labels")
+            if label_embs.shape[0] != len(uniq_labels):
+                problems.append(f"uniq_label_embs has {label_embs.shape[0]} rows for {len(uniq_labels)} labels")
+            if idx.shape != (len(df),):
+                problems.append(f"company_label_idx has shape {idx.shape} for {len(df)} companies")
+            elif len(uniq_labels) and (idx.min() < 0 or idx.max() >= len(uniq_labels)
+                                       or [uniq_labels[i] for i in idx] != labels):
+                problems.append("company_label_idx does not map companies to their labels")
+            if problems:
+                raise RuntimeError("Stale industry prior artifacts: " + "; ".join(problems)
+                                   + ". Re-run precompute_companies.py.")
+            return cls(uniq_labels, label_embs, idx, cap)
+
+        if model is None:
+            raise RuntimeError("Industry prior artifacts missing and no model to encode labels.")
+        label_to_idx = {lbl: i for i, lbl in enumerate(uniq)}
+        idx = np.array([label_to_idx[lbl] for lbl in labels], dtype=np.int32)
+        label_embs = (model.encode(uniq, convert_to_numpy=True, normalize_embeddings=True)
+                      if uniq else np.zeros((0, 0), dtype=np.float32))
+        return cls(uniq, label_embs, idx, cap)
+
+    def boosts(self, q_emb: np.ndarray) -> np.ndarray:
+        """Min-max scaled label similarity per company, in [0, cap]."""
+        return self.boosts_matrix(q_emb.reshape(1, -1))[0]
+
+    def boosts_matrix(self, Q: np.ndarray) -> np.ndarray:
+        """(queries x companies) boosts; each row min-max scaled on its own."""
+        n = len(self.company_label_idx)
+        if not self.uniq_labels:
+            return np.zeros((len(Q), n))
+        sims_to_labels = Q @ self.label_embs.T
+        ind_raw = sims_to_labels[:, self.company_label_idx].astype(float)
+        lo = ind_raw.min(axis=1, keepdims=True)
+        hi = ind_raw.max(axis=1, keepdims=True)
+        span = hi - lo
+        out = np.zeros_like(ind_raw)
+        ok = (span > 0).ravel()
+        out[ok] = self.cap * (ind_raw[ok] - lo[ok]) / span[ok]
+        return out
+
+    def boosts_subset(self, q_emb: np.ndarray, ids: np.ndarray) -> np.ndarray:
+        """
+        boosts(q_emb)[ids] without touching every company: every label is used by
+        some company, so the min-max range over labels equals the one over companies.
+        """
+        if not self.uniq_labels:
+            return np.zeros(len(ids))
+        sims_to_labels = (q_emb.reshape(1, -1) @ self.label_embs.T)[0].astype(float)
+        raw = sims_to_labels[self.company_label_idx[ids]]
+        lo, hi = sims_to_labels.min(), sims_to_labels.max()
+        if hi - lo <= 0:
+            return np.zeros(len(ids))
+        return self.cap * (raw - lo) / (hi - lo)
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Precomputed term-incidence index for the dynamic keyword prior.
+
+The script scores a company by substring-testing each of the bill's ~40 dynamic
+terms against its lowercased text. KeywordIndex keeps that exact substring
+semantics but builds a character-trigram inverted index over the company texts
+once: a term can only occur in companies that contain all of its trigrams, so
+only those few candidates are verified with `in`. Hits per term are cached, and
+scoring a bill is a gather-and-add per term in the same order as the original
+loop, so the float sums are bit-identical.
+
+Self-check against the original double loop:
+  python keyword_index.py                # artifacts/company_texts.json vs bill_texts/*.txt
+"""
+import json
+import os
+import re
+import sys
+import time
+from collections import Counter, OrderedDict
+from typing import Dict, List, Optional
+
+import numpy as np
+
+NGRAM = 3
+TERM_CACHE_SIZE = 20000
+
+
+def keyword_prior_scores_scan(comp_texts: List[str], term_weights: dict,
+                              cap: float = 0.15, per_hit: float = 0.02) -> np.ndarray:
+    """Reference implementation (the script's Python double loop)."""
+    out = np.zeros(len(comp_texts), dtype=float)
+    if not term_weights:
+        return out
+    for i, t in enumerate(comp_texts):
+        T = t.lower(); score = 0.0
+        for k, wgt in term_weights.items():
+            if k in T: score += per_hit * wgt * 10
+        out[i] = min(cap, score)
+    return out
+
+
+class KeywordIndex:
+    def __init__(self, comp_texts: List[str], cache_size: int = TERM_CACHE_SIZE):
+        self.lowered = [t.lower() for t in comp_texts]
+        self.n = len(self.lowered)
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+
+        postings: Dict[str, List[int]] = {}
+        for i, T in enumerate(self.lowered):
+            for g in {T[j:j + NGRAM] for j in range(len(T) - NGRAM + 1)}:
+                postings.setdefault(g, []).append(i)
+        self.postings = {g: np.asarray(ids, dtype=np.int32) for g, ids in postings.items()}
+        self._all = np.arange(self.n, dtype=np.int32)
+
+    def _candidates(self, term: str) -> np.ndarray:
+        if len(term) < NGRAM:
+            return self._all
+        grams = {term[j:j + NGRAM] for j in range(len(term) - NGRAM + 1)}
+        lists = []
+        for g in grams:
+            ids = self.postings.get(g)
+            if ids is None:
+                return np.empty(0, dtype=np.int32)
+            lists.append(ids)
+        lists.sort(key=len)
+        cand = lists[0]
+        for ids in lists[1:]:
+            if len(cand) <= 8:
+                break
+            cand = np.intersect1d(cand, ids, assume_unique=True)
+        return cand
+
+    def hits(self, term: str) -> np.ndarray:
+        """Indices of companies whose lowercased text contains term (as a substring)."""
+        cached = self._cache.get(term)
+        if cached is not None:
+            self._cache.move_to_end(term)
+            return cached
+        lowered = self.lowered
+        ids = np.asarray([i for i in self._candidates(term) if term in lowered[i]], dtype=np.intp)
+        self._cache[term] = ids
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return ids
+
+    def incidence(self, terms: List[str]):
+        """Sparse (terms x companies) 0/1 matrix of term occurrences."""
+        from scipy import sparse
+        rows, cols = [], []
+        for r, term in enumerate(terms):
+            h = self.hits(term)
+            rows.append(np.full(len(h), r, dtype=np.intp)); cols.append(h)
+        rows = np.concatenate(rows) if rows else np.empty(0, dtype=np.intp)
+        cols = np.concatenate(cols) if cols else np.empty(0, dtype=np.intp)
+        return sparse.csr_matrix((np.ones(len(rows)), (rows, cols)), shape=(len(terms), self.n))
+
+    def scores(self, term_weights: dict, cap: float = 0.15, per_hit: float = 0.02) -> np.ndarray:
+        """Same output as keyword_prior_scores_scan(comp_texts, term_weights, cap, per_hit)."""
+        out = np.zeros(self.n, dtype=float)
+        if not term_weights:
+            return out
+        for k, wgt in term_weights.items():
+            h = self.hits(k)
+            if len(h):
+                out[h] += per_hit * wgt * 10
+        return np.minimum(out, cap)
+
+    def scores_subset(self, term_weights: dict, ids: np.ndarray, cap: float = 0.15,
+                      per_hit: float = 0.02) -> np.ndarray:
+        """scores(term_weights, cap, per_hit)[ids], touching only the hits that fall in ids."""
+        ids = np.asarray(ids, dtype=np.intp)
+        out = np.zeros(len(ids), dtype=float)
+        if not term_weights or not len(ids):
+            return out
+        order = np.argsort(ids, kind="stable")
+        sorted_ids = ids[order]
+        for k, wgt in term_weights.items():
+            h = self.hits(k)
+            if not len(h):
+                continue
+            j = np.searchsorted(sorted_ids, h)
+            inside = j < len(sorted_ids)
+            j, h = j[inside], h[inside]
+            j = j[sorted_ids[j] == h]
+            if len(j):
+                out[order[j]] += per_hit * wgt * 10
+        return np.minimum(out, cap)
+
+
+def extract_dynamic_terms(bill_text: str,
+                          top_ngrams: int = 40,
+                          ngram_range=(1, 2),
+                          stopwords: Optional[set] = None) -> dict:
+    """The bill's top_ngrams most frequent uni/bigrams, weighted 1 + count / max count (the script's terms)."""
+    stop = stopwords or set()
+    text = bill_text.lower()
+    text = re.sub(r'\s+', ' ', text)
+
+    tokens = re.findall(r"[a-z][a-z0-9\-]+", text)
+    tokens = [t for t in tokens if t not in stop and len(t) > 2]
+
+    bigrams = [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+    grams = tokens + bigrams
+
+    def is_ok(g):
+        n = len(g.split())
+        return n >= ngram_range[0] and n <= ngram_range[1]
+
+    freq = Counter(g for g in grams if is_ok(g))
+    most = freq.most_common(top_ngrams)
+    if not most:
+        return {}
+    maxf = most[0][1]
+    return {g: 1.0 + (c / maxf) for g, c in most}  # weights ~[1..2]
+
+
+# =========================
+# Self-check
+# =========================
+def main(argv: Optional[List[str]] = None):
+    import glob
+    argv = sys.argv[1:] if argv is None else argv
+    texts_path = argv[0] if argv else os.path.join("artifacts", "company_texts.json")
+    with open(texts_path, "r", encoding="utf-8") as f:
+        comp_texts = list(json.load(f))
+
+    t0 = time.perf_counter()
+    index = KeywordIndex(comp_texts)
+    print(f"Index built over {len(comp_texts)} companies, {len(index.postings)} trigrams "
+          f"in {(time.perf_counter() - t0) * 1000:.1f} ms")
+
+    queries = []
+    for p in sorted(glob.glob(os.path.join("bill_texts", "*.txt"))):
+        with open(p, "r", encoding="utf-8") as f:
+            queries.append(f.read())
+    queries += comp_texts[::25]  # company descriptions make decent extra term sets
+
+    slow_ms = fast_ms = 0.0
+    for q in queries:
+        terms = extract_dynamic_terms(q)
+        t0 = time.perf_counter(); ref = keyword_prior_scores_scan(comp_texts, terms)
+        t1 = time.perf_counter(); got = index.scores(terms)
+        t2 = time.perf_counter()
+        slow_ms += (t1 - t0) * 1000; fast_ms += (t2 - t1) * 1000
+        if not np.array_equal(ref, got):
+            raise SystemExit(f"Mismatch for query starting {q[:60]!r}")
+    print(f"✅ {len(queries)} term sets identical | scan {slow_ms / len(queries):.2f} ms/bill "
+          f"| index {fast_ms / len(queries):.2f} ms/bill")
+
+
+if __name__ == "__main__":
+    main()
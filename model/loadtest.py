@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Load test: how many concurrent requests the I/O-bound endpoints carry when the
+upstream is slow, async handlers vs the old thread-pool ones, against
+upstream_sim.py answering with synthetic Congress.gov data after --latency seconds.
+
+  python loadtest.py
+  python loadtest.py --concurrency 200 --latency 0.5 --seconds 10
+
+api_service runs under uvicorn in a forked process (HTTP_UPSTREAM_OVERRIDE -> the
+simulator; bill responses not cached, rate budget out of the way) and is driven by
+--concurrency clients in a closed loop, each request for a different bill:
+  async     GET /bill_info                  async def on http_client.aget()
+  threaded  GET /loadtest/bill_info_sync    the pre-async handler: def + blocking _get(),
+                                            run by FastAPI on its ~40-thread pool
+Meanwhile a probe calls /healthz (a def route, so it needs a pool thread) every
+100 ms: its latency shows whether slow upstream calls starve the other endpoints.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import multiprocessing
+import os
+import socket
+import time
+from typing import Any, Dict, List, Tuple
+
+import httpx
+
+import upstream_sim
+
+ROUTES = {"async": "/bill_info", "threaded": "/loadtest/bill_info_sync"}
+CLIENT_SHARD = 16  # load workers per httpx client (one big pool is slow, see http_client._HostClients)
+
+
+# =========================
+# API under test
+# =========================
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _serve(port: int) -> None:
+    import uvicorn
+    from fastapi.responses import JSONResponse
+    import api_service
+
+    def bill_info_sync(bill_type: str, bill_number: int):
+        url = f"https://api.congress.gov/v3/bill/{api_service.CONGRESS}/{bill_type.lower()}/{bill_number}"
+        r = api_service._get(url, params={"api_key": api_service.CONGRESS_API_KEY, "format": "json"})
+        return JSONResponse(r.json())
+
+    api_service.app.add_api_route(ROUTES["threaded"], bill_info_sync, methods=["GET"])
+    # lifespan off: no model loading in the background, these routes don't need it
+    uvicorn.run(api_service.app, host="127.0.0.1", port=port, lifespan="off", log_level="warning",
+                access_log=False)
+
+
+def start_api(upstream: str, connections: int) -> Tuple[multiprocessing.Process, str]:
+    os.environ.update({
+        "HTTP_UPSTREAM_OVERRIDE": upstream,
+        "HTTP_CACHE_TTL_BILL": "0",
+        "CONGRESS_RATE_PER_HOUR": "1e9",
+        "CONGRESS_BURST": "1e6",
+        "CONGRESS_MAX_CONNECTIONS": str(connections),
+    })
+    port = _free_port()
+    proc = multiprocessing.get_context("fork").Process(target=_serve, args=(port,), daemon=True)
+    proc.start()
+    return proc, f"http://127.0.0.1:{port}"
+
+
+# =========================
+# Load
+# =========================
+def _pct(xs: List[float], q: float) -> float:
+    return sorted(xs)[min(len(xs) - 1, int(q * len(xs)))] * 1000 if xs else float("nan")
+
+
+async def run_mode(base: str, route: str, concurrency: int, seconds: float, numbers) -> Dict[str, Any]:
+    lat: List[float] = []
+    probe: List[float] = []
+    errors = 0
+    clients = [httpx.AsyncClient(base_url=base, timeout=120) for _ in range(1 + -(-concurrency // CLIENT_SHARD))]
+    stop = time.monotonic() + seconds
+
+    async def worker(client: httpx.AsyncClient):
+        nonlocal errors
+        while time.monotonic() < stop:
+            t0 = time.perf_counter()
+            try:
+                r = await client.get(route, params={"bill_type": "hr", "bill_number": next(numbers)})
+                ok = r.status_code == 200
+            except httpx.HTTPError:
+                ok = False
+            if ok:
+                lat.append(time.perf_counter() - t0)
+            else:
+                errors += 1
+
+    async def prober(client: httpx.AsyncClient):
+        while time.monotonic() < stop:
+            t0 = time.perf_counter()
+            await client.get("/healthz")
+            probe.append(time.perf_counter() - t0)
+            await asyncio.sleep(0.1)
+
+    t0 = time.perf_counter()
+    await asyncio.gather(prober(clients[0]),
+                         *(worker(clients[1 + i // CLIENT_SHARD]) for i in range(concurrency)))
+    elapsed = time.perf_counter() - t0
+    for c in clients:
+        await c.aclose()
+    return {"rps": len(lat) / elapsed, "p50_ms": _pct(lat, 0.5), "p95_ms": _pct(lat, 0.95), "errors": errors,
+            "healthz_p50_ms": _pct(probe, 0.5), "healthz_p95_ms": _pct(probe, 0.95)}
+
+
+async def _wait_up(base: str, timeout: float = 120.0) -> None:
+    end = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base) as client:
+        while True:
+            try:
+                if (await client.get("/healthz")).status_code == 200:
+                    return
+            except httpx.HTTPError:
+                if time.monotonic() > end:
+                    raise
+            await asyncio.sleep(0.2)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--concurrency", type=int, default=200, help="concurrent clients")
+    ap.add_argument("--latency", type=float, default=0.5, help="simulator seconds per upstream response")
+    ap.add_argument("--seconds", type=float, default=10.0, help="per mode")
+    ap.add_argument("--connections", type=int, default=256,
+                    help="upstream connections per host (CONGRESS_MAX_CONNECTIONS) for both modes")
+    ap.add_argument("--modes", default="threaded,async")
+    args = ap.parse_args()
+
+    sim = upstream_sim.start(fixtures_dir=None, latency=args.latency)
+    proc, base = start_api(f"http://127.0.0.1:{sim.server_port}", args.connections)
+    try:
+        asyncio.run(_wait_up(base))
+        numbers = itertools.count(1)
+        print(f"{args.concurrency} clients x {args.seconds:.0f}s per mode, upstream latency {args.latency * 1000:.0f} ms, "
+              f"{args.connections} upstream connections")
+        print(f"{'mode':<9} {'req/s':>7} {'p50 ms':>8} {'p95 ms':>8} {'errors':>7} {'healthz p50':>12} {'healthz p95':>12}")
+        for mode in args.modes.split(","):
+            res = asyncio.run(run_mode(base, ROUTES[mode], args.concurrency, args.seconds, numbers))
+            print(f"{mode:<9} {res['rps']:>7.1f} {res['p50_ms']:>8.0f} {res['p95_ms']:>8.0f} {res['errors']:>7} "
+                  f"{res['healthz_p50_ms']:>12.0f} {res['healthz_p95_ms']:>12.0f}")
+    finally:
+        proc.terminate()
+        proc.join(5)
+        sim.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Precomputed bill -> company matches (written by bulk_match.py) with the reverse
+company -> bills index behind GET /company/{ticker}/bills.
+
+SQLite in WAL mode: the nightly job writes while API workers read. Tables:
+  bills    one row per (congress, bill_id) seen in a congress listing: listing
+           updateDate, the text version that was matched (content key), status, error
+  matches  top-k companies per (congress, bill_id) with the hybrid score and its
+           terms; indexed on (ticker, hybrid DESC) for the reverse lookup
+
+A store written with an older SCHEMA_VERSION is rebuilt (bills and matches
+dropped) the next time bulk_match.py opens it; readers treat it as missing.
+  runs     one row per bulk_match.py run
+
+  python match_index.py                 # summary of the store
+  python match_index.py --ticker NVR    # reverse lookup from the command line
+"""
+import argparse
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+MATCH_INDEX_PATH = os.getenv("MATCH_INDEX_PATH", os.path.join("cache", "match_index.sqlite"))
+SCHEMA_VERSION = 2  # 2: bills / matches keyed on (congress, bill_id)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS bills (
+    congress      INTEGER NOT NULL,
+    bill_id       TEXT NOT NULL,
+    bill_type     TEXT NOT NULL,
+    bill_number   INTEGER NOT NULL,
+    title         TEXT,
+    update_date   TEXT,
+    content_key   TEXT,
+    version_date  TEXT,
+    status        TEXT NOT NULL,
+    error         TEXT,
+    matched_at    REAL,
+    PRIMARY KEY (congress, bill_id)
+);
+CREATE TABLE IF NOT EXISTS matches (
+    congress  INTEGER NOT NULL,
+    bill_id   TEXT NOT NULL,
+    rank      INTEGER NOT NULL,
+    ticker    TEXT NOT NULL,
+    name      TEXT,
+    sector    TEXT,
+    industry  TEXT,
+    hybrid    REAL NOT NULL,
+    dense     REAL,
+    tfidf     REAL,
+    keyword   REAL,
+    industry_boost REAL,
+    PRIMARY KEY (congress, bill_id, rank)
+);
+CREATE INDEX IF NOT EXISTS matches_by_ticker ON matches (ticker, hybrid DESC);
+CREATE TABLE IF NOT EXISTS runs (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    started_at  REAL NOT NULL,
+    finished_at REAL,
+    stats       TEXT
+);
+"""
+
+# Bill statuses
+MATCHED, NO_TEXT, FAILED = "matched", "no_text", "error"
+
+
+class MatchIndex:
+    def __init__(self, path: str = MATCH_INDEX_PATH, readonly: bool = False):
+        self.path = path
+        self.readonly = readonly
+        self._local = threading.local()
+        if not readonly:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            with self._conn() as db:
+                db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+                version = self._schema_version(db)
+                if version is not None and version != SCHEMA_VERSION:
+                    print(f"[match_index] schema {version} -> {SCHEMA_VERSION}: dropping bills and matches")
+                    db.executescript("DROP TABLE IF EXISTS matches; DROP TABLE IF EXISTS bills;")
+                db.executescript(SCHEMA)
+                db.execute("INSERT OR REPLACE INTO meta VALUES ('schema_version', ?)", (str(SCHEMA_VERSION),))
+
+    def _conn(self) -> sqlite3.Connection:
+        """
+        One connection per thread and process: sqlite3 connections are not shared across
+        threads, and one inherited across fork() (serve.py workers) must not be reused.
+        """
+        db = getattr(self._local, "db", None)
+        if db is None or self._local.pid != os.getpid():
+            if self.readonly:
+                db = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, timeout=5)
+            else:
+                db = sqlite3.connect(self.path, timeout=30)
+                db.execute("PRAGMA journal_mode=WAL")
+                db.execute("PRAGMA synchronous=NORMAL")
+            db.row_factory = sqlite3.Row
+            self._local.db, self._local.pid = db, os.getpid()
+        return db
+
+    @staticmethod
+    def _schema_version(db: sqlite3.Connection) -> Optional[int]:
+        try:
+            r = db.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+        except sqlite3.OperationalError:  # no meta table yet
+            return None
+        return int(r[0]) if r else None
+
+    def exists(self) -> bool:
+        """Built, and by a bulk_match.py that writes this SCHEMA_VERSION."""
+        return os.path.exists(self.path) and self._schema_version(self._conn()) == SCHEMA_VERSION
+
+    # ---- writer (bulk_match.py)
+    def known_bills(self, congress: int) -> Dict[str, Dict[str, Any]]:
+        rows = self._conn().execute(
+            "SELECT bill_id, update_date, content_key, status FROM bills WHERE congress = ?", (congress,))
+        return {r["bill_id"]: dict(r) for r in rows}
+
+    def put_matches(self, bill: Dict[str, Any], matches: List[Dict[str, Any]]) -> None:
+        """Replace a bill's row and its top-k in one transaction."""
+        with self._conn() as db:
+            db.execute("DELETE FROM matches WHERE congress = ? AND bill_id = ?", (bill["congress"], bill["bill_id"]))
+            db.executemany(
+                "INSERT INTO matches VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(bill["congress"], bill["bill_id"], rank, m["ticker"], m.get("name"), m.get("sector"), m.get("industry"),
+                  m["hybrid_score"], m["dense"], m["tfidf"], m["keyword"], m["industry_boost"])
+                 for rank, m in enumerate(matches, 1)])
+            self._put_bill(db, bill, MATCHED, None)
+
+    def put_status(self, bill: Dict[str, Any], status: str, error: Optional[str] = None) -> None:
+        """Record a bill that has no usable text or failed (its old matches, if any, are kept)."""
+        with self._conn() as db:
+            self._put_bill(db, bill, status, error)
+
+    def touch(self, congress: int, bill_ids: Iterable[str], update_dates: Iterable[str]) -> None:
+        """Listing changed but the matched text version did not: only remember the new updateDate."""
+        with self._conn() as db:
+            db.executemany("UPDATE bills SET update_date = ? WHERE congress = ? AND bill_id = ?",
+                           [(d, congress, b) for b, d in zip(bill_ids, update_dates)])
+
+    @staticmethod
+    def _put_bill(db: sqlite3.Connection, bill: Dict[str, Any], status: str, error: Optional[str]) -> None:
+        db.execute(
+            "INSERT INTO bills (congress, bill_id, bill_type, bill_number, title, update_date, content_key,"
+            " version_date, status, error, matched_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+            " ON CONFLICT(congress, bill_id) DO UPDATE SET title = excluded.title, update_date = excluded.update_date,"
+            " content_key = COALESCE(excluded.content_key, bills.content_key),"
+            " version_date = COALESCE(excluded.version_date, bills.version_date),"
+            " status = excluded.status, error = excluded.error,"
+            " matched_at = COALESCE(excluded.matched_at, bills.matched_at)",
+            (bill["congress"], bill["bill_id"], bill["bill_type"], bill["bill_number"], bill.get("title"),
+             bill.get("update_date"), bill.get("content_key"), bill.get("version_date"), status, error,
+             time.time() if status == MATCHED else None))
+
+    def start_run(self) -> int:
+        with self._conn() as db:
+            return db.execute("INSERT INTO runs (started_at) VALUES (?)", (time.time(),)).lastrowid
+
+    def finish_run(self, run_id: int, stats: Dict[str, Any]) -> None:
+        with self._conn() as db:
+            db.execute("UPDATE runs SET finished_at = ?, stats = ? WHERE id = ?",
+                       (time.time(), json.dumps(stats), run_id))
+
+    # ---- reader (API)
+    def bills_for_ticker(self, ticker: str, limit: int = 20, min_score: Optional[float] = None) -> List[Dict[str, Any]]:
+        sql = ("SELECT m.bill_id, m.rank, m.hybrid, m.dense, m.tfidf, m.keyword, m.industry_boost,"
+               " b.title, b.version_date, b.matched_at, b.congress"
+               " FROM matches m JOIN bills b ON b.congress = m.congress AND b.bill_id = m.bill_id"
+               " WHERE m.ticker = ?")
+        params: List[Any] = [ticker.upper()]
+        if min_score is not None:
+            sql += " AND m.hybrid >= ?"
+            params.append(min_score)
+        sql += " ORDER BY m.hybrid DESC LIMIT ?"
+        params.append(limit)
+        return [{
+            "bill_id": r["bill_id"],
+            "congress": r["congress"],
+            "title": r["title"],
+            "rank": r["rank"],
+            "hybrid_score": r["hybrid"],
+            "breakdown": {"dense": r["dense"], "tfidf": r["tfidf"], "keyword": r["keyword"],
+                          "industry": r["industry_boost"]},
+            "version_date": r["version_date"],
+            "matched_at": r["matched_at"],
+        } for r in self._conn().execute(sql, params)]
+
+    def last_run(self) -> Optional[Dict[str, Any]]:
+        r = self._conn().execute(
+            "SELECT started_at, finished_at, stats FROM runs WHERE finished_at IS NOT NULL"
+            " ORDER BY id DESC LIMIT 1").fetchone()
+        if r is None:
+            return None
+        return {"started_at": r["started_at"], "finished_at": r["finished_at"], "stats": json.loads(r["stats"] or "{}")}
+
+    def summary(self) -> Dict[str, Any]:
+        db = self._conn()
+        status = {r[0]: r[1] for r in db.execute("SELECT status, COUNT(*) FROM bills GROUP BY status")}
+        return {
+            "bills": status,
+            "matches": db.execute("SELECT COUNT(*) FROM matches").fetchone()[0],
+            "tickers": db.execute("SELECT COUNT(DISTINCT ticker) FROM matches").fetchone()[0],
+            "last_run": self.last_run(),
+        }
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--path", default=MATCH_INDEX_PATH)
+    ap.add_argument("--ticker", default=None)
+    ap.add_argument("--limit", type=int, default=20)
+    args = ap.parse_args()
+    if not os.path.exists(args.path):
+        raise SystemExit(f"{args.path} missing; run bulk_match.py first")
+    index = MatchIndex(args.path, readonly=True)
+    if args.ticker:
+        t0 = time.perf_counter()
+        rows = index.bills_for_ticker(args.ticker, args.limit)
+        ms = (time.perf_counter() - t0) * 1000
+        for r in rows:
+            print(f"  {r['bill_id']:<12} #{r['rank']:<3} {r['hybrid_score']:.4f}  {(r['title'] or '')[:70]}")
+        print(f"{len(rows)} bills for {args.ticker.upper()} in {ms:.2f} ms")
+    else:
+        print(json.dumps(index.summary(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
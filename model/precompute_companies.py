@@ -1,4 +1,5 @@
 #!/usr/bin/env python3
+import argparse
 import os
 import json
 import pickle
@@ -9,7 +10,11 @@ import pandas as pd
 from scipy import sparse
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.preprocessing import normalize as sk_normalize
-from sentence_transformers import SentenceTransformer
+
+from artifact_manifest import write_manifest
+from ann_index import build_and_report, embeddings_digest
+from embedding_store import quantized_paths, save_quantized
+from encoder import BACKENDS, load_encoder
 
 # =========================
 # Config
@@ -39,6 +44,16 @@ def build_company_text(row: pd.Series) -> str:
 # Main
 # =========================
 def main():
+    ap = argparse.ArgumentParser(description="Precompute company artifacts for api_service.py")
+    ap.add_argument("--ann", action="store_true", help="also build the IVF ANN index and report recall@k")
+    ap.add_argument("--ann-nlist", type=int, default=0, help="IVF cells (0 = 4*sqrt(N))")
+    ap.add_argument("--ann-nprobe", type=int, nargs="+", default=[8, 16, 32], help="nprobe values to report")
+    ap.add_argument("--emb-precision", nargs="*", default=[], choices=["float16", "int8"],
+                    help="also write quantized copies of the embeddings (served with COMP_EMB_PRECISION)")
+    ap.add_argument("--encoder", default=os.getenv("ENCODER_BACKEND", "sentence-transformers"), choices=BACKENDS,
+                    help="encoder backend for company and label embeddings")
+    args = ap.parse_args()
+
     print("Loading S&P 500 dataset...")
     df = pd.read_csv(SP500_CSV)
     for col in ["ticker", "name", "sector", "industry", "description"]:
@@ -48,8 +63,8 @@ def main():
     comp_texts: List[str] = df.apply(build_company_text, axis=1).tolist()
 
     print("Loading embedding model once...")
-    model = SentenceTransformer(MODEL_NAME)
-    print(f"Model ready: {MODEL_NAME}")
+    model = load_encoder(args.encoder, MODEL_NAME)
+    print(f"Model ready: {MODEL_NAME} ({args.encoder})")
 
     # Dense embeddings (normalized)
     print("Encoding company texts (dense)...")
@@ -95,6 +110,34 @@ def main():
     np.save(os.path.join(ARTIFACT_DIR, "uniq_label_embs.npy"), uniq_label_embs)
     np.save(os.path.join(ARTIFACT_DIR, "company_label_idx.npy"), company_label_idx)
 
+    # Optional quantized copies (memory-mapped by the service); copies of the old embeddings go
+    base = os.path.join(ARTIFACT_DIR, "company_embeddings.npy")
+    for precision in ("float16", "int8"):
+        if precision in args.emb_precision:
+            paths = save_quantized(comp_embs, precision, base)
+            print(f"Saved {precision} embeddings → {paths['codes']}")
+        else:
+            for path in quantized_paths(base, precision).values():
+                if os.path.exists(path):
+                    os.remove(path)
+                    print(f"Removed stale {path}")
+
+    # Optional ANN index (IVF over the normalized embeddings) + recall@k vs brute force
+    ann_fields = {}
+    if args.ann:
+        print("Building IVF ANN index...")
+        index = build_and_report(comp_embs, args.ann_nlist, args.ann_nprobe, [10, 100],
+                                 path=os.path.join(ARTIFACT_DIR, "ann_ivf.npz"))
+        ann_fields = {"ann_nlist": index.nlist}
+
+    # Tie the bundle to this companies.parquet so the service rejects stale artifacts
+    write_manifest(
+        ARTIFACT_DIR, os.path.join(ARTIFACT_DIR, "companies.parquet"),
+        model=MODEL_NAME, encoder=args.encoder, n_companies=len(df), n_labels=len(uniq_labels),
+        embedding_dim=int(comp_embs.shape[1]), embeddings_sha256=embeddings_digest(comp_embs),
+        embedding_precisions=["float32"] + list(args.emb_precision), **ann_fields,
+    )
+
     print("✅ Precompute complete → artifacts/")
 
 if __name__ == "__main__":
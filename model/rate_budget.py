@@ -0,0 +1,426 @@
+#!/usr/bin/env python3
+"""
+Upstream request budget: one token bucket per rate-limited host (Congress.gov,
+5000 requests/hour per key), shared by every endpoint of the process.
+
+api_service._get() / _aget() take a token before each attempt. Waiting callers are
+served by priority class, then arrival:
+  interactive   /match, /match/batch
+  normal        /member_bills, /bills, /bill_info, /cosponsors, ... (default)
+  background    /graph building, bulk_match.py
+Lower classes also leave a reserve (RESERVE x burst) of tokens untouched, so an
+interactive request arriving after a background fan-out still finds budget.
+
+A 429 pauses the bucket for its Retry-After (seconds or HTTP date) instead of a
+blind backoff, and X-RateLimit-Remaining from the upstream caps the local tokens.
+Forked workers (serve.py, bulk_match.py) each take their share() of the quota; a
+class reserve is capped at burst - 1 tokens, so every class still gets served
+from a small share.
+
+  with_priority(INTERACTIVE)(endpoint)     # decorator; or `with priority(...)`
+  budget_status()                          # tokens, waiting, granted, 429s per host
+
+Demo against a local stub server that enforces a quota (429 + Retry-After):
+  python rate_budget.py --demo
+"""
+import argparse
+import asyncio
+import concurrent.futures
+import contextlib
+import contextvars
+import email.utils
+import functools
+import heapq
+import inspect
+import itertools
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+INTERACTIVE, NORMAL, BACKGROUND = 0, 1, 2
+PRIORITY_NAMES = ("interactive", "normal", "background")
+RESERVE = {INTERACTIVE: 0.0, NORMAL: 0.1, BACKGROUND: 0.3}  # fraction of burst a class leaves to higher ones
+
+CONGRESS_RATE_PER_HOUR = float(os.getenv("CONGRESS_RATE_PER_HOUR", "5000"))
+CONGRESS_BURST = float(os.getenv("CONGRESS_BURST", "40"))
+MAX_WAIT = float(os.getenv("RATE_BUDGET_MAX_WAIT", "30"))  # seconds a call may queue without a deadline
+
+_PRIORITY: contextvars.ContextVar[int] = contextvars.ContextVar("upstream_priority", default=NORMAL)
+
+
+class BudgetTimeout(RuntimeError):
+    """No upstream token became available in time."""
+
+
+def retry_after_seconds(headers) -> Optional[float]:
+    """Retry-After as seconds (delta-seconds or HTTP date); None if absent/unparsable."""
+    value = headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _wake(fut: "asyncio.Future") -> None:
+    if not fut.done():
+        fut.set_result(None)
+
+
+class TokenBucket:
+    def __init__(self, name: str, rate_per_hour: float, burst: float, max_wait: float = MAX_WAIT):
+        self.name = name
+        self.rate = rate_per_hour / 3600.0
+        self.capacity = burst
+        self.tokens = burst
+        self.max_wait = max_wait
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.upstream_limit: Optional[int] = None
+        self.upstream_remaining: Optional[int] = None
+        self.throttled = 0
+        self.granted = [0, 0, 0]
+        self.timeouts = [0, 0, 0]
+        self._queue: list = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._wakers: Dict[tuple, tuple] = {}  # queue entry of an acquire_async() -> (loop, future)
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def _floor(self, prio: int) -> float:
+        """Tokens prio must leave behind; never so many that the bucket can't hold one more."""
+        return min(RESERVE[prio] * self.capacity, max(0.0, self.capacity - 1))
+
+    def _notify(self) -> None:
+        """Wake every waiter to re-check the queue head (caller holds the lock)."""
+        self._cond.notify_all()
+        for loop, fut in self._wakers.values():
+            try:
+                loop.call_soon_threadsafe(_wake, fut)
+            except RuntimeError:  # loop closed
+                pass
+
+    def _try_take(self, entry: tuple, now: float, end: float) -> Tuple[Optional[bool], float]:
+        """Under the lock: (True, 0) granted, (False, 0) timed out, (None, seconds to wait)."""
+        prio = entry[0]
+        floor = self._floor(prio)
+        self._refill(now)
+        if self._queue[0] == entry and now >= self.blocked_until and self.tokens - 1 >= floor:
+            self.tokens -= 1
+            self.granted[prio] += 1
+            return True, 0.0
+        if now >= end:
+            self.timeouts[prio] += 1
+            return False, 0.0
+        if now < self.blocked_until:
+            wait = self.blocked_until - now
+        else:
+            wait = max(0.005, (1 + floor - self.tokens) / self.rate) if self.rate > 0 else end - now
+        return None, min(wait, end - now)
+
+    def _leave(self, entry: tuple) -> None:
+        self._queue.remove(entry)
+        heapq.heapify(self._queue)
+        self._wakers.pop(entry, None)
+        self._notify()
+
+    def acquire(self, prio: Optional[int] = None, timeout: Optional[float] = None) -> bool:
+        """Take one token, waiting up to timeout (default max_wait); False if none came."""
+        prio = _PRIORITY.get() if prio is None else prio
+        end = time.monotonic() + (self.max_wait if timeout is None else timeout)
+        entry = (prio, next(self._seq))
+        with self._cond:
+            heapq.heappush(self._queue, entry)
+            try:
+                while True:
+                    got, wait = self._try_take(entry, time.monotonic(), end)
+                    if got is not None:
+                        return got
+                    self._cond.wait(wait)
+            finally:
+                self._leave(entry)
+
+    def try_acquire(self, prio: Optional[int] = None) -> bool:
+        """Take a token only if one is free now and nobody of the same or a higher class waits."""
+        prio = _PRIORITY.get() if prio is None else prio
+        with self._cond:
+            now = time.monotonic()
+            self._refill(now)
+            if ((not self._queue or prio < self._queue[0][0]) and now >= self.blocked_until
+                    and self.tokens - 1 >= self._floor(prio)):
+                self.tokens -= 1
+                self.granted[prio] += 1
+                return True
+            return False
+
+    async def acquire_async(self, prio: Optional[int] = None, timeout: Optional[float] = None) -> bool:
+        """
+        acquire() for coroutines: waits in the same priority queue on a Future (no thread).
+        The token is taken and returned without an await in between, so a cancelled
+        waiter never holds one.
+        """
+        prio = _PRIORITY.get() if prio is None else prio
+        if self.try_acquire(prio):
+            return True
+        loop = asyncio.get_running_loop()
+        end = time.monotonic() + (self.max_wait if timeout is None else timeout)
+        entry = (prio, next(self._seq))
+        with self._cond:
+            heapq.heappush(self._queue, entry)
+        try:
+            while True:
+                with self._cond:
+                    got, wait = self._try_take(entry, time.monotonic(), end)
+                    if got is not None:
+                        return got
+                    wake = loop.create_future()
+                    self._wakers[entry] = (loop, wake)
+                await asyncio.wait({wake}, timeout=wait)
+        finally:
+            with self._cond:
+                self._leave(entry)
+
+    def observe(self, resp) -> None:
+        """Update from an upstream response: rate-limit headers, 429 + Retry-After."""
+        headers = resp.headers
+        with self._cond:
+            limit = headers.get("X-RateLimit-Limit")
+            remaining = headers.get("X-RateLimit-Remaining")
+            if limit is not None and str(limit).isdigit():
+                self.upstream_limit = int(limit)
+            if remaining is not None and str(remaining).isdigit():
+                self.upstream_remaining = int(remaining)
+                self.tokens = min(self.tokens, float(self.upstream_remaining))
+            if resp.status_code == 429:
+                self.throttled += 1
+                delay = retry_after_seconds(headers)
+                if delay is None:
+                    delay = 1.0 / self.rate if self.rate > 0 else 1.0
+                self.blocked_until = max(self.blocked_until, time.monotonic() + delay)
+                self.tokens = 0.0
+            self._notify()
+
+    def share(self, fraction: float) -> None:
+        """Keep `fraction` of the rate and burst (one of N processes on the same key)."""
+        with self._cond:
+            self.rate *= fraction
+            self.capacity = max(1.0, self.capacity * fraction)
+            self.tokens = min(self.tokens, self.capacity)
+
+    def status(self) -> Dict[str, Any]:
+        with self._cond:
+            now = time.monotonic()
+            self._refill(now)
+            waiting = [0, 0, 0]
+            for prio, _ in self._queue:
+                waiting[prio] += 1
+            return {
+                "tokens": round(self.tokens, 2),
+                "burst": self.capacity,
+                "rate_per_hour": round(self.rate * 3600, 1),
+                "blocked_for_s": round(max(0.0, self.blocked_until - now), 2),
+                "waiting": dict(zip(PRIORITY_NAMES, waiting)),
+                "granted": dict(zip(PRIORITY_NAMES, self.granted)),
+                "timeouts": dict(zip(PRIORITY_NAMES, self.timeouts)),
+                "throttled_429": self.throttled,
+                "upstream_limit": self.upstream_limit,
+                "upstream_remaining": self.upstream_remaining,
+            }
+
+
+BUCKETS: Dict[str, TokenBucket] = {
+    "api.congress.gov": TokenBucket("api.congress.gov", CONGRESS_RATE_PER_HOUR, CONGRESS_BURST),
+}
+
+
+def for_url(url: str) -> Optional[TokenBucket]:
+    return BUCKETS.get(urlsplit(url).hostname or "")
+
+
+def share(fraction: float) -> None:
+    for b in BUCKETS.values():
+        b.share(fraction)
+
+
+def budget_status() -> Dict[str, Any]:
+    return {"pid": os.getpid(), "hosts": {h: b.status() for h, b in BUCKETS.items()}}
+
+
+# =========================
+# Priority classes
+# =========================
+@contextlib.contextmanager
+def priority(prio: int):
+    token = _PRIORITY.set(prio)
+    try:
+        yield
+    finally:
+        _PRIORITY.reset(token)
+
+
+def current_priority() -> int:
+    return _PRIORITY.get()
+
+
+def set_priority(prio: int) -> None:
+    """Class for upstream calls of the current thread/context from now on (e.g. a batch job)."""
+    _PRIORITY.set(prio)
+
+
+def with_priority(prio: int) -> Callable:
+    """Run a function or coroutine, e.g. an endpoint, with upstream calls in class prio."""
+    def deco(fn):
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with priority(prio):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with priority(prio):
+                return fn(*args, **kwargs)
+        return wrapper
+    return deco
+
+
+def submit(executor: concurrent.futures.Executor, fn: Callable, *args, **kwargs) -> concurrent.futures.Future:
+    """executor.submit that keeps the caller's priority (pool threads don't inherit context)."""
+    return executor.submit(contextvars.copy_context().run, fn, *args, **kwargs)
+
+
+# =========================
+# Demo: quota-enforcing stub server
+# =========================
+def _stub_server(quota: int, window: float):
+    from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+    state = {"start": time.monotonic(), "used": 0, "ok": 0, "rejected": 0}
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            with lock:
+                now = time.monotonic()
+                if now - state["start"] >= window:
+                    state["start"], state["used"] = now - (now - state["start"]) % window, 0
+                left = quota - state["used"]
+                reset = window - (now - state["start"])
+                if left > 0:
+                    state["used"] += 1
+                    state["ok"] += 1
+                else:
+                    state["rejected"] += 1
+            if left > 0:
+                time.sleep(0.005)
+                self._reply(200, {"X-RateLimit-Limit": str(quota), "X-RateLimit-Remaining": str(left - 1)})
+            else:
+                self._reply(429, {"Retry-After": f"{reset:.3f}", "X-RateLimit-Remaining": "0"})
+
+        def _reply(self, code, headers):
+            body = b"{}"
+            self.send_response(code)
+            for k, v in headers.items():
+                self.send_header(k, v)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    return srv, state
+
+
+def _demo_get(url: str, bucket: Optional[TokenBucket], prio: int, max_retries: int = 8) -> bool:
+    """Like api_service._get: budgeted when bucket is given, else blind backoff ** i on 429."""
+    import http_client
+    for i in range(max_retries):
+        if bucket is not None and not bucket.acquire(prio):
+            return False
+        r = http_client.get(url, timeout=10)
+        if bucket is not None:
+            bucket.observe(r)
+        if r.status_code != 429:
+            return True
+        if bucket is None:
+            time.sleep(1.5 ** i * 0.1)
+    return False
+
+
+def _demo_run(url: str, bucket: Optional[TokenBucket], seconds: float, background: int) -> Dict[str, Any]:
+    stop = time.monotonic() + seconds
+    lat: Dict[int, list] = {INTERACTIVE: [], BACKGROUND: []}
+    failed = {INTERACTIVE: 0, BACKGROUND: 0}
+
+    def worker(prio: int, pause: float):
+        while time.monotonic() < stop:
+            t0 = time.perf_counter()
+            ok = _demo_get(url, bucket, prio)
+            lat[prio].append(time.perf_counter() - t0)
+            failed[prio] += not ok
+            time.sleep(pause)
+
+    threads = [threading.Thread(target=worker, args=(BACKGROUND, 0.0)) for _ in range(background)]
+    threads.append(threading.Thread(target=worker, args=(INTERACTIVE, 0.2)))
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    def pct(xs, q):
+        return sorted(xs)[min(len(xs) - 1, int(q * len(xs)))] * 1000 if xs else float("nan")
+
+    return {"interactive_p50_ms": pct(lat[INTERACTIVE], 0.5), "interactive_p95_ms": pct(lat[INTERACTIVE], 0.95),
+            "interactive_n": len(lat[INTERACTIVE]), "background_n": len(lat[BACKGROUND]),
+            "failed": failed[INTERACTIVE] + failed[BACKGROUND]}
+
+
+def demo(args) -> None:
+    print(f"stub upstream: {args.quota} requests per {args.window}s window; {args.background} background "
+          f"threads + 1 interactive caller for {args.seconds}s each")
+    print(f"{'client':<14} {'upstream 429s':>13} {'ok':>5} {'int p50 ms':>11} {'int p95 ms':>11} "
+          f"{'int n':>6} {'bg n':>6} {'failed':>7}")
+    for label, budgeted in (("blind backoff", False), ("token bucket", True)):
+        srv, state = _stub_server(args.quota, args.window)
+        url = f"http://127.0.0.1:{srv.server_port}/bill"
+        bucket = TokenBucket("stub", args.quota / args.window * 3600, burst=args.quota / 4) if budgeted else None
+        res = _demo_run(url, bucket, args.seconds, args.background)
+        srv.shutdown()
+        print(f"{label:<14} {state['rejected']:>13} {state['ok']:>5} {res['interactive_p50_ms']:>11.0f} "
+              f"{res['interactive_p95_ms']:>11.0f} {res['interactive_n']:>6} {res['background_n']:>6} "
+              f"{res['failed']:>7}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--demo", action="store_true", help="compare blind backoff vs the bucket on a stub server")
+    ap.add_argument("--quota", type=int, default=40, help="stub: requests allowed per window")
+    ap.add_argument("--window", type=float, default=2.0, help="stub: window seconds")
+    ap.add_argument("--background", type=int, default=8, help="background caller threads")
+    ap.add_argument("--seconds", type=float, default=6.0)
+    args = ap.parse_args()
+    if args.demo:
+        demo(args)
+    else:
+        import json
+        print(json.dumps(budget_status(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
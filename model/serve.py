@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Pre-forking server for api_service:app. The parent loads the encoder and every
+artifact once (api_service.load_state), freezes them out of the garbage collector
+and then forks the uvicorn workers, which share those pages copy-on-write instead
+of each loading its own ~420 MB model + artifacts (uvicorn --workers spawns fresh
+interpreters that all load everything).
+
+  python serve.py --workers 8 --port 8000
+  python serve.py --workers 8 --rss-every 300       # log per-worker memory every 5 min
+  python serve.py --measure --workers 4             # memory: per-worker loading vs fork-after-load
+
+Memory columns (from /proc/<pid>/smaps_rollup):
+  RSS  resident pages, shared ones counted in every process
+  PSS  shared pages split between the processes mapping them; sum(PSS) is what the
+       container really holds
+  USS  pages only this process has; roughly the cost of one more worker
+Size a container as sum(PSS) for the tested worker count + USS per extra worker.
+
+Torch runs single-threaded in the parent (no OpenMP pool to inherit across fork) and
+with TORCH_THREADS (default cpus / workers) in each worker. ONNX backends build their
+session in the parent, single-threaded, and every worker runs that one (weights shared;
+requests run in parallel across workers, not inside one). --onnx-session per-worker
+instead has each worker build its own session with TORCH_THREADS intra-op threads, at
+the cost of one copy of the weights per worker (about the .onnx file size: ~420 MB,
+less for int8), which --measure shows as worker USS. Each worker gets 1/workers of the
+upstream request budget (rate_budget.py).
+"""
+import argparse
+import gc
+import os
+import select
+import signal
+import socket
+import sys
+import time
+from typing import Dict, List, Optional
+
+SMAPS_FIELDS = ("Rss", "Pss", "Private_Clean", "Private_Dirty", "Shared_Clean", "Shared_Dirty")
+
+
+# =========================
+# Memory report
+# =========================
+def memory_kb(pid: int) -> Dict[str, int]:
+    """Rss/Pss/Uss in kB for pid (Linux; Rss only from /proc/<pid>/status on older kernels)."""
+    out = {}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup", "r") as f:
+            for line in f:
+                key, _, rest = line.partition(":")
+                if key in SMAPS_FIELDS:
+                    out[key] = int(rest.split()[0])
+        out["Uss"] = out.get("Private_Clean", 0) + out.get("Private_Dirty", 0)
+    except FileNotFoundError:
+        try:
+            with open(f"/proc/{pid}/status", "r") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        out["Rss"] = int(line.split()[1])
+        except FileNotFoundError:
+            pass
+    return out
+
+
+def memory_report(parent: int, workers: List[int], title: str = "") -> List[str]:
+    def fmt(kb: Optional[int]) -> str:
+        return f"{kb / 1024:>9.1f}" if kb is not None else f"{'n/a':>9}"
+
+    lines = [f"[serve] memory{(' — ' + title) if title else ''} (MB)",
+             f"  {'process':<16} {'RSS':>9} {'PSS':>9} {'USS':>9}"]
+    totals = {"Rss": 0, "Pss": 0}
+    for name, pid in [("parent", parent)] + [(f"worker {i}", p) for i, p in enumerate(workers)]:
+        m = memory_kb(pid)
+        for k in totals:
+            totals[k] += m.get(k, 0)
+        lines.append(f"  {name + f' ({pid})':<16} {fmt(m.get('Rss'))} {fmt(m.get('Pss'))} {fmt(m.get('Uss'))}")
+    lines.append(f"  {'total':<16} {fmt(totals['Rss'])} {fmt(totals['Pss'] or None)}")
+    return lines
+
+
+# =========================
+# Workers
+# =========================
+def _set_torch_threads(n: int) -> None:
+    try:
+        import torch
+    except ImportError:
+        return
+    torch.set_num_threads(n)
+
+
+def _bind(host: str, port: int) -> socket.socket:
+    sock = socket.socket(socket.AF_INET6 if ":" in host else socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _spawn(args, sock: Optional[socket.socket], ready_w: Optional[int], load_in_worker: bool) -> int:
+    pid = os.fork()
+    if pid:
+        return pid
+    code = 0
+    try:
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        _set_torch_threads(args.threads)
+        import api_service
+        import rate_budget
+        rate_budget.share(1.0 / args.workers)  # every worker spends the same Congress.gov key
+        if load_in_worker:
+            api_service.load_state()
+        if hasattr(api_service.app.state.model, "share_session"):
+            api_service.app.state.model.threads = args.threads  # a per-worker ONNX session's threads
+        api_service.warm_up()  # per-process lazy buffers (torch threads, ...) before serving
+        if ready_w is not None:
+            os.write(ready_w, b"%d\n" % os.getpid())
+        if sock is None:          # --measure: hold the memory until the parent is done
+            signal.pause()
+        else:
+            import uvicorn
+            config = uvicorn.Config(api_service.app, log_level=args.log_level, timeout_keep_alive=args.keep_alive)
+            uvicorn.Server(config).run(sockets=[sock])
+    except BaseException as e:  # never return into the parent's code
+        if not isinstance(e, (KeyboardInterrupt, SystemExit)):
+            print(f"[serve] worker {os.getpid()} failed: {e!r}", file=sys.stderr)
+            code = 1
+    finally:
+        os._exit(code)
+
+
+def _wait_ready(ready_r: int, n: int, timeout: float) -> List[int]:
+    pids, buf, end = [], b"", time.time() + timeout
+    while len(pids) < n:
+        left = end - time.time()
+        if left <= 0 or not select.select([ready_r], [], [], left)[0]:
+            raise RuntimeError(f"only {len(pids)}/{n} workers ready after {timeout:.0f}s")
+        chunk = os.read(ready_r, 4096)
+        if not chunk:
+            raise RuntimeError("workers exited before becoming ready")
+        buf += chunk
+        *done, buf = buf.split(b"\n")
+        pids += [int(p) for p in done if p]
+    return pids
+
+
+def _stop(pids: List[int]) -> None:
+    for pid in pids:
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+    for pid in pids:
+        try:
+            os.waitpid(pid, 0)
+        except ChildProcessError:
+            pass
+
+
+def _load_parent(args) -> None:
+    import api_service
+    _set_torch_threads(1)
+    t0 = time.perf_counter()
+    api_service.load_state()
+    share = getattr(api_service.app.state.model, "share_session", None)  # ONNX backends
+    if share is not None and args.onnx_session == "shared":
+        share()
+    gc.collect()
+    gc.freeze()  # keep the collector from touching (and so copying) the loaded objects
+    print(f"[serve] loaded model + artifacts in {time.perf_counter() - t0:.1f}s (pid {os.getpid()})")
+
+
+# =========================
+# Modes
+# =========================
+def measure(args) -> None:
+    """Start --workers idle workers both ways, print memory, stop them."""
+    import api_service  # noqa: F401  (libraries imported once in both modes)
+    reports = []
+    for title, preload in (("each worker loads (uvicorn --workers)", False), ("fork after load", True)):
+        if preload:
+            _load_parent(args)
+        ready_r, ready_w = os.pipe()
+        children = [_spawn(args, None, ready_w, load_in_worker=not preload) for _ in range(args.workers)]
+        try:
+            workers = _wait_ready(ready_r, args.workers, args.ready_timeout)
+            time.sleep(0.5)
+            reports.append(memory_report(os.getpid(), workers, title))
+        finally:
+            _stop(children)
+            os.close(ready_r)
+            os.close(ready_w)
+    for lines in reports:
+        print("\n".join(lines))
+
+
+def serve(args) -> None:
+    _load_parent(args)
+    sock = _bind(args.host, args.port)
+    ready_r, ready_w = os.pipe()
+    children: List[int] = []
+    stopping = False
+
+    def _shutdown(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, _shutdown)
+    signal.signal(signal.SIGINT, _shutdown)
+
+    children += [_spawn(args, sock, ready_w, load_in_worker=False) for _ in range(args.workers)]
+    workers = _wait_ready(ready_r, args.workers, args.ready_timeout)
+    print(f"[serve] {len(workers)} workers on http://{args.host}:{args.port}")
+    print("\n".join(memory_report(os.getpid(), workers)))
+
+    next_report = time.time() + args.rss_every if args.rss_every else None
+    while children:
+        try:
+            pid, status = os.waitpid(-1, os.WNOHANG)
+        except ChildProcessError:
+            break
+        if pid:
+            children.remove(pid)
+            if not stopping:
+                print(f"[serve] worker {pid} exited (status {status}); starting a new one")
+                children.append(_spawn(args, sock, None, load_in_worker=False))
+            continue
+        if next_report and time.time() >= next_report and not stopping:
+            print("\n".join(memory_report(os.getpid(), children)))
+            next_report = time.time() + args.rss_every
+        time.sleep(0.2)
+    print("[serve] stopped")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--host", default="0.0.0.0")
+    ap.add_argument("--port", type=int, default=8000)
+    ap.add_argument("--workers", type=int, default=int(os.getenv("WEB_CONCURRENCY", "2")))
+    ap.add_argument("--threads", type=int, default=int(os.getenv("TORCH_THREADS", "0")),
+                    help="torch threads per worker (0 = cpus / workers)")
+    ap.add_argument("--onnx-session", choices=("shared", "per-worker"), default="shared",
+                    help="ONNX backends: one single-threaded session built before fork, or one per worker")
+    ap.add_argument("--rss-every", type=float, default=0, help="log per-worker memory every N seconds")
+    ap.add_argument("--ready-timeout", type=float, default=600)
+    ap.add_argument("--keep-alive", type=int, default=5)
+    ap.add_argument("--log-level", default="info")
+    ap.add_argument("--measure", action="store_true", help="print the memory comparison and exit")
+    args = ap.parse_args()
+    if args.threads <= 0:
+        args.threads = max(1, (os.cpu_count() or 1) // max(1, args.workers))
+    if not hasattr(os, "fork"):
+        raise SystemExit("serve.py needs fork(); use `uvicorn api_service:app --workers N` on this platform")
+
+    if args.measure:
+        measure(args)
+    else:
+        serve(args)
+
+
+if __name__ == "__main__":
+    main()
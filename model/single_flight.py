@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Request coalescing ("single flight"): while a call for a key is running, further
+calls for the same key wait for it and share its result (or its exception)
+instead of running it again. Nothing is kept once the call returns; freshness
+is the caches' job (HTTP_CACHE, BILL_CACHE), this only removes duplicate
+concurrent work.
+
+  UPSTREAM = SingleFlight("upstream")
+  r = UPSTREAM.do(("GET", url), lambda: fetch(url), timeout=5.0)
+  r = UPSTREAM.do(key, lambda: fetch(url, deadline), timeout=5.0, retry=(StageTimeout,))
+  r = await AsyncSingleFlight("upstream_async").do(key, lambda: afetch(url))   # coroutines
+  single_flight.stats()   # per group: calls, executed, coalesced, errors, in_flight
+
+SingleFlight: the leader runs the call on its own thread (so its contextvars, e.g.
+the rate_budget priority, apply); followers block on a Future.
+AsyncSingleFlight: the call runs as a task (with the leader's context) that every
+caller awaits, so one cancelled caller does not cancel it for the others.
+Either way a caller's timeout only bounds its own wait (FlightTimeout), the call
+goes on. Results are shared objects: callers must not mutate them.
+
+The call runs with the leader's deadline and priority class. Keys should include
+the priority class when the call waits for budget by it; `retry` names the
+exceptions that are the leader's own (its deadline or budget wait ran out) rather
+than the call's: a follower that gets one runs the call again (leading it, or
+behind a newer leader) while its own timeout has time left; without a timeout,
+once, since a newer leader's start-relative deadline is no earlier than the
+follower's would have been.
+"""
+import asyncio
+import concurrent.futures
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple, Type
+
+
+GROUPS: Dict[str, "SingleFlight"] = {}
+
+
+class FlightTimeout(TimeoutError):
+    """A follower gave up waiting for the in-flight call."""
+
+
+class SingleFlight:
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._inflight: Dict[Hashable, concurrent.futures.Future] = {}
+        self._stats = {"calls": 0, "executed": 0, "coalesced": 0, "errors": 0, "retried": 0}
+        GROUPS[name] = self
+
+    def do(self, key: Hashable, fn: Callable[[], Any], timeout: Optional[float] = None,
+           retry: Tuple[Type[BaseException], ...] = ()) -> Any:
+        end = None if timeout is None else time.monotonic() + timeout
+        retried = False
+        while True:
+            with self._lock:
+                self._stats["calls"] += 1
+                future = self._inflight.get(key)
+                leader = future is None
+                if leader:
+                    future = self._inflight[key] = concurrent.futures.Future()
+                    self._stats["executed"] += 1
+                else:
+                    self._stats["coalesced"] += 1
+            if leader:
+                break
+            wait = None if end is None else max(0.0, end - time.monotonic())
+            try:
+                return future.result(timeout=wait)
+            except concurrent.futures.TimeoutError:
+                raise FlightTimeout(f"{self.name}: gave up after {timeout:.1f}s waiting for {key!r}")
+            except retry:
+                if not self._retry(end, retried):
+                    raise
+                retried = True
+
+        try:
+            result = fn()
+        except BaseException as e:
+            with self._lock:
+                self._stats["errors"] += 1
+                del self._inflight[key]
+            future.set_exception(e)
+            raise
+        with self._lock:
+            del self._inflight[key]
+        future.set_result(result)
+        return result
+
+    def _retry(self, end: Optional[float], retried: bool) -> bool:
+        """A follower got the leader's own failure: try again itself?"""
+        if (end is None and retried) or (end is not None and time.monotonic() >= end):
+            return False
+        with self._lock:
+            self._stats["retried"] += 1
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            s = dict(self._stats, in_flight=len(self._inflight))
+        s["coalesced_ratio"] = round(s["coalesced"] / s["calls"], 4) if s["calls"] else None
+        return s
+
+
+class AsyncSingleFlight(SingleFlight):
+    """SingleFlight for coroutine functions; keys are per event loop."""
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]], timeout: Optional[float] = None,
+                 retry: Tuple[Type[BaseException], ...] = ()) -> Any:
+        loop_key = (id(asyncio.get_running_loop()), key)
+        end = None if timeout is None else time.monotonic() + timeout
+        retried = False
+        while True:
+            with self._lock:
+                self._stats["calls"] += 1
+                task = self._inflight.get(loop_key)
+                leader = task is None or task.done()
+                if leader:
+                    task = self._inflight[loop_key] = asyncio.ensure_future(fn())
+                    task.add_done_callback(lambda t: self._done(loop_key, t))
+                    self._stats["executed"] += 1
+                else:
+                    self._stats["coalesced"] += 1
+            wait = None if end is None else max(0.0, end - time.monotonic())
+            try:
+                return await asyncio.wait_for(asyncio.shield(task), wait)
+            except asyncio.TimeoutError:
+                raise FlightTimeout(f"{self.name}: gave up after {timeout:.1f}s waiting for {key!r}")
+            except retry:
+                if leader or not self._retry(end, retried):
+                    raise
+                retried = True
+
+    def _done(self, loop_key, task: "asyncio.Future") -> None:
+        with self._lock:
+            if self._inflight.get(loop_key) is task:
+                del self._inflight[loop_key]
+            if task.cancelled() or task.exception() is not None:
+                self._stats["errors"] += 1
+
+
+def stats() -> Dict[str, Dict[str, Any]]:
+    return {name: g.stats() for name, g in GROUPS.items()}
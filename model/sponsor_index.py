@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+Local sponsor -> bills index behind GET /member_bills, so a member's bills come
+from one indexed query instead of a detail call per recent bill.
+
+  bootstrap  a member's first request pages through Congress.gov's
+             /member/{id}/sponsored-legislation (every congress) into the index
+  sync       bills updated since the last sync (/bill?fromDateTime=..., by
+             updateDate): known bills get their title / latest action refreshed,
+             new ones one detail call for the sponsor; the API starts one in the
+             background once the last is SPONSOR_SYNC_INTERVAL old, or cron it
+
+SQLite in WAL mode (API workers and cron share the file). Tables:
+  bills    one row per (congress, type, number): sponsor, dates, latest action;
+           indexed on (sponsor, congress, introduced_date DESC)
+  members  bootstrapped members
+  meta     synced_through (UTC epoch of the sync watermark), last_sync stats,
+           sync_lease (one sync at a time across workers)
+
+  python sponsor_index.py                        # summary
+  python sponsor_index.py --member P000197       # bootstrap if needed + the member's bills
+  python sponsor_index.py --sync                 # incremental sync (cron)
+  python sponsor_index.py --bootstrap-current    # every current member up front
+"""
+import argparse
+import asyncio
+import concurrent.futures
+import datetime
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple
+
+import rate_budget
+
+SPONSOR_INDEX_PATH = os.getenv("SPONSOR_INDEX_PATH", os.path.join("cache", "sponsor_index.sqlite"))
+SCHEMA_VERSION = 1
+PAGE_SIZE = 250
+SYNC_OVERLAP = 600  # seconds re-listed before the watermark (Congress.gov indexes updates with a lag)
+SYNC_WORKERS = 4  # detail calls for bills new to the index
+SYNC_LEASE = 1800
+
+API = "https://api.congress.gov/v3"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS bills (
+    congress           INTEGER NOT NULL,
+    bill_type          TEXT NOT NULL,
+    bill_number        INTEGER NOT NULL,
+    sponsor            TEXT,
+    title              TEXT,
+    introduced_date    TEXT,
+    latest_action_date TEXT,
+    latest_action_text TEXT,
+    policy_area        TEXT,
+    cosponsors_count   INTEGER,
+    update_date        TEXT,
+    url                TEXT,
+    PRIMARY KEY (congress, bill_type, bill_number)
+);
+CREATE INDEX IF NOT EXISTS bills_by_sponsor ON bills (sponsor, congress, introduced_date DESC);
+CREATE TABLE IF NOT EXISTS members (
+    bioguide_id     TEXT PRIMARY KEY,
+    bootstrapped_at REAL NOT NULL,
+    listed          INTEGER NOT NULL
+);
+"""
+
+FetchJson = Callable[[str, Optional[Dict[str, Any]]], Dict[str, Any]]  # (url, params) -> JSON, raises on errors
+AsyncFetchJson = Callable[[str, Optional[Dict[str, Any]]], Awaitable[Dict[str, Any]]]
+
+
+def _bill_key(item: Dict[str, Any]) -> Optional[Tuple[int, str, int]]:
+    """(congress, type, number) of a listing item; None for amendments and the like."""
+    try:
+        return int(item["congress"]), str(item["type"]).lower(), int(item["number"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def _row(key: Tuple[int, str, int], item: Dict[str, Any], sponsor: Optional[str]) -> Tuple:
+    la = item.get("latestAction") or {}
+    cos = item.get("cosponsors")
+    return (*key, sponsor, item.get("title"), item.get("introducedDate"), la.get("actionDate"), la.get("text"),
+            (item.get("policyArea") or {}).get("name"), cos.get("count") if isinstance(cos, dict) else None,
+            item.get("updateDateIncludingText") or item.get("updateDate"), item.get("url"))
+
+
+def _utc(ts: float) -> str:
+    return datetime.datetime.fromtimestamp(ts, datetime.timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class SponsorIndex:
+    def __init__(self, path: str = SPONSOR_INDEX_PATH):
+        self.path = path
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with self._conn() as db:
+            db.executescript(SCHEMA)
+            db.execute("INSERT OR IGNORE INTO meta VALUES ('schema_version', ?)", (str(SCHEMA_VERSION),))
+            db.execute("INSERT OR IGNORE INTO meta VALUES ('sync_lease', '0')")
+
+    def _conn(self) -> sqlite3.Connection:
+        """
+        One connection per thread and process: sqlite3 connections are not shared across
+        threads, and one inherited across fork() (serve.py workers) must not be reused.
+        """
+        db = getattr(self._local, "db", None)
+        if db is None or self._local.pid != os.getpid():
+            db = sqlite3.connect(self.path, timeout=30)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.row_factory = sqlite3.Row
+            self._local.db, self._local.pid = db, os.getpid()
+        return db
+
+    def _meta(self, key: str) -> Optional[str]:
+        r = self._conn().execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return None if r is None else r[0]
+
+    # ---- writer
+    def bootstrapped_at(self, bioguide_id: str) -> Optional[float]:
+        r = self._conn().execute("SELECT bootstrapped_at FROM members WHERE bioguide_id = ?",
+                                 (bioguide_id.upper(),)).fetchone()
+        return None if r is None else r[0]
+
+    def put_member(self, bioguide_id: str, items: List[Dict[str, Any]], started_at: float) -> int:
+        """A member's full sponsored-legislation listing, fetched from started_at on."""
+        rows = [_row(k, it, bioguide_id.upper()) for it in items for k in [_bill_key(it)] if k]
+        with self._conn() as db:
+            db.executemany(
+                "INSERT INTO bills VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT(congress, bill_type, bill_number) DO UPDATE SET"
+                " sponsor = excluded.sponsor, title = excluded.title,"
+                " introduced_date = COALESCE(excluded.introduced_date, bills.introduced_date),"
+                " latest_action_date = excluded.latest_action_date, latest_action_text = excluded.latest_action_text,"
+                " policy_area = COALESCE(excluded.policy_area, bills.policy_area), url = excluded.url", rows)
+            db.execute("INSERT OR REPLACE INTO members VALUES (?, ?, ?)", (bioguide_id.upper(), started_at, len(rows)))
+            # the first bootstrap starts the sync watermark: later changes come from sync()
+            db.execute("INSERT OR IGNORE INTO meta VALUES ('synced_through', ?)", (str(started_at),))
+        return len(rows)
+
+    def refresh(self, items: List[Dict[str, Any]]) -> List[Tuple[Dict[str, Any], Tuple[int, str, int]]]:
+        """Apply listing items to the bills already indexed; returns the (item, key) of unknown ones."""
+        unknown = []
+        with self._conn() as db:
+            for it in items:
+                key = _bill_key(it)
+                if key is None:
+                    continue
+                la = it.get("latestAction") or {}
+                cur = db.execute(
+                    "UPDATE bills SET title = COALESCE(?, title), latest_action_date = ?, latest_action_text = ?,"
+                    " update_date = ? WHERE congress = ? AND bill_type = ? AND bill_number = ?",
+                    (it.get("title"), la.get("actionDate"), la.get("text"),
+                     it.get("updateDateIncludingText") or it.get("updateDate"), *key))
+                if cur.rowcount == 0:
+                    unknown.append((it, key))
+        return unknown
+
+    def put_bills(self, details: List[Tuple[Tuple[int, str, int], Dict[str, Any]]]) -> None:
+        """Bills new to the index, from their detail records (sponsor included)."""
+        rows = [_row(key, d, ((d.get("sponsors") or [{}])[0].get("bioguideId") or "").upper() or None)
+                for key, d in details]
+        with self._conn() as db:
+            db.executemany("INSERT OR REPLACE INTO bills VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+
+    def synced_through(self) -> Optional[float]:
+        v = self._meta("synced_through")
+        return None if v is None else float(v)
+
+    def finish_sync(self, through: float, stats: Dict[str, Any]) -> None:
+        with self._conn() as db:
+            db.execute("INSERT OR REPLACE INTO meta VALUES ('synced_through', ?)", (str(through),))
+            db.execute("INSERT OR REPLACE INTO meta VALUES ('last_sync', ?)", (json.dumps(stats),))
+            db.execute("UPDATE meta SET value = '0' WHERE key = 'sync_lease'")
+
+    def take_lease(self, seconds: float = SYNC_LEASE) -> bool:
+        """True for the one caller (across processes) that may sync now."""
+        now = time.time()
+        with self._conn() as db:
+            cur = db.execute("UPDATE meta SET value = ? WHERE key = 'sync_lease' AND CAST(value AS REAL) < ?",
+                             (str(now + seconds), now))
+            return cur.rowcount == 1
+
+    def drop_lease(self) -> None:
+        with self._conn() as db:
+            db.execute("UPDATE meta SET value = '0' WHERE key = 'sync_lease'")
+
+    # ---- reader (API)
+    def bills_for_member(self, bioguide_id: str, congress: Optional[int] = None, limit: int = 20,
+                         offset: int = 0) -> Tuple[List[Dict[str, Any]], int]:
+        """(bills sponsored by the member, newest introduced first; total count)."""
+        where, params = "sponsor = ?", [bioguide_id.upper()]
+        if congress is not None:
+            where += " AND congress = ?"
+            params.append(congress)
+        db = self._conn()
+        total = db.execute(f"SELECT COUNT(*) FROM bills WHERE {where}", params).fetchone()[0]
+        rows = db.execute(f"SELECT * FROM bills WHERE {where} ORDER BY introduced_date DESC, bill_number DESC"
+                          " LIMIT ? OFFSET ?", params + [limit, offset])
+        return [{
+            "congress": r["congress"],
+            "bill_type": r["bill_type"],
+            "bill_number": r["bill_number"],
+            "title": r["title"],
+            "introduced_date": r["introduced_date"],
+            "latest_action": {"date": r["latest_action_date"], "text": r["latest_action_text"]},
+            "policy_area": r["policy_area"],
+            "cosponsors_count": r["cosponsors_count"],
+            "update_date": r["update_date"],
+            "url": r["url"],
+        } for r in rows], total
+
+    def summary(self) -> Dict[str, Any]:
+        db = self._conn()
+        through = self.synced_through()
+        return {
+            "bills": db.execute("SELECT COUNT(*) FROM bills").fetchone()[0],
+            "sponsors": db.execute("SELECT COUNT(DISTINCT sponsor) FROM bills").fetchone()[0],
+            "members_bootstrapped": db.execute("SELECT COUNT(*) FROM members").fetchone()[0],
+            "synced_through": None if through is None else _utc(through),
+            "last_sync": json.loads(self._meta("last_sync") or "null"),
+        }
+
+
+# =========================
+# Bootstrap / sync
+# =========================
+def _pages(fetch_json: FetchJson, url: str, field: str, params: Optional[Dict[str, Any]] = None) -> Iterator[Dict[str, Any]]:
+    offset = 0
+    while True:
+        data = fetch_json(url, dict(params or {}, limit=PAGE_SIZE, offset=offset))
+        items = data.get(field) or []
+        yield from items
+        total = (data.get("pagination") or {}).get("count")
+        offset += PAGE_SIZE
+        if not items or (total is not None and offset >= total):
+            return
+
+
+async def _apages(fetch_json: AsyncFetchJson, url: str, field: str,
+                  params: Optional[Dict[str, Any]] = None) -> AsyncIterator[Dict[str, Any]]:
+    offset = 0
+    while True:
+        data = await fetch_json(url, dict(params or {}, limit=PAGE_SIZE, offset=offset))
+        items = data.get(field) or []
+        for item in items:
+            yield item
+        total = (data.get("pagination") or {}).get("count")
+        offset += PAGE_SIZE
+        if not items or (total is not None and offset >= total):
+            return
+
+
+def bootstrap_member(index: SponsorIndex, fetch_json: FetchJson, bioguide_id: str) -> int:
+    """Index every bill the member sponsored (all congresses); returns how many."""
+    started = time.time()
+    items = list(_pages(fetch_json, f"{API}/member/{bioguide_id.upper()}/sponsored-legislation",
+                        "sponsoredLegislation"))
+    n = index.put_member(bioguide_id, items, started)
+    print(f"[sponsor_index] {bioguide_id.upper()}: {n} sponsored bills indexed")
+    return n
+
+
+async def abootstrap_member(index: SponsorIndex, fetch_json: AsyncFetchJson, bioguide_id: str) -> int:
+    """bootstrap_member() for the API's event loop: pages fetched as coroutines, the write in a thread."""
+    started = time.time()
+    items = [item async for item in _apages(fetch_json, f"{API}/member/{bioguide_id.upper()}/sponsored-legislation",
+                                            "sponsoredLegislation")]
+    n = await asyncio.to_thread(index.put_member, bioguide_id, items, started)
+    print(f"[sponsor_index] {bioguide_id.upper()}: {n} sponsored bills indexed")
+    return n
+
+
+def sync(index: SponsorIndex, fetch_json: FetchJson, workers: int = SYNC_WORKERS) -> Dict[str, Any]:
+    """Apply the bills updated since the watermark; a no-op before the first bootstrap."""
+    through = index.synced_through()
+    if through is None:
+        return {"listed": 0, "refreshed": 0, "added": 0, "failed": 0}
+    started = time.time()
+    items = list(_pages(fetch_json, f"{API}/bill", "bills",
+                        {"fromDateTime": _utc(through - SYNC_OVERLAP), "toDateTime": _utc(started),
+                         "sort": "updateDate asc"}))
+    unknown = index.refresh(items)
+
+    def detail(entry):
+        _, (congress, bill_type, number) = entry
+        return (congress, bill_type, number), fetch_json(f"{API}/bill/{congress}/{bill_type}/{number}", None).get("bill") or {}
+
+    details, failed = [], 0
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as ex:
+        for future in [rate_budget.submit(ex, detail, e) for e in unknown]:
+            try:
+                details.append(future.result())
+            except Exception as e:
+                failed += 1
+                print(f"[sponsor_index] bill detail failed: {e}")
+    index.put_bills(details)
+    stats = {"listed": len(items), "refreshed": len(items) - len(unknown), "added": len(details),
+             "failed": failed, "seconds": round(time.time() - started, 1), "finished_at": time.time()}
+    # a failed detail is retried by the next sync (the watermark stays)
+    index.finish_sync(through if failed else started, stats)
+    return stats
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--path", default=SPONSOR_INDEX_PATH)
+    ap.add_argument("--member", default=None, help="bioguide id: bootstrap if needed, then list")
+    ap.add_argument("--congress", type=int, default=None)
+    ap.add_argument("--limit", type=int, default=20)
+    ap.add_argument("--sync", action="store_true", help="incremental sync by updateDate")
+    ap.add_argument("--bootstrap-current", action="store_true", help="bootstrap every current member")
+    args = ap.parse_args()
+
+    import api_service
+    rate_budget.set_priority(rate_budget.BACKGROUND)
+    index = SponsorIndex(args.path)
+    fetch_json = api_service.congress_json
+    if args.bootstrap_current:
+        for m in _pages(fetch_json, f"{API}/member", "members", {"currentMember": "true"}):
+            if m.get("bioguideId") and index.bootstrapped_at(m["bioguideId"]) is None:
+                bootstrap_member(index, fetch_json, m["bioguideId"])
+    if args.sync:
+        print(f"[sponsor_index] sync: {sync(index, fetch_json)}")
+    if args.member:
+        if index.bootstrapped_at(args.member) is None:
+            bootstrap_member(index, fetch_json, args.member)
+        t0 = time.perf_counter()
+        rows, total = index.bills_for_member(args.member, args.congress, args.limit)
+        ms = (time.perf_counter() - t0) * 1000
+        for r in rows:
+            print(f"  {r['congress']} {r['bill_type'].upper()}.{r['bill_number']:<6} {r['introduced_date'] or '':<10}  "
+                  f"{(r['title'] or '')[:70]}")
+        print(f"{len(rows)} of {total} bills for {args.member.upper()} in {ms:.2f} ms")
+    if not (args.member or args.sync or args.bootstrap_current):
+        print(json.dumps(index.summary(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,476 @@
+#!/usr/bin/env python3
+"""
+Statute text cleaner shared by api_service.py and top5companies.py.
+
+clean_statute_text() is a single pass over the lines of the raw text: every step
+is a generator stage, so the text is never rebuilt or re-split between steps.
+It is byte-identical to clean_statute_text_multipass() (the original rules,
+kept as the reference). Whole-text regexes whose \\s can run across line ends
+(page markers, dividers, line numbers, empty <> pairs) are applied to small
+groups of lines that such a match could span, which gives the same result as
+applying them to the whole string.
+
+Self-check + throughput (MB/s, peak memory) of both implementations:
+  python statute_cleaner.py                     # cache/bills/raw + bill_texts + synthetic bills
+  python statute_cleaner.py --fuzz 2000         # plus random edge-case documents
+"""
+import argparse
+import glob
+import json
+import os
+import random
+import re
+import time
+import tracemalloc
+from typing import Iterable, Iterator, List, Optional, Pattern, Tuple
+
+# =========================
+# Rules (same regexes as the script)
+# =========================
+PAGE_ARTIFACT_RE = re.compile(r"\[\[\s*Page\s+[0-9A-Z.\- ]+\]\]")
+INLINE_TAG_RE = re.compile(r"<<\s*(?:NOTE:|Deadline[^>]*|Effective\s+date[^>]*)\s*.*?>>", re.IGNORECASE | re.DOTALL)
+# top5companies.py variant: also &lt;/&gt; and editorial notes
+SCRIPT_INLINE_TAG_RE = re.compile(
+    r"(?:<|&lt;){1,2}\s*"
+    r"(?:NOTE:|Notes?:|Editorial\s*Note:|Editor\s*Note:|Deadline[^>:\n]*:|Effective\s+date[^>:\n]*:)"
+    r"[\s\S]*?"
+    r"(?:>|&gt;){1,2}",
+    re.IGNORECASE
+)
+ALLCAPS_HEADER_RE = re.compile(r"^(?:[A-Z0-9 ,.'\-]{6,})$", re.MULTILINE)
+LEG_HISTORY_START_RE = re.compile(r"^\s*(?:LEGISLATIVE HISTORY|HISTORY|CONGRESSIONAL RECORD)\b.*$", re.IGNORECASE | re.MULTILINE)
+CERT_STAMP_RE = re.compile(r"^\s*(?:Approved\s+[A-Za-z]+\s+\d{1,2},\s+\d{4}\.?|Be it enacted.*)$", re.IGNORECASE | re.MULTILINE)
+LINE_NUMBER_RE = re.compile(r"^\s*\d{1,4}\s+", re.MULTILINE)
+DECOR_DIVIDER_RE = re.compile(r"^\s*[·\-–—_=]{4,}\s*$", re.MULTILINE)
+
+SEC_LINE_RE = re.compile(r"^\s*Sec\.\s*\d+[A-Za-z\-]*\.\s*", re.IGNORECASE)
+SUBSECTION_LINE_RE = re.compile(r"^\s*\(([a-z]|[0-9]+|[A-Z]|i{1,3}|iv|v|vi{0,3}|ix|x)\)\s")
+STRUCTURAL_START_RE = re.compile(r"^\s*(?:Sec\.\s*\d+[A-Za-z\-]*\.|\([a-zA-Z0-9ivxIVX]+\))")
+
+TOC_RE = re.compile(r"(?im)^\s*table of contents\s*$")
+ANGLE_CLOSE_RE = re.compile(r"[ \t]*(?:&gt;|>){1,2}[ \t]*$", re.MULTILINE)
+ANGLE_OPEN_RE = re.compile(r"^[ \t]*(?:&lt;|<){1,2}[ \t]*", re.MULTILINE)
+ANGLE_PAIR_RE = re.compile(r"(?:&lt;|<){1,2}\s*(?:&gt;|>){1,2}")
+
+def _standardize_quotes_dashes(s: str) -> str:
+    s = (s.replace("\u2018", "'").replace("\u2019", "'")
+           .replace("\u201C", '"').replace("\u201D", '"')
+           .replace("\u2013", "—").replace("\u2014", "—"))
+    return s
+
+EDGE_QUOTES_RE = re.compile(r'^[\'"“”]+|[\'"“”]+\s*$')
+
+def _strip_leading_trailing_quotes(line: str) -> str:
+    return EDGE_QUOTES_RE.sub("", line).strip()
+
+def _normalize_heading_punct(line: str) -> str:
+    if STRUCTURAL_START_RE.match(line) and re.search(r"—\s*$", line):
+        return re.sub(r"—\s*$", ".", line)
+    return line
+
+# =========================
+# Reference (multi-pass) implementation
+# =========================
+def clean_statute_text_multipass(raw: str, inline_tag_re: Pattern = INLINE_TAG_RE,
+                                 strip_angle_brackets: bool = False) -> str:
+    text = PAGE_ARTIFACT_RE.sub("", raw)
+    text = DECOR_DIVIDER_RE.sub("", text)
+
+    lines = []
+    for ln in text.splitlines():
+        if ALLCAPS_HEADER_RE.match(ln) and not ln.strip().startswith("SEC."):
+            continue
+        if CERT_STAMP_RE.match(ln):
+            continue
+        ln = inline_tag_re.sub("", ln)
+        lines.append(ln)
+    text = "\n".join(lines)
+    if strip_angle_brackets:
+        text = re.sub(r"[ \t]*(?:&gt;|>){1,2}[ \t]*$", "", text, flags=re.MULTILINE)
+        text = re.sub(r"^[ \t]*(?:&lt;|<){1,2}[ \t]*", "", text, flags=re.MULTILINE)
+        text = re.sub(r"(?:&lt;|<){1,2}\s*(?:&gt;|>){1,2}", "", text)
+
+    parts = re.split(r"(?im)^\s*table of contents\s*$", text, maxsplit=1)
+    if len(parts) == 2:
+        head, rest = parts
+        rest_parts = re.split(r"\n\s*\n", rest, maxsplit=1)
+        text = head + ("\n\n" + (rest_parts[1] if len(rest_parts) > 1 else ""))
+
+    m = LEG_HISTORY_START_RE.search(text)
+    if m:
+        text = text[:m.start()]
+
+    text = _standardize_quotes_dashes(text)
+    text = LINE_NUMBER_RE.sub("", text)
+
+    cleaned_lines = []
+    for ln in text.splitlines():
+        ln = ln.strip()
+        if not ln:
+            cleaned_lines.append("")
+            continue
+        ln = _strip_leading_trailing_quotes(ln)
+        ln = _normalize_heading_punct(ln)
+        cleaned_lines.append(ln)
+    text = "\n".join(cleaned_lines)
+
+    def _merge_preserving_structure(t: str) -> str:
+        out = []; buf = []
+        def flush_buf():
+            if buf:
+                out.append(" ".join(buf).strip()); buf.clear()
+        for ln in t.splitlines():
+            if not ln.strip():
+                flush_buf(); out.append(""); continue
+            if SEC_LINE_RE.match(ln) or SUBSECTION_LINE_RE.match(ln):
+                flush_buf(); out.append(ln.strip())
+            else:
+                buf.append(ln.strip())
+        flush_buf()
+        return re.sub(r"(?:\n\s*){3,}", "\n\n", "\n".join(out)).strip()
+
+    text = _merge_preserving_structure(text)
+    text = re.sub(r"[ \t]+", " ", text)
+    text = re.sub(r"\n{3,}", "\n\n", text).strip()
+    return text
+
+# =========================
+# Streaming implementation
+# =========================
+# A stream is the text's "\n"-separated lines: "\n".join(stream) is the text at that step.
+
+# Line ends a whole-text match may run past (its \s reaches the next line)
+PAGE_OPEN_RE = re.compile(r"\[\[\s*(?:Page\s*)?$")
+PAGE_CONT_RE = re.compile(r"\s*(?:Page\s*)?")
+DECOR_SPAN_RE = re.compile(r"\s*(?:[·\-–—_=]{4,}\s*)?")
+LINE_NUMBER_SPAN_RE = re.compile(r"\s*(?:\d{1,4}\s*)?")
+ANGLE_PAIR_OPEN_RE = re.compile(r"(?:&lt;|<)\s*$")
+
+TOC_LINE_RE = re.compile(r"\s*table of contents\s*", re.IGNORECASE)
+LEG_HISTORY_LINE_RE = re.compile(r"\s*(?:LEGISLATIVE HISTORY|HISTORY|CONGRESSIONAL RECORD)\b", re.IGNORECASE)
+SPACES_RE = re.compile(r"[ \t]+")
+
+
+def _blank(line: str) -> bool:
+    return not line or line.isspace()
+
+
+def _iter_lines(raw: str) -> Iterator[str]:
+    start = 0
+    while True:
+        end = raw.find("\n", start)
+        if end < 0:
+            yield raw[start:]
+            return
+        yield raw[start:end]
+        start = end + 1
+
+
+def _with_last(lines: Iterable[str]) -> Iterator[Tuple[str, bool]]:
+    it = iter(lines)
+    prev = next(it, None)
+    for ln in it:
+        yield prev, False
+        prev = ln
+    if prev is not None:
+        yield prev, True
+
+
+# str.splitlines() boundaries besides \n and \r (\r\n is one boundary)
+_OTHER_BREAKS = "\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029"
+
+
+def _splitlines(lines: Iterable[str]) -> Iterator[str]:
+    """str.splitlines() of the streamed text (also splits on \\r, \\f, \\u2028, ...)."""
+    held_empty = False  # an empty final line is not a line for splitlines()
+    broke = False       # previous line ended in another boundary: its \n starts an empty line
+    for ln in lines:
+        if held_empty or broke:
+            yield ""
+            held_empty = broke = False
+        if not ln:
+            held_empty = True
+            continue
+        parts = ln.splitlines()
+        if len(parts) == 1:
+            yield parts[0]
+        else:
+            yield from parts
+        broke = ln[-1] in _OTHER_BREAKS
+
+
+def _grouped_sub(lines: Iterable[str], pattern: Pattern, joins_next, may_match=None) -> Iterator[str]:
+    """
+    pattern.sub("", text) over the stream. Lines are buffered only while
+    joins_next(line, in_group) says a match could continue past the line end;
+    a lone line is skipped when may_match(line) rules a match out.
+    """
+    group: List[str] = []
+    for ln in lines:
+        if group:
+            group.append(ln)
+            if joins_next(ln, True):
+                continue
+            yield from pattern.sub("", "\n".join(group)).split("\n")
+            group = []
+        elif joins_next(ln, False):
+            group.append(ln)
+        elif may_match is None or may_match(ln):
+            yield pattern.sub("", ln)
+        else:
+            yield ln
+    if group:
+        yield from pattern.sub("", "\n".join(group)).split("\n")
+
+
+def _drop_headers_and_tags(lines: Iterable[str], inline_tag_re: Pattern) -> Iterator[str]:
+    for ln in _splitlines(lines):
+        if ALLCAPS_HEADER_RE.match(ln) and not ln.strip().startswith("SEC."):
+            continue
+        if CERT_STAMP_RE.match(ln):
+            continue
+        # Every tag variant opens with "<" or "&lt;"
+        yield inline_tag_re.sub("", ln) if ("<" in ln or "&lt;" in ln) else ln
+
+
+def _strip_angles(lines: Iterable[str]) -> Iterator[str]:
+    lines = (ANGLE_OPEN_RE.sub("", ANGLE_CLOSE_RE.sub("", ln)) for ln in lines)
+    yield from _grouped_sub(lines, ANGLE_PAIR_RE,
+                            lambda ln, grouped: bool(ANGLE_PAIR_OPEN_RE.search(ln)) or (grouped and _blank(ln)))
+
+
+def _drop_toc(lines: Iterable[str]) -> Iterator[str]:
+    """
+    First 'table of contents' line (with the blank lines around it) up to the next
+    blank-line run becomes two empty lines, as re.split does on the whole text.
+    """
+    it = _with_last(lines)
+    pending: List[str] = []
+    for ln, last in it:
+        if _blank(ln):
+            pending.append(ln)
+            continue
+        if TOC_LINE_RE.fullmatch(ln):
+            break
+        yield from pending
+        pending = []
+        yield ln
+    else:
+        yield from pending
+        return
+
+    # Blank lines right after the heading belong to the match
+    for ln, last in it:
+        if not _blank(ln):
+            break
+    else:
+        yield from ("", "", "")
+        return
+    if last:
+        yield from ("", "", "")
+        return
+    # Skip to the first blank-line run that is followed by another line
+    for ln, last in it:
+        if _blank(ln) and not last:
+            break
+    else:
+        yield from ("", "", "")
+        return
+    for ln, last in it:
+        if _blank(ln) and not last:
+            continue
+        yield from ("", "")
+        yield ln
+        break
+    for ln, _ in it:
+        yield ln
+
+
+def _cut_legislative_history(lines: Iterable[str]) -> Iterator[str]:
+    pending: List[str] = []
+    for ln in lines:
+        if _blank(ln):
+            pending.append(ln)
+            continue
+        if LEG_HISTORY_LINE_RE.match(ln):
+            yield ""
+            return
+        yield from pending
+        pending = []
+        yield ln
+    yield from pending
+
+
+QUOTE_CHARS = "'\"“”"
+
+
+def _clean_lines(lines: Iterable[str]) -> Iterator[str]:
+    # Lines are already split (no line breaks left after _drop_headers_and_tags); a trailing
+    # empty line, which a re-split would drop, is dropped by _collapse_blank_runs anyway.
+    for ln in lines:
+        ln = ln.strip()
+        if not ln:
+            yield ""
+            continue
+        if ln[0] in QUOTE_CHARS or ln[-1] in QUOTE_CHARS:
+            ln = _strip_leading_trailing_quotes(ln)
+        yield _normalize_heading_punct(ln) if ln.endswith("—") else ln
+
+
+def _merge_preserving_structure(lines: Iterable[str]) -> Iterator[str]:
+    # Input lines come stripped from _clean_lines
+    buf: List[str] = []
+    for ln in lines:
+        if not ln:
+            if buf:
+                yield " ".join(buf); buf = []
+            yield ""
+            continue
+        if SEC_LINE_RE.match(ln) or SUBSECTION_LINE_RE.match(ln):
+            if buf:
+                yield " ".join(buf); buf = []
+            yield ln
+        else:
+            buf.append(ln)
+    if buf:
+        yield " ".join(buf)
+
+
+def _collapse_blank_runs(lines: Iterable[str]) -> Iterator[str]:
+    """At most one empty line between paragraphs, none at the ends (then [ \\t]+ -> ' ')."""
+    started = gap = False
+    for ln in lines:
+        if not ln:
+            gap = started
+            continue
+        if gap:
+            yield ""
+            gap = False
+        started = True
+        yield SPACES_RE.sub(" ", ln) if ("  " in ln or "\t" in ln) else ln
+
+
+def clean_statute_text(raw: str, inline_tag_re: Pattern = INLINE_TAG_RE,
+                       strip_angle_brackets: bool = False) -> str:
+    lines: Iterable[str] = _iter_lines(raw)
+    lines = _grouped_sub(lines, PAGE_ARTIFACT_RE,
+                         lambda ln, grouped: ("[[" in ln and PAGE_OPEN_RE.search(ln) is not None)
+                         or (grouped and PAGE_CONT_RE.fullmatch(ln) is not None),
+                         may_match=lambda ln: "[[" in ln)
+    # A lone line can only be a divider if it is all divider/space (then it is grouped)
+    lines = _grouped_sub(lines, DECOR_DIVIDER_RE, lambda ln, grouped: DECOR_SPAN_RE.fullmatch(ln) is not None,
+                         may_match=lambda ln: False)
+    lines = _drop_headers_and_tags(lines, inline_tag_re)
+    if strip_angle_brackets:
+        lines = _strip_angles(lines)
+    lines = _drop_toc(lines)
+    lines = _cut_legislative_history(lines)
+    lines = (_standardize_quotes_dashes(ln) for ln in lines)
+    lines = _grouped_sub(lines, LINE_NUMBER_RE, lambda ln, grouped: LINE_NUMBER_SPAN_RE.fullmatch(ln) is not None,
+                         may_match=lambda ln: ln.lstrip()[:1].isdecimal())
+    lines = _clean_lines(lines)
+    lines = _merge_preserving_structure(lines)
+    return "\n".join(_collapse_blank_runs(lines))
+
+
+# =========================
+# Self-check + benchmark
+# =========================
+def _raw_corpus() -> List[Tuple[str, str]]:
+    docs = []
+    for p in sorted(glob.glob(os.path.join("cache", "bills", "raw", "*", "*.json"))):
+        with open(p, "r", encoding="utf-8") as f:
+            docs.append((os.path.basename(p)[:12], json.load(f)["value"]))
+    for p in sorted(glob.glob(os.path.join("bill_texts", "*.txt"))):
+        with open(p, "r", encoding="utf-8") as f:
+            docs.append((os.path.basename(p), f.read()))
+    return docs
+
+
+def synthetic_bill(base: str, pages: int, seed: int = 0) -> str:
+    """Raw-looking bill of `pages` pages built from real sentences plus the artifacts the rules target."""
+    rng = random.Random(seed)
+    words = base.split() or ["lorem"]
+    out = ["PUBLIC LAW 117-58", "An Act", "Be it enacted by the Senate and House of Representatives",
+           "Table of Contents", "Sec. 1. Short title.", "Sec. 2. Definitions.", "", "Sec. 1. Short title."]
+    sec = 1
+    for page in range(1, pages + 1):
+        out.append(f"[[Page {page} STAT. {1000 + page}]]")
+        for line_no in range(1, 41):
+            r = rng.random()
+            if r < 0.05:
+                sec += 1
+                out.append(f"{line_no} “Sec. {sec}. {' '.join(rng.sample(words, 4))}—")
+            elif r < 0.12:
+                out.append(f"({rng.choice('abcdefgh')}) {' '.join(rng.sample(words, 9))}")
+            elif r < 0.14:
+                out.append("DIVISION " + rng.choice("ABCDEFG") + "—GENERAL PROVISIONS")
+            elif r < 0.15:
+                out.append("-" * rng.randint(4, 40))
+            elif r < 0.16:
+                out.append(f"<<NOTE: {rng.randint(1, 99)} USC {rng.randint(1, 9999)}.>> " + " ".join(rng.sample(words, 6)))
+            else:
+                out.append(f"{line_no} " + " ".join(rng.sample(words, min(len(words), 12))))
+    out += ["Approved November 15, 2021.", "LEGISLATIVE HISTORY--H.R. 3684:", "CONGRESSIONAL RECORD, Vol. 167"]
+    return "\n".join(out)
+
+
+def fuzz_doc(rng: random.Random) -> str:
+    pieces = ["", " ", "\t", "  \t ", "12", " 7  ", "12345 x", "3 word", "----", " ==== ", "·····",
+              "[[", "[[ Page", "Page", "  Page ", "5 A]]", "[[Page 4]]", "<<", "<", "&lt;", ">", "&gt;",
+              "<<NOTE: x>>", "Table of Contents", "  table of CONTENTS ", "History of it", "HISTORY",
+              "LEGISLATIVE HISTORY--S. 1", "Sec. 3. Title—", "(a) In general—", "(ii) more",
+              "“Quoted line.”", "ALL CAPS HEADER", "SEC. 4. KEEP", "Approved May 1, 2020.",
+              "Be it enacted", "plain words here", "more words", "a\rb", "c\x0cd", "e f", "\r", "x\r",
+              "\x85", "\xa0", "Effective date <<Deadline 1>> x", "&lt;&gt;", "text >", "< text",
+              '"', "'x'", "(b) Sec. 2. x—”", "—", "x —\t", "tab\t\tand  spaces", "\u2028",
+              "one\x0c", "x\x85", "y\x1c", "z\u2028", "w\u2029", "v\x0b", "\x1d", "\x1e"]
+    return "\n".join(rng.choice(pieces) for _ in range(rng.randint(0, 40)))
+
+
+def _bench(fn, text: str, repeats: int) -> Tuple[float, int]:
+    tracemalloc.start()
+    fn(text)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    t0 = time.perf_counter()
+    for _ in range(repeats):
+        fn(text)
+    return (time.perf_counter() - t0) / repeats, peak
+
+
+def main(argv: Optional[List[str]] = None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--pages", type=int, nargs="+", default=[100, 1000], help="synthetic bill sizes")
+    ap.add_argument("--fuzz", type=int, default=500, help="random edge-case documents to compare")
+    ap.add_argument("--repeats", type=int, default=3)
+    args = ap.parse_args(argv)
+
+    corpus = _raw_corpus()
+    base = corpus[0][1] if corpus else "Sec. 1. Short title. This Act may be cited as the Example Act."
+    corpus += [(f"synthetic-{p}p", synthetic_bill(base, p)) for p in args.pages]
+    variants = [("api", {}), ("script", {"inline_tag_re": SCRIPT_INLINE_TAG_RE, "strip_angle_brackets": True})]
+
+    rng = random.Random(0)
+    for i in range(args.fuzz):
+        doc = fuzz_doc(rng)
+        for name, kw in variants:
+            if clean_statute_text(doc, **kw) != clean_statute_text_multipass(doc, **kw):
+                raise SystemExit(f"Mismatch ({name}) on fuzz document {i}: {doc!r}")
+    if args.fuzz:
+        print(f"✅ {args.fuzz} fuzz documents identical (both rule variants)")
+
+    print(f"{'document':<24} {'MB':>6} {'multipass MB/s':>15} {'peak MB':>8} {'stream MB/s':>12} {'peak MB':>8} {'same':>5}")
+    for name, raw in corpus:
+        mb = len(raw.encode("utf-8")) / 1e6
+        for variant, kw in variants:
+            same = clean_statute_text(raw, **kw) == clean_statute_text_multipass(raw, **kw)
+            if not same:
+                raise SystemExit(f"Mismatch ({variant}) on {name}")
+        t_old, p_old = _bench(lambda t: clean_statute_text_multipass(t), raw, args.repeats)
+        t_new, p_new = _bench(lambda t: clean_statute_text(t), raw, args.repeats)
+        print(f"{name:<24} {mb:>6.2f} {mb / t_old:>15.2f} {p_old / 1e6:>8.2f} {mb / t_new:>12.2f} {p_new / 1e6:>8.2f} {'yes':>5}")
+
+
+if __name__ == "__main__":
+    main()
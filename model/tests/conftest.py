@@ -0,0 +1,14 @@
+import os
+import sys
+import tempfile
+
+# the model modules are flat scripts run from model/
+MODEL_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, MODEL_DIR)
+os.chdir(MODEL_DIR)
+
+# caches and indexes opened at import (api_service, http_cache) go to a scratch dir, not model/cache
+_SCRATCH = tempfile.mkdtemp(prefix="insidertrader-tests-")
+for var, rel in (("HTTP_CACHE_DIR", "http"), ("BILL_CACHE_DIR", "bills"),
+                 ("SPONSOR_INDEX_PATH", "sponsor_index.sqlite"), ("MATCH_INDEX_PATH", "match_index.sqlite")):
+    os.environ.setdefault(var, os.path.join(_SCRATCH, rel))
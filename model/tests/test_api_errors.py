@@ -0,0 +1,52 @@
+import pytest
+
+pytest.importorskip("fastapi")
+api_service = pytest.importorskip("api_service")
+
+
+def test_redact_drops_query_strings():
+    exc = "500 Server Error: Internal for url: https://api.congress.gov/v3/bill/119/hr/1?api_key=SECRET&format=json"
+    out = api_service._redact(exc)
+    assert "SECRET" not in out
+    assert out.endswith("for url: https://api.congress.gov/v3/bill/119/hr/1")
+    assert api_service._redact("https://x.org/a?b=1 and 'https://y.org/c?api_key=k'") == "https://x.org/a and 'https://y.org/c'"
+
+
+def test_stale_log_has_no_api_key(capsys):
+    cached = {"fetched_at": 0, "status": 200, "headers": {}, "body": b"{}", "url": "u"}
+    api_service.HTTP_CACHE.serve_stale = lambda kind, entry: "stale"
+    try:
+        out = api_service._stale_or_raise("bill", "https://api.congress.gov/v3/bill?api_key=SECRET",
+                                          cached, RuntimeError("boom for url: https://h/p?api_key=SECRET"))
+    finally:
+        del api_service.HTTP_CACHE.serve_stale
+    assert out == "stale"
+    assert "SECRET" not in capsys.readouterr().out
+
+
+@pytest.fixture
+def client(monkeypatch):
+    from fastapi.testclient import TestClient
+    raised = {}
+
+    async def failing_aget(url, params=None, **kwargs):
+        raise raised["exc"]
+    monkeypatch.setattr(api_service, "_aget", failing_aget)
+
+    def get(path, exc):
+        raised["exc"] = exc
+        return TestClient(api_service.app).get(path)  # no lifespan: the model is not loaded
+    return get
+
+
+@pytest.mark.parametrize("path", ["/bill_info?bill_type=hr&bill_number=1", "/cosponsors?bill_type=hr&bill_number=1"])
+@pytest.mark.parametrize("exc, status", [
+    (api_service.BreakerOpen("api.congress.gov is down (circuit open)"), 503),
+    (api_service.StageTimeout("deadline exceeded"), 504),
+    (api_service.rate_budget.BudgetTimeout("no upstream budget"), 504),
+    (ValueError("no such bill"), 404),
+])
+def test_upstream_failures_map_to_status(client, path, exc, status):
+    r = client(path, exc)
+    assert r.status_code == status
+    assert "api_key" not in r.text
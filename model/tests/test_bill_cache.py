@@ -0,0 +1,69 @@
+import os
+import time
+
+import numpy as np
+import pytest
+
+from bill_cache import BillCache, POINTER_LAYER
+
+
+def _layer(cache):
+    return cache.stats()["layers"][POINTER_LAYER]
+
+
+def test_expired_version_pointer_counts_one_miss(tmp_path):
+    cache = BillCache(str(tmp_path), max_bytes=1 << 20, version_ttl=0.05)
+    assert cache.get_version(119, "hr", 1) is None
+    cache.put_version(119, "hr", 1, "2025-01-01", "txt", "https://example.org/hr1.txt")
+    assert cache.get_version(119, "hr", 1)["format"] == "txt"
+    time.sleep(0.1)
+    assert cache.get_version(119, "hr", 1) is None
+    s = _layer(cache)
+    assert (s["memory_hits"], s["disk_hits"], s["misses"]) == (1, 0, 2)
+    assert s["hit_ratio"] == round(1 / 3, 4)
+
+
+def test_disk_sweep_keeps_recently_used(tmp_path):
+    cache = BillCache(str(tmp_path), max_bytes=0, version_ttl=60, disk_max_bytes=10 * 8192)
+    emb = np.zeros(2000, dtype=np.float32)  # ~8 kB per file
+    for i in range(8):
+        cache.put("qemb", f"{i:02d}" * 32, emb)
+    old = time.time() - 3600
+    for i in range(8):
+        os.utime(cache._path("qemb", f"{i:02d}" * 32), (old + i, old + i))
+    assert cache.get("qemb", "00" * 32) is not None  # a disk hit makes it recent again
+    for i in range(8, 14):
+        cache.put("qemb", f"{i:02d}" * 32, emb)
+    cache._sweeping.acquire()  # wait for a background sweep
+    cache._sweeping.release()
+    cache.sweep()
+    assert cache.disk_bytes <= cache.disk_max_bytes * 0.9
+    assert cache.disk_evictions > 0
+    assert cache.get("qemb", "00" * 32) is not None
+    assert cache.get("qemb", "01" * 32) is None
+
+
+def test_unbounded_disk_is_never_swept(tmp_path):
+    cache = BillCache(str(tmp_path), max_bytes=0, version_ttl=60)
+    for i in range(20):
+        cache.put("qemb", f"{i:02d}" * 32, np.zeros(2000, dtype=np.float32))
+    assert cache.disk_bytes is None
+    assert all(cache.get("qemb", f"{i:02d}" * 32) is not None for i in range(20))
+
+
+def test_cached_query_embeddings_do_not_pin_the_batch(tmp_path, monkeypatch):
+    api_service = pytest.importorskip("api_service")
+
+    class Model:
+        name = "fake"
+
+        def encode(self, texts, **kwargs):
+            return np.ones((len(texts), 8), np.float32)
+
+    cache = BillCache(str(tmp_path), max_bytes=1 << 20, version_ttl=60)
+    monkeypatch.setattr(api_service, "BILL_CACHE", cache)
+    monkeypatch.setattr(api_service.app.state, "model", Model(), raising=False)
+    api_service.encode_queries(["a", "b", "c"])
+    for text in "abc":
+        e = cache.get("qemb", api_service.text_key("fake", text))
+        assert e.shape == (8,) and e.base is None  # a view would keep the (3 x 8) batch alive
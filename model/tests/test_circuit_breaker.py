@@ -0,0 +1,115 @@
+import asyncio
+
+import pytest
+
+import circuit_breaker
+from circuit_breaker import CircuitBreaker, CLOSED, OPEN, HALF_OPEN
+
+
+def _tripped(host="h", cooldown=30.0):
+    b = CircuitBreaker(host, failures=2, cooldown=cooldown)
+    b.record_failure()
+    b.record_failure()
+    return b
+
+
+def test_opens_after_consecutive_failures_only():
+    b = CircuitBreaker("h", failures=2, cooldown=30)
+    b.record_failure()
+    b.record_success()
+    b.record_failure()
+    assert b.state == CLOSED and b.allow()
+    b.record_failure()
+    assert b.state == OPEN
+    assert not b.allow()
+    assert b.status()["trips"] == 1 and b.status()["rejected"] == 1
+
+
+def test_half_open_lets_one_probe_through():
+    b = _tripped(cooldown=0.0)
+    assert b.allow()
+    assert b.state == HALF_OPEN
+    assert not b.allow()  # the probe is still out
+    b.record_success()
+    assert b.state == CLOSED and b.allow()
+
+
+def test_failed_probe_reopens():
+    b = _tripped(cooldown=0.0)
+    assert b.allow()
+    b.record_failure()
+    assert b.state == OPEN and b.status()["trips"] == 2
+
+
+def test_released_probe_frees_the_slot():
+    b = _tripped(cooldown=0.0)
+    assert b.allow()
+    b.release()  # e.g. no upstream budget: the probe never went out
+    assert b.allow()
+
+
+def test_no_hedging_while_not_closed():
+    b = CircuitBreaker("h", failures=1)
+    for _ in range(circuit_breaker.HEDGE_MIN_SAMPLES):
+        b.record_success(0.2)
+    assert b.hedge_delay() == pytest.approx(0.2)
+    b.record_failure()
+    assert b.hedge_delay() is None
+
+
+@pytest.mark.parametrize("path", ["/bill_info?bill_type=hr&bill_number=1", "/cosponsors?bill_type=hr&bill_number=1"])
+def test_open_breaker_is_a_503_without_an_upstream_call(monkeypatch, tmp_path, path):
+    pytest.importorskip("fastapi")
+    api_service = pytest.importorskip("api_service")
+    from fastapi.testclient import TestClient
+    from http_cache import HttpCache
+
+    sent = []
+    monkeypatch.setattr(api_service, "_asend", lambda *a, **k: sent.append(a))
+    monkeypatch.setattr(api_service, "HTTP_CACHE", HttpCache(str(tmp_path / "http")))  # nothing stale to serve
+    monkeypatch.setattr(circuit_breaker, "BREAKERS", {"api.congress.gov": _tripped("api.congress.gov")})
+    r = TestClient(api_service.app).get(path)
+    assert r.status_code == 503
+    assert "circuit open" in r.json()["detail"]
+    assert sent == []
+
+
+def test_open_breaker_serves_the_stale_entry(monkeypatch, tmp_path):
+    pytest.importorskip("fastapi")
+    api_service = pytest.importorskip("api_service")
+    from fastapi.testclient import TestClient
+    from http_cache import HttpCache
+
+    cache = HttpCache(str(tmp_path / "http"))
+    stale = {"fetched_at": 0, "status": 200, "headers": {"Content-Type": "application/json"},
+             "body": '{"bill": {"title": "Stale title"}}', "url": "https://api.congress.gov/v3/bill/119/hr/1"}
+
+    async def alookup(url, params=None):
+        return "bill", stale, False
+    monkeypatch.setattr(cache, "alookup", alookup)
+    monkeypatch.setattr(api_service, "HTTP_CACHE", cache)
+    monkeypatch.setattr(circuit_breaker, "BREAKERS", {"api.congress.gov": _tripped("api.congress.gov")})
+    r = TestClient(api_service.app).get("/bill_info?bill_type=hr&bill_number=1")
+    assert r.status_code == 200
+    assert r.json()["title"] == "Stale title"
+    assert cache.stats()["kinds"]["bill"]["stale_served"] == 1
+
+
+def test_hedged_request_wins_over_a_slow_first_attempt(monkeypatch):
+    api_service = pytest.importorskip("api_service")
+
+    b = CircuitBreaker("example.org")
+    for _ in range(circuit_breaker.HEDGE_MIN_SAMPLES):
+        b.record_success(0.01)
+    calls = []
+
+    async def aget(url, params=None, timeout=None, headers=None):
+        calls.append(url)
+        if len(calls) == 1:
+            await asyncio.sleep(5)
+            return "slow"
+        return "hedge"
+    monkeypatch.setattr(api_service.http_client, "aget", aget)
+    assert asyncio.run(api_service._asend("https://example.org/x", None, 10.0, None, b)) == "hedge"
+    assert len(calls) == 2
+    assert b.status()["hedged"] == 1 and b.status()["hedge_wins"] == 1
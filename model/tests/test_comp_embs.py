@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+api_service = pytest.importorskip("api_service")
+
+
+class NoEncoder:
+    def get(self, name):
+        raise AssertionError(f"{name} requested: company embeddings were re-encoded")
+
+
+def test_missing_quantized_copy_falls_back_to_float32(tmp_path, monkeypatch, capsys):
+    embs = np.eye(4, 8, dtype=np.float32)
+    path = str(tmp_path / "company_embeddings.npy")
+    np.save(path, embs)
+    monkeypatch.setattr(api_service, "COMP_EMB_PATH", path)
+    monkeypatch.setattr(api_service, "COMP_EMB_PRECISION", "int8")
+    monkeypatch.setattr(api_service, "STARTUP", NoEncoder())
+
+    store = api_service._load_comp_embs()
+    assert np.array_equal(store.matmul(embs[:1]), embs[:1] @ embs.T)
+    assert "using the float32 embeddings" in capsys.readouterr().out
+
+
+def test_stale_quantized_copy_falls_back_to_float32(tmp_path, monkeypatch, capsys):
+    from embedding_store import save_quantized
+    path = str(tmp_path / "company_embeddings.npy")
+    save_quantized(np.eye(4, 8, dtype=np.float32)[::-1].copy(), "int8", path)  # an earlier company set
+    embs = np.eye(4, 8, dtype=np.float32)
+    np.save(path, embs)
+    monkeypatch.setattr(api_service, "COMP_EMB_PATH", path)
+    monkeypatch.setattr(api_service, "ARTIFACT_DIR", str(tmp_path))
+    monkeypatch.setattr(api_service, "COMP_EMB_PRECISION", "int8")
+    monkeypatch.setattr(api_service, "STARTUP", NoEncoder())
+
+    store = api_service._load_comp_embs()
+    assert store.precision == "float32"
+    assert np.array_equal(store.matmul(embs[:1]), embs[:1] @ embs.T)
+    assert "was built from other embeddings" in capsys.readouterr().out
+
+
+def test_current_quantized_copy_is_served(tmp_path, monkeypatch):
+    from embedding_store import save_quantized
+    path = str(tmp_path / "company_embeddings.npy")
+    embs = np.eye(4, 8, dtype=np.float32)
+    np.save(path, embs)
+    save_quantized(embs, "int8", path)
+    monkeypatch.setattr(api_service, "COMP_EMB_PATH", path)
+    monkeypatch.setattr(api_service, "ARTIFACT_DIR", str(tmp_path))
+    monkeypatch.setattr(api_service, "COMP_EMB_PRECISION", "int8")
+    monkeypatch.setattr(api_service, "STARTUP", NoEncoder())
+
+    assert api_service._load_comp_embs().precision == "int8"
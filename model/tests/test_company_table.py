@@ -0,0 +1,25 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+from company_table import CompanyTable, top_k_indices
+
+
+def test_top_k_skips_unscored_rows():
+    scores = np.full(10, -np.inf)
+    scores[[2, 5, 7]] = [0.1, 0.3, 0.2]
+    assert top_k_indices(scores, 5).tolist() == [5, 7, 2]
+
+
+def test_top_k_matches_nlargest_order():
+    scores = np.array([0.2, 0.5, 0.5, 0.1, 0.4])
+    assert top_k_indices(scores, 3).tolist() == [1, 2, 4]
+
+
+def test_top_records_are_json_safe():
+    df = pd.DataFrame({"ticker": list("ABCD"), "name": list("abcd"), "sector": ["s"] * 4, "industry": ["i"] * 4})
+    scores = np.array([-np.inf, 0.4, -np.inf, 0.1])
+    rows = CompanyTable(df).top_records(scores, 5)
+    assert [r["ticker"] for r in rows] == ["B", "D"]
+    json.dumps(rows, allow_nan=False)
@@ -0,0 +1,40 @@
+import json
+import sys
+import types
+
+import numpy as np
+import pytest
+
+import encoder
+
+
+@pytest.fixture
+def onnx_dir(tmp_path, monkeypatch):
+    # an export directory; the tokenizer and the session are never used by these tests
+    fake = types.ModuleType("transformers")
+    fake.AutoTokenizer = types.SimpleNamespace(from_pretrained=lambda path: object())
+    monkeypatch.setitem(sys.modules, "transformers", fake)
+    d = tmp_path / "all-mpnet-base-v2"
+    d.mkdir()
+    (d / "model.onnx").write_bytes(b"")
+    (d / encoder.EXPORT_META).write_text(json.dumps({"model_name": "all-mpnet-base-v2", "dim": 768}))
+    return d
+
+
+def test_encode_nothing_has_the_embedding_width(onnx_dir):
+    out = encoder.OnnxEncoder(str(onnx_dir)).encode([])
+    assert out.shape == (0, 768) and out.dtype == np.float32
+
+
+def test_load_encoder_checks_the_exported_model(onnx_dir):
+    enc = encoder.load_encoder("onnx", "sentence-transformers/all-mpnet-base-v2", onnx_dir=str(onnx_dir))
+    assert enc.model_name == "all-mpnet-base-v2"
+    with pytest.raises(ValueError, match="not all-MiniLM-L6-v2"):
+        encoder.load_encoder("onnx", "all-MiniLM-L6-v2", onnx_dir=str(onnx_dir))
+
+
+def test_export_without_meta_is_named_by_its_directory(onnx_dir):
+    (onnx_dir / encoder.EXPORT_META).unlink()
+    with pytest.raises(ValueError):
+        encoder.load_encoder("onnx", "all-MiniLM-L6-v2", onnx_dir=str(onnx_dir))
+    assert encoder.load_encoder("onnx", "all-mpnet-base-v2", onnx_dir=str(onnx_dir)).model_name == "all-mpnet-base-v2"
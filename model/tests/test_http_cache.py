@@ -0,0 +1,44 @@
+import asyncio
+import threading
+
+import requests
+
+from http_cache import HttpCache
+
+URL = "https://api.congress.gov/v3/bill/119/hr/1"
+
+
+def _response(body=b'{"bill": {}}'):
+    r = requests.Response()
+    r.status_code = 200
+    r._content = body
+    r.headers["Content-Type"] = "application/json"
+    r.encoding = "utf-8"
+    return r
+
+
+def test_async_lookup_reads_disk_off_the_event_loop(tmp_path, monkeypatch):
+    HttpCache(str(tmp_path)).store("bill", URL, {"api_key": "k", "format": "json"}, _response())
+    cache = HttpCache(str(tmp_path))  # cold memory: the entry is on disk only
+    readers = []
+    read = cache._read
+    monkeypatch.setattr(cache, "_read", lambda key: readers.append(threading.current_thread()) or read(key))
+
+    async def main():
+        loop_thread = threading.current_thread()
+        first = await cache.alookup(URL, {"format": "json"})
+        second = await cache.alookup(URL, {"format": "json"})  # memory hit, answered in place
+        return loop_thread, first, second
+
+    loop_thread, (kind, entry, fresh), second = asyncio.run(main())
+    assert (kind, fresh) == ("bill", True) and entry["body"] == '{"bill": {}}'
+    assert second[1] == entry
+    assert len(readers) == 1 and readers[0] is not loop_thread
+    stats = cache.stats()["kinds"]["bill"]
+    assert (stats["disk_hits"], stats["memory_hits"], stats["misses"]) == (1, 1, 0)
+
+
+def test_async_store_writes_the_entry(tmp_path):
+    cache = HttpCache(str(tmp_path))
+    asyncio.run(cache.astore("bill", URL, {"format": "json"}, _response()))
+    assert HttpCache(str(tmp_path)).lookup(URL, {"format": "json"})[2]
@@ -0,0 +1,32 @@
+import asyncio
+import importlib.util
+
+import pytest
+
+import http_client
+
+HAS_H2 = importlib.util.find_spec("h2") is not None
+
+
+def _pool_http2(monkeypatch, on):
+    monkeypatch.setattr(http_client, "HTTP2", on)
+
+    async def build():
+        hc = http_client._HostClients(4)
+        try:
+            return [c._transport._pool._http2 for c in hc.clients]
+        finally:
+            await hc.aclose()
+    return asyncio.run(build())
+
+
+@pytest.mark.skipif(not HAS_H2, reason="h2 not installed (httpx[http2])")
+def test_async_clients_offer_http2(monkeypatch):
+    assert _pool_http2(monkeypatch, True) == [True]
+
+
+def test_http2_off_without_h2_or_when_disabled(monkeypatch):
+    if not HAS_H2:
+        assert http_client.HTTP2 is False
+    assert _pool_http2(monkeypatch, False) == [False]
+    assert "http2" in http_client.stats()["total"]
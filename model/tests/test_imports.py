@@ -0,0 +1,14 @@
+import subprocess
+import sys
+
+import pytest
+
+
+@pytest.mark.parametrize("module", ["top5companies"])
+def test_import_does_not_load_the_encoder_library(module):
+    # the encoder (encoder.load_encoder) imports sentence-transformers / onnxruntime when it is built
+    code = f"import sys, {module}; print('sentence_transformers' in sys.modules)"
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    if out.returncode and "ModuleNotFoundError" in out.stderr:
+        pytest.skip(out.stderr.strip().splitlines()[-1])
+    assert out.stdout.strip() == "False", out.stderr
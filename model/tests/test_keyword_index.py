@@ -0,0 +1,26 @@
+import numpy as np
+
+from keyword_index import KeywordIndex, keyword_prior_scores_scan
+
+TEXTS = ["Oil and gas exploration", "Natural gas pipelines", "Homebuilder", "Gas stations and convenience",
+         "Solar panels", "Oil refining", "Beer brewing", "gas"]
+TERMS = {"gas": 1.9, "oil": 1.5, "natural gas": 1.2, "solar": 1.1, "zz": 1.0}
+
+
+def test_scores_match_the_scan():
+    assert np.array_equal(KeywordIndex(TEXTS).scores(TERMS), keyword_prior_scores_scan(TEXTS, TERMS))
+
+
+def test_scores_subset_equals_gathered_scores():
+    index = KeywordIndex(TEXTS)
+    full = index.scores(TERMS)
+    for ids in ([0, 1, 2], [7, 3, 0], [5], [], list(range(len(TEXTS)))[::-1]):
+        ids = np.asarray(ids, dtype=np.intp)
+        assert np.array_equal(index.scores_subset(TERMS, ids), full[ids])
+
+
+def test_dynamic_terms_weights():
+    from keyword_index import extract_dynamic_terms
+    terms = extract_dynamic_terms("Oil and gas. Oil drilling, oil-and-gas leases; gas", top_ngrams=3)
+    assert terms == {"oil": 2.0, "gas": 2.0, "and": 1.5}  # "oil-and-gas" is one token
+    assert extract_dynamic_terms("a b") == {}
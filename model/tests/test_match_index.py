@@ -0,0 +1,44 @@
+import sqlite3
+
+from match_index import MatchIndex, MATCHED, SCHEMA_VERSION
+
+
+def _bill(congress, update_date="2025-01-01"):
+    return {"bill_id": "HR.1", "congress": congress, "bill_type": "hr", "bill_number": 1,
+            "title": f"HR 1 ({congress})", "update_date": update_date, "content_key": f"k{congress}"}
+
+
+def _match(ticker, score):
+    return {"ticker": ticker, "hybrid_score": score, "dense": 0.0, "tfidf": 0.0, "keyword": 0.0,
+            "industry_boost": 0.0}
+
+
+def test_same_bill_id_in_two_congresses(tmp_path):
+    index = MatchIndex(str(tmp_path / "m.sqlite"))
+    index.put_matches(_bill(118), [_match("NVR", 0.5)])
+    index.put_matches(_bill(119), [_match("PHM", 0.4)])
+
+    assert index.known_bills(118)["HR.1"]["content_key"] == "k118"
+    assert index.known_bills(119)["HR.1"]["status"] == MATCHED
+    assert [(b["bill_id"], b["congress"]) for b in index.bills_for_ticker("NVR")] == [("HR.1", 118)]
+    assert [(b["bill_id"], b["congress"]) for b in index.bills_for_ticker("PHM")] == [("HR.1", 119)]
+
+    index.touch(119, ["HR.1"], ["2025-06-01"])
+    assert index.known_bills(118)["HR.1"]["update_date"] == "2025-01-01"
+    assert index.known_bills(119)["HR.1"]["update_date"] == "2025-06-01"
+
+
+def test_old_schema_is_rebuilt(tmp_path):
+    path = str(tmp_path / "m.sqlite")
+    with sqlite3.connect(path) as db:
+        db.executescript("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);"
+                         "INSERT INTO meta VALUES ('schema_version', '1');"
+                         "CREATE TABLE bills (bill_id TEXT PRIMARY KEY, congress INTEGER NOT NULL);"
+                         "CREATE TABLE matches (bill_id TEXT NOT NULL, rank INTEGER NOT NULL);")
+    assert not MatchIndex(path, readonly=True).exists()
+
+    index = MatchIndex(path)
+    assert index.exists()
+    assert index._schema_version(index._conn()) == SCHEMA_VERSION
+    index.put_matches(_bill(119), [_match("NVR", 0.5)])
+    assert index.known_bills(119)["HR.1"]["status"] == MATCHED
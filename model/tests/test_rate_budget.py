@@ -0,0 +1,80 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from rate_budget import TokenBucket, INTERACTIVE, NORMAL, BACKGROUND
+
+
+@pytest.mark.parametrize("fraction", [1.0, 1 / 4, 1 / 28, 1 / 64])
+@pytest.mark.parametrize("prio", [INTERACTIVE, NORMAL, BACKGROUND])
+def test_every_priority_acquires_after_share(fraction, prio):
+    bucket = TokenBucket("t", rate_per_hour=36000, burst=40, max_wait=2)
+    bucket.share(fraction)
+    assert bucket.acquire(prio, timeout=2)
+
+
+def test_reserve_kept_for_higher_classes():
+    bucket = TokenBucket("t", rate_per_hour=0, burst=10)
+    granted = sum(bucket.try_acquire(BACKGROUND) for _ in range(10))
+    assert granted == 7  # 30% of the burst left for normal / interactive
+    assert bucket.try_acquire(INTERACTIVE)
+
+
+def _drained(rate_per_hour: float) -> TokenBucket:
+    bucket = TokenBucket("t", rate_per_hour=rate_per_hour, burst=1, max_wait=10)
+    assert bucket.try_acquire(INTERACTIVE)
+    return bucket
+
+
+def test_cancelled_async_waiter_takes_no_token():
+    async def main():
+        bucket = _drained(3600)  # next token in 1 s
+        task = asyncio.ensure_future(bucket.acquire_async(NORMAL))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        await asyncio.sleep(1.2)
+        assert bucket.granted == [1, 0, 0]
+        assert bucket.status()["waiting"] == {"interactive": 0, "normal": 0, "background": 0}
+        assert bucket.try_acquire(NORMAL)  # the refilled token is still there
+
+    asyncio.run(main())
+
+
+def test_async_waiters_served_by_priority():
+    async def main():
+        bucket = _drained(4 * 3600)  # a token every 0.25 s
+        order = []
+
+        async def waiter(name, prio):
+            assert await bucket.acquire_async(prio)
+            order.append(name)
+
+        tasks = [asyncio.ensure_future(waiter(f"bg{i}", BACKGROUND)) for i in range(8)]
+        await asyncio.sleep(0.01)
+        t0 = time.monotonic()
+        await waiter("interactive", INTERACTIVE)
+        assert time.monotonic() - t0 < 0.5
+        assert order[0] == "interactive"
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    asyncio.run(main())
+
+
+def test_thread_and_async_waiters_share_the_queue():
+    bucket = _drained(10 * 3600)
+    results = []
+    t = threading.Thread(target=lambda: results.append(bucket.acquire(BACKGROUND, timeout=2)))
+    t.start()
+
+    async def main():
+        return await bucket.acquire_async(INTERACTIVE, timeout=2)
+
+    assert asyncio.run(main())
+    t.join()
+    assert results == [True]
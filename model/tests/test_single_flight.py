@@ -0,0 +1,112 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from single_flight import SingleFlight, AsyncSingleFlight, FlightTimeout
+
+
+class LeaderDeadline(RuntimeError):
+    pass
+
+
+def _leader_then_follower(group, leader_fn, follower_fn, **follower_kwargs):
+    """Start a leader running leader_fn, then a follower for the same key; returns both outcomes."""
+    started = threading.Event()
+    out = {}
+
+    def lead():
+        def fn():
+            started.set()
+            return leader_fn()
+        try:
+            out["leader"] = group.do("k", fn)
+        except Exception as e:
+            out["leader"] = e
+
+    t = threading.Thread(target=lead)
+    t.start()
+    started.wait(2)
+    try:
+        out["follower"] = group.do("k", follower_fn, **follower_kwargs)
+    except Exception as e:
+        out["follower"] = e
+    t.join(5)
+    return out
+
+
+def test_follower_shares_the_result():
+    group = SingleFlight("t_share")
+    out = _leader_then_follower(group, lambda: time.sleep(0.2) or "x", lambda: "never")
+    assert out == {"leader": "x", "follower": "x"}
+    assert group.stats()["coalesced"] == 1
+
+
+def test_follower_shares_other_errors():
+    group = SingleFlight("t_error")
+
+    def boom():
+        time.sleep(0.2)
+        raise ValueError("upstream said no")
+    out = _leader_then_follower(group, boom, lambda: "never", retry=(LeaderDeadline,))
+    assert isinstance(out["follower"], ValueError)
+
+
+def test_follower_retries_on_the_leaders_deadline():
+    group = SingleFlight("t_retry")
+
+    def leader_times_out():
+        time.sleep(0.2)
+        raise LeaderDeadline("leader's deadline")
+    out = _leader_then_follower(group, leader_times_out, lambda: "mine", retry=(LeaderDeadline,), timeout=5)
+    assert isinstance(out["leader"], LeaderDeadline)
+    assert out["follower"] == "mine"
+    assert group.stats()["retried"] == 1
+
+
+def test_follower_without_timeout_retries_once():
+    group = SingleFlight("t_once")
+    calls = []
+
+    def also_times_out():
+        calls.append(1)
+        raise LeaderDeadline("again")
+
+    def leader_times_out():
+        time.sleep(0.2)
+        raise LeaderDeadline("leader's deadline")
+    out = _leader_then_follower(group, leader_times_out, also_times_out, retry=(LeaderDeadline,))
+    assert isinstance(out["follower"], LeaderDeadline)
+    assert calls == [1]
+
+
+def test_follower_timeout_bounds_only_its_own_wait():
+    group = SingleFlight("t_timeout")
+    t0 = time.monotonic()
+    out = _leader_then_follower(group, lambda: time.sleep(0.5) or "x", lambda: "never", timeout=0.1)
+    assert isinstance(out["follower"], FlightTimeout)
+    assert out["leader"] == "x"
+    assert time.monotonic() - t0 >= 0.5
+
+
+def test_async_follower_retries_on_the_leaders_deadline():
+    group = AsyncSingleFlight("t_async_retry")
+
+    async def leader_times_out():
+        await asyncio.sleep(0.2)
+        raise LeaderDeadline("leader's deadline")
+
+    async def mine():
+        return "mine"
+
+    async def main():
+        leader = asyncio.ensure_future(group.do("k", leader_times_out, retry=(LeaderDeadline,)))
+        await asyncio.sleep(0.05)
+        follower = await group.do("k", mine, retry=(LeaderDeadline,), timeout=5)
+        with pytest.raises(LeaderDeadline):
+            await leader
+        return follower
+
+    assert asyncio.run(main()) == "mine"
+    assert group.stats()["retried"] == 1
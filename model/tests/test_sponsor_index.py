@@ -0,0 +1,39 @@
+import asyncio
+
+import sponsor_index
+from sponsor_index import SponsorIndex
+
+
+def _listing(n):
+    return [{"congress": 119, "type": "HR", "number": i, "title": f"Bill {i}",
+             "introducedDate": f"2025-01-{i:02d}", "latestAction": {"actionDate": "2025-02-01", "text": "Introduced"}}
+            for i in range(1, n + 1)]
+
+
+def test_abootstrap_member_pages_through_the_listing(tmp_path, monkeypatch):
+    monkeypatch.setattr(sponsor_index, "PAGE_SIZE", 2)
+    items = _listing(5)
+    calls = []
+
+    async def fetch_json(url, params):
+        calls.append(params["offset"])
+        await asyncio.sleep(0)
+        page = items[params["offset"]:params["offset"] + params["limit"]]
+        return {"sponsoredLegislation": page, "pagination": {"count": len(items)}}
+
+    index = SponsorIndex(str(tmp_path / "sponsor.sqlite"))
+    assert asyncio.run(sponsor_index.abootstrap_member(index, fetch_json, "p000197")) == 5
+    assert calls == [0, 2, 4]
+    rows, total = index.bills_for_member("P000197", 119, limit=2)
+    assert total == 5
+    assert [r["bill_number"] for r in rows] == [5, 4]
+    assert index.bootstrapped_at("P000197") is not None
+
+
+def test_cosponsor_count_unknown_until_a_detail_record(tmp_path):
+    index = SponsorIndex(str(tmp_path / "sponsor.sqlite"))
+    index.put_member("P000197", _listing(2), 0.0)
+    detail = dict(_listing(2)[1], sponsors=[{"bioguideId": "P000197"}], cosponsors={"count": 12})
+    index.put_bills([((119, "hr", 2), detail)])
+    rows, _ = index.bills_for_member("P000197", 119)
+    assert {r["bill_number"]: r["cosponsors_count"] for r in rows} == {2: 12, 1: None}
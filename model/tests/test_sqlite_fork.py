@@ -0,0 +1,52 @@
+import multiprocessing
+import os
+import threading
+
+import pytest
+
+from match_index import MatchIndex
+from sponsor_index import SponsorIndex
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "fork"), reason="fork() only")
+
+
+def _child(index, parent_db, write, queue):
+    try:
+        db = index._conn()
+        write(index)
+        queue.put((db is parent_db, index.summary() is not None))
+    except Exception as e:
+        queue.put(repr(e))
+
+
+def _match_write(index):
+    index.start_run()
+
+
+def _sponsor_write(index):
+    index.finish_sync(0.0, {})
+
+
+@pytest.mark.parametrize("cls, write", [(MatchIndex, _match_write), (SponsorIndex, _sponsor_write)])
+def test_forked_child_opens_its_own_connection(tmp_path, cls, write):
+    index = cls(str(tmp_path / "index.sqlite"))
+    parent_db = index._conn()  # opened before fork, like serve.py's parent importing api_service
+    ctx = multiprocessing.get_context("fork")
+    queue = ctx.Queue()
+    p = ctx.Process(target=_child, args=(index, parent_db, write, queue))
+    p.start()
+    result = queue.get(timeout=10)
+    p.join(10)
+    assert result == (False, True)
+    assert p.exitcode == 0
+    assert index._conn() is parent_db  # the parent keeps its own
+    index.summary()
+
+
+def test_connection_per_thread(tmp_path):
+    index = MatchIndex(str(tmp_path / "m.sqlite"))
+    seen = []
+    t = threading.Thread(target=lambda: seen.append(index._conn()))
+    t.start()
+    t.join()
+    assert seen[0] is not index._conn()
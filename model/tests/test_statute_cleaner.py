@@ -0,0 +1,26 @@
+import random
+
+import pytest
+
+from statute_cleaner import (SCRIPT_INLINE_TAG_RE, _splitlines, clean_statute_text,
+                             clean_statute_text_multipass, fuzz_doc)
+
+VARIANTS = [{}, {"inline_tag_re": SCRIPT_INLINE_TAG_RE, "strip_angle_brackets": True}]
+
+
+@pytest.mark.parametrize("text", ["one\x0c\ntwo", "a\n\x85\nb", "one\x0c\n", "x \n\ny", "a\r\nb",
+                                  "\x1c\n\x1d\n", "c\x0cd\ne\x0b\nf", ""])
+def test_splitlines_matches_whole_text(text):
+    assert list(_splitlines(text.split("\n"))) == text.splitlines()
+
+
+@pytest.mark.parametrize("kw", VARIANTS)
+def test_single_pass_matches_multipass_on_fuzz(kw):
+    rng = random.Random(12)
+    for _ in range(2000):
+        doc = fuzz_doc(rng)
+        assert clean_statute_text(doc, **kw) == clean_statute_text_multipass(doc, **kw), repr(doc)
+
+
+def test_other_line_boundary_keeps_lines_apart():
+    assert clean_statute_text("one\x0c\ntwo") == clean_statute_text_multipass("one\x0c\ntwo") == "one\n\ntwo"
@@ -0,0 +1,85 @@
+import json
+import os
+
+import pytest
+
+pytest.importorskip("fastapi")
+api_service = pytest.importorskip("api_service")
+
+import http_client
+import upstream_sim
+from http_cache import HttpCache
+from sponsor_index import SponsorIndex
+
+# synthetic fixtures (upstream_sim's own answers, not a Congress.gov recording): these tests
+# cover strict-mode replay through the endpoints, not real response shapes
+FIXTURES = os.path.join("fixtures", "upstream")
+
+
+def _fixture_body(route):
+    folder = os.path.join(FIXTURES, route)
+    (name,) = os.listdir(folder)
+    with open(os.path.join(folder, name), "r", encoding="utf-8") as f:
+        return json.loads(json.load(f)["body"])
+
+
+@pytest.fixture
+def sim(monkeypatch, tmp_path):
+    """The app against upstream_sim in strict mode: the fixture files or 404, never generated data."""
+    from fastapi.testclient import TestClient
+    simulator = upstream_sim.Simulator(fixtures_dir=FIXTURES, strict=True)
+    srv = upstream_sim.start(simulator)
+    monkeypatch.setattr(http_client, "UPSTREAM_OVERRIDE", f"http://127.0.0.1:{srv.server_port}")
+    monkeypatch.setattr(api_service, "HTTP_CACHE", HttpCache(str(tmp_path / "http")))
+    monkeypatch.setattr(api_service, "SPONSOR_INDEX", SponsorIndex(str(tmp_path / "sponsor.sqlite")))
+    try:
+        yield TestClient(api_service.app), simulator  # no lifespan: the model is not loaded
+    finally:
+        srv.shutdown()
+        srv.server_close()
+
+
+def test_bill_info_from_fixture(sim):
+    client, _ = sim
+    r = client.get("/bill_info?bill_type=hr&bill_number=1&congress=119")
+    assert r.status_code == 200
+    bill = _fixture_body("bill")["bill"]
+    assert r.json()["title"] == bill["title"]
+    assert r.json()["cosponsors_count"] == bill["cosponsors"]["count"]
+
+
+def test_cosponsors_from_fixture(sim):
+    client, _ = sim
+    r = client.get("/cosponsors?bill_type=hr&bill_number=1&congress=119")
+    assert r.status_code == 200
+    expected = [c["bioguideId"] for c in _fixture_body("cosponsors")["cosponsors"]]
+    assert [c["bioguide_id"] for c in r.json()["cosponsors"]] == expected
+
+
+def test_recent_bills_from_fixture(sim):
+    client, _ = sim
+    r = client.get("/recent_bills?limit=3")
+    assert r.status_code == 200
+    listing = _fixture_body("listing")["bills"]
+    assert r.json()["count"] == len(listing)
+    assert len(r.json()["results"]) == 3
+    assert {b["title"] for b in r.json()["results"]} <= {b["title"] for b in listing}
+
+
+def test_member_bills_bootstrap_from_fixture(sim):
+    client, _ = sim
+    r = client.get("/member_bills?bioguide_id=a000100&limit=10")
+    assert r.status_code == 200
+    listing = _fixture_body("member_bills")["sponsoredLegislation"]
+    assert r.json()["total"] == sum(1 for b in listing if b["congress"] == api_service.CONGRESS)
+    assert {b["title"] for b in r.json()["bills"]} <= {b["title"] for b in listing}
+    assert all(b["cosponsors_count"] is None for b in r.json()["bills"])  # the listing has no count
+
+
+def test_url_without_a_fixture_is_a_404_and_nothing_is_generated(sim):
+    client, simulator = sim
+    assert client.get("/bill_info?bill_type=hr&bill_number=9999&congress=119").status_code == 404
+    client.get("/bill_info?bill_type=hr&bill_number=1&congress=119")
+    stats = simulator.stats()
+    assert stats["routes"]["bill"]["fixture"] >= 1
+    assert all(s["synthetic"] == 0 for s in stats["routes"].values())
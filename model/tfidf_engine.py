@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+import os
+import pickle
+from typing import List, Optional
+
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.preprocessing import normalize as sk_normalize
+
+# =========================
+# Config
+# =========================
+ARTIFACT_DIR = "artifacts"
+TFIDF_VECT_PATH   = os.path.join(ARTIFACT_DIR, "tfidf_vectorizer.pkl")
+TFIDF_MATRIX_PATH = os.path.join(ARTIFACT_DIR, "tfidf_matrix_norm.npz")
+
+# Same settings as precompute_companies.py and the original per-request fit
+TFIDF_PARAMS = {"min_df": 2, "ngram_range": (1, 2)}
+
+# "transform": query-only transform against the cached matrix (fast path)
+# "parity":    refit on comp_texts + query every call, exactly like the script
+TFIDF_MODES = ("transform", "parity")
+
+
+# =========================
+# Scoring
+# =========================
+def tfidf_sims_refit(comp_texts: List[str], query: str) -> np.ndarray:
+    """Original behaviour: fit on companies + query, cosine of each company vs query."""
+    vect = TfidfVectorizer(**TFIDF_PARAMS)
+    X = vect.fit_transform(comp_texts + [query])
+    D, q = X[:-1], X[-1]
+    D = sk_normalize(D); q = sk_normalize(q)
+    return (D @ q.T).toarray().ravel()
+
+
+class TfidfEngine:
+    """
+    Startup-loaded TF-IDF. The vectorizer and the L2-normalized company matrix come
+    from precompute_companies.py; a request only transforms the query and does one
+    sparse dot product. The refit path is kept for parity checks.
+    """
+
+    def __init__(self, vectorizer: TfidfVectorizer, matrix_norm: sparse.csr_matrix,
+                 comp_texts: Optional[List[str]] = None):
+        self.vectorizer = vectorizer
+        self.matrix_norm = sparse.csr_matrix(matrix_norm)
+        self.comp_texts = comp_texts
+
+    @classmethod
+    def load(cls, comp_texts: List[str],
+             vect_path: str = TFIDF_VECT_PATH,
+             matrix_path: str = TFIDF_MATRIX_PATH) -> "TfidfEngine":
+        """Load cached artifacts; fit once on comp_texts if they are missing or stale."""
+        if os.path.exists(vect_path) and os.path.exists(matrix_path):
+            with open(vect_path, "rb") as f:
+                vect = pickle.load(f)
+            D = sparse.load_npz(matrix_path).tocsr()
+            if D.shape[0] == len(comp_texts) and D.shape[1] == len(vect.vocabulary_):
+                return cls(vect, D, comp_texts)
+            print(f"[tfidf] cached matrix {D.shape} does not match {len(comp_texts)} companies; refitting")
+        return cls.fit(comp_texts)
+
+    @classmethod
+    def fit(cls, comp_texts: List[str]) -> "TfidfEngine":
+        vect = TfidfVectorizer(**TFIDF_PARAMS)
+        D = sk_normalize(vect.fit_transform(comp_texts))
+        return cls(vect, D, comp_texts)
+
+    def transform_queries(self, queries: List[str]) -> sparse.csr_matrix:
+        return sk_normalize(self.vectorizer.transform(queries))
+
+    def sims_matrix(self, queries: List[str], mode: str = "transform") -> np.ndarray:
+        """(queries x companies) cosine similarities; one sparse product in transform mode."""
+        if mode == "parity":
+            return np.vstack([self.sims(q, mode="parity") for q in queries])
+        if mode != "transform":
+            raise ValueError(f"Unknown TF-IDF mode: {mode}")
+        Q = self.transform_queries(queries)
+        return (Q @ self.matrix_norm.T).toarray()
+
+    def sims_subset(self, query: str, ids: np.ndarray, mode: str = "transform") -> np.ndarray:
+        """Cosine similarity of the companies in ids only (ANN candidates)."""
+        if mode == "parity":
+            return self.sims(query, mode="parity")[ids]
+        q = self.transform_queries([query])
+        return (self.matrix_norm[ids] @ q.T).toarray().ravel()
+
+    def sims(self, query: str, mode: str = "transform") -> np.ndarray:
+        """Cosine similarity of every company against one query text."""
+        if mode == "parity":
+            if self.comp_texts is None:
+                raise RuntimeError("parity mode needs the company texts")
+            return tfidf_sims_refit(self.comp_texts, query)
+        if mode != "transform":
+            raise ValueError(f"Unknown TF-IDF mode: {mode}")
+        q = self.transform_queries([query])
+        return (self.matrix_norm @ q.T).toarray().ravel()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Compare the two TF-IDF modes used by /match:
+  - transform: cached vectorizer + normalized matrix (artifacts/), query transformed only
+  - parity:    refit on company texts + query per request (original script behaviour)
+
+Usage:
+  python tfidf_parity_report.py                      # every bill_texts/*.txt
+  python tfidf_parity_report.py --bills-dir some/dir --topk 5 --json report.json
+"""
+import argparse
+import glob
+import json
+import os
+import time
+
+import numpy as np
+from scipy.stats import spearmanr
+
+from tfidf_engine import TfidfEngine, ARTIFACT_DIR
+
+COMP_TEXTS_PATH = os.path.join(ARTIFACT_DIR, "company_texts.json")
+BETA = 0.30           # tfidf weight in the hybrid score (api_service.BETA)
+QUERY_CHARS = 6000    # /match caps the CRS+chunk query at 6000 chars
+
+
+def _topk(scores: np.ndarray, k: int) -> list:
+    return list(np.argsort(-scores, kind="stable")[:k])
+
+
+def compare(engine: TfidfEngine, query: str, topk: int) -> dict:
+    t0 = time.perf_counter()
+    fast = engine.sims(query, mode="transform")
+    t1 = time.perf_counter()
+    slow = engine.sims(query, mode="parity")
+    t2 = time.perf_counter()
+
+    diff = np.abs(fast - slow)
+    rho = spearmanr(fast, slow).correlation if fast.std() > 0 and slow.std() > 0 else float("nan")
+    top_fast, top_slow = _topk(fast, topk), _topk(slow, topk)
+    return {
+        "max_abs_diff": float(diff.max()),
+        "mean_abs_diff": float(diff.mean()),
+        "max_hybrid_shift": float(BETA * diff.max()),
+        "spearman": float(rho),
+        f"top{topk}_overlap": len(set(top_fast) & set(top_slow)) / float(topk),
+        f"top{topk}_same_order": top_fast == top_slow,
+        "transform_ms": (t1 - t0) * 1000.0,
+        "parity_ms": (t2 - t1) * 1000.0,
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--bills-dir", default="bill_texts", help="directory of cleaned bill .txt files")
+    ap.add_argument("--topk", type=int, default=5)
+    ap.add_argument("--json", default=None, help="optional path to write the full report")
+    args = ap.parse_args()
+
+    with open(COMP_TEXTS_PATH, "r", encoding="utf-8") as f:
+        comp_texts = list(json.load(f))
+    engine = TfidfEngine.load(comp_texts)
+
+    paths = sorted(glob.glob(os.path.join(args.bills_dir, "*.txt")))
+    if not paths:
+        raise SystemExit(f"No .txt files in {args.bills_dir}")
+
+    rows = {}
+    for p in paths:
+        with open(p, "r", encoding="utf-8") as f:
+            query = f.read()[:QUERY_CHARS]
+        rows[os.path.basename(p)] = compare(engine, query, args.topk)
+
+    key_overlap = f"top{args.topk}_overlap"
+    print(f"{'bill':<28} {'max|Δ|':>8} {'hybridΔ':>8} {'spearman':>9} {key_overlap:>13} {'fast ms':>8} {'refit ms':>9}")
+    for name, r in rows.items():
+        print(f"{name:<28} {r['max_abs_diff']:>8.4f} {r['max_hybrid_shift']:>8.4f} {r['spearman']:>9.4f} "
+              f"{r[key_overlap]:>13.2f} {r['transform_ms']:>8.2f} {r['parity_ms']:>9.2f}")
+
+    agg = {
+        "bills": len(rows),
+        "worst_max_abs_diff": max(r["max_abs_diff"] for r in rows.values()),
+        "mean_spearman": float(np.nanmean([r["spearman"] for r in rows.values()])),
+        f"mean_{key_overlap}": float(np.mean([r[key_overlap] for r in rows.values()])),
+        "mean_speedup": float(np.mean([r["parity_ms"] / max(r["transform_ms"], 1e-9) for r in rows.values()])),
+    }
+    print("\nSummary:", json.dumps(agg, indent=2))
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"summary": agg, "bills": rows}, f, indent=2)
+        print(f"✅ Report saved to '{args.json}'")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,45 @@
 #!/usr/bin/env python3
+"""
+Bill -> S&P 500 matcher (script version of /match, Congress 117).
+
+The encoder and the company artifacts (precompute_companies.py; built from
+sp500_dataset.csv here if artifacts/ is missing) are loaded once per process.
+Bills are fetched by a bounded thread pool and scored in batches: one encode
+call for all query texts of a batch, then (bills x companies) matrices.
+Results are streamed as JSON Lines, one bill per line, as batches finish.
+
+  python top5companies.py HR.3076 s1234 "H.J.Res. 7"
+  python top5companies.py --file bills.txt --workers 8 --batch 32 > matches.jsonl
+  cat bills.txt | python top5companies.py --file - --topk 10
+
+match_bill_to_sp500(bill_type, bill_number) keeps the single-bill report +
+bill_stock_matches.json.
+"""
+import argparse
 import os
 import re
+import sys
 import json
 import time
 import math
-from typing import List, Tuple, Optional
+import concurrent.futures
+from typing import Any, Dict, Iterable, List, Tuple, Optional
 
 import numpy as np
 import pandas as pd
 import requests
 from bs4 import BeautifulSoup
 
-from sentence_transformers import SentenceTransformer
-# We'll ask encode() to return normalized embeddings directly.
-
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.preprocessing import normalize as sk_normalize
-from collections import Counter
+from keyword_index import KeywordIndex, extract_dynamic_terms
+from bill_extract import html_to_text, xml_to_text
+from statute_cleaner import SCRIPT_INLINE_TAG_RE, clean_statute_text as _clean_statute_text
+from encoder import load_encoder, BACKENDS
+from embedding_store import EmbeddingStore
+from tfidf_engine import TfidfEngine, TFIDF_MODES
+from industry_prior import IndustryPrior
+from company_table import CompanyTable, top_k_indices
+from artifact_manifest import verify_companies
+import http_client
 
 
 # =========================
@@ -27,6 +50,14 @@ MODEL_NAME = "all-mpnet-base-v2"
 SP500_CSV = "sp500_dataset.csv"
 OUTPUT_JSON = "bill_stock_matches.json"
 
+# Precomputed company artifacts (precompute_companies.py)
+ARTIFACT_DIR = "artifacts"
+COMP_DF_PATH = os.path.join(ARTIFACT_DIR, "companies.parquet")
+COMP_TEXTS_PATH = os.path.join(ARTIFACT_DIR, "company_texts.json")
+COMP_EMB_PATH = os.path.join(ARTIFACT_DIR, "company_embeddings.npy")
+ENCODER_BACKEND = os.getenv("ENCODER_BACKEND", "sentence-transformers")
+TFIDF_MODE = os.getenv("TFIDF_MODE", "transform")  # "parity" refits per bill like the original script
+
 # Output dirs
 BILL_TEXT_DIR = "bill_texts"        # where to save cleaned bill text
 BILL_CHUNKS_CSV_DIR = "bill_chunks" # optional: where to save chunked text CSV (not required)
@@ -39,6 +70,14 @@ OVERLAP_FRACTION = 0.05
 
 TOPK_RESULTS = 5
 
+# Hybrid weights
+ALPHA, BETA, GAMMA_K = 0.65, 0.30, 0.05
+INDUSTRY_PRIOR_CAP = 0.12
+
+# Multi-bill CLI
+FETCH_WORKERS = 8   # concurrent bill fetches
+SCORE_BATCH = 32    # bills per encode/score call
+
 
 # =========================
 # HTTP helper
@@ -47,12 +86,7 @@ def _get(url, params=None, max_retries=3, backoff=1.5, timeout=30):
     last_exc = None
     for i in range(max_retries):
         try:
-            r = requests.get(
-                url,
-                params=params,
-                timeout=timeout,
-                headers={"User-Agent": "bill-matcher/1.0"},
-            )
+            r = http_client.get(url, params=params, timeout=timeout)
             if r.status_code == 429:
                 time.sleep(backoff ** i)
                 continue
@@ -118,155 +152,10 @@ def _pick_best_format(formats: List[dict]) -> Optional[Tuple[str, str]]:
 
 
 # =========================
-# HTML / XML extraction
-# =========================
-def _html_to_text(html: str) -> str:
-    soup = BeautifulSoup(html, "html.parser")
-    pres = soup.find_all("pre")
-    if pres:
-        text = "\n".join(p.get_text(" ", strip=True) for p in pres)
-    else:
-        for tag in soup(["script", "style", "nav", "header", "footer"]):
-            tag.decompose()
-        text = soup.get_text(" ", strip=True)
-    lines = [re.sub(r"\s+", " ", ln).strip() for ln in text.splitlines()]
-    lines = [ln for ln in lines if ln]
-    return "\n".join(lines)
-
-
-def _xml_to_text(xml: str) -> str:
-    soup = BeautifulSoup(xml, "xml")
-    for tag in soup.find_all(["metadata", "toc", "page", "img"]):
-        tag.decompose()
-    text = soup.get_text(" ", strip=True)
-    lines = [re.sub(r"\s+", " ", ln).strip() for ln in text.splitlines()]
-    lines = [ln for ln in lines if ln]
-    return "\n".join(lines)
-
-
-# =========================
-# Statute cleaner (your exact rules)
+# Statute cleaner (your exact rules; streaming implementation in statute_cleaner.py)
 # =========================
-PAGE_ARTIFACT_RE = re.compile(r"\[\[\s*Page\s+[0-9A-Z.\- ]+\]\]")
-
-INLINE_TAG_RE = re.compile(
-    r"(?:<|&lt;){1,2}\s*"
-    r"(?:NOTE:|Notes?:|Editorial\s*Note:|Editor\s*Note:|Deadline[^>:\n]*:|Effective\s+date[^>:\n]*:)"
-    r"[\s\S]*?"
-    r"(?:>|&gt;){1,2}",
-    re.IGNORECASE
-)
-ALLCAPS_HEADER_RE = re.compile(r"^(?:[A-Z0-9 ,.'\-]{6,})$", re.MULTILINE)
-LEG_HISTORY_START_RE = re.compile(
-    r"^\s*(?:LEGISLATIVE HISTORY|HISTORY|CONGRESSIONAL RECORD)\b.*$",
-    re.IGNORECASE | re.MULTILINE
-)
-CERT_STAMP_RE = re.compile(
-    r"^\s*(?:Approved\s+[A-Za-z]+\s+\d{1,2},\s+\d{4}\.?|Be it enacted.*)$",
-    re.IGNORECASE | re.MULTILINE
-)
-LINE_NUMBER_RE = re.compile(r"^\s*\d{1,4}\s+", re.MULTILINE)
-DECOR_DIVIDER_RE = re.compile(r"^\s*[·\-–—_=]{4,}\s*$", re.MULTILINE)
-
-SEC_LINE_RE = re.compile(r"^\s*Sec\.\s*\d+[A-Za-z\-]*\.\s*", re.IGNORECASE)
-SUBSECTION_LINE_RE = re.compile(r"^\s*\(([a-z]|[0-9]+|[A-Z]|i{1,3}|iv|v|vi{0,3}|ix|x)\)\s")
-STRUCTURAL_START_RE = re.compile(r"^\s*(?:Sec\.\s*\d+[A-Za-z\-]*\.|\([a-zA-Z0-9ivxIVX]+\))")
-
-
-def _standardize_quotes_dashes(s: str) -> str:
-    s = (s.replace("\u2018", "'").replace("\u2019", "'")
-           .replace("\u201C", '"').replace("\u201D", '"')
-           .replace("\u2013", "—").replace("\u2014", "—"))
-    return s
-
-
-def _strip_leading_trailing_quotes(line: str) -> str:
-    # Remove leading/ending straight or smart quotes used as decorative wrappers
-    return re.sub(r'^[\'"“”]+|[\'"“”]+\s*$', "", line).strip()
-
-
-def _normalize_heading_punct(line: str) -> str:
-    # If a structural heading ends with an em dash, make it a period.
-    if STRUCTURAL_START_RE.match(line) and re.search(r"—\s*$", line):
-        return re.sub(r"—\s*$", ".", line)
-    return line
-
-
 def clean_statute_text(raw: str) -> str:
-    # 1) Remove page artifacts & decorative dividers early from whole text
-    text = PAGE_ARTIFACT_RE.sub("", raw)
-    text = DECOR_DIVIDER_RE.sub("", text)
-
-    # 2) Line-by-line: drop ALL-CAPS header lines (except SEC.), inline tags, boilerplate lines
-    lines = []
-    for ln in text.splitlines():
-        if ALLCAPS_HEADER_RE.match(ln) and not ln.strip().startswith("SEC."):
-            continue
-        if CERT_STAMP_RE.match(ln):
-            continue
-        ln = INLINE_TAG_RE.sub("", ln)
-        lines.append(ln)
-    text = "\n".join(lines)
-    text = re.sub(r"[ \t]*(?:&gt;|>){1,2}[ \t]*$", "", text, flags=re.MULTILINE)
-    text = re.sub(r"^[ \t]*(?:&lt;|<){1,2}[ \t]*", "", text, flags=re.MULTILINE)
-    # Remove any empty bracket pairs that survived
-    text = re.sub(r"(?:&lt;|<){1,2}\s*(?:&gt;|>){1,2}", "", text)
-
-    # 3) Remove Table of Contents block (if present)
-    parts = re.split(r"(?im)^\s*table of contents\s*$", text, maxsplit=1)
-    if len(parts) == 2:
-        head, rest = parts
-        rest_parts = re.split(r"\n\s*\n", rest, maxsplit=1)
-        text = head + ("\n\n" + (rest_parts[1] if len(rest_parts) > 1 else ""))
-
-    # 4) Trim at legislative history section (if present)
-    m = LEG_HISTORY_START_RE.search(text)
-    if m:
-        text = text[:m.start()]
-
-    # 5) Normalize punctuation, remove page line numbers
-    text = _standardize_quotes_dashes(text)
-    text = LINE_NUMBER_RE.sub("", text)
-
-    # 6) Clean each line: strip decorative wrapping quotes; normalize heading em-dash to period
-    cleaned_lines = []
-    for ln in text.splitlines():
-        ln = ln.strip()
-        if not ln:
-            cleaned_lines.append("")
-            continue
-        ln = _strip_leading_trailing_quotes(ln)
-        ln = _normalize_heading_punct(ln)
-        cleaned_lines.append(ln)
-    text = "\n".join(cleaned_lines)
-
-    # 7) Merge hard wraps but keep structure (Sec./(a)/(3)/(A)/roman (i) start new lines)
-    def _merge_preserving_structure(t: str) -> str:
-        out = []
-        buf = []
-        def flush_buf():
-            if buf:
-                out.append(" ".join(buf).strip())
-                buf.clear()
-        for ln in t.splitlines():
-            if not ln.strip():
-                flush_buf()
-                out.append("")  # keep paragraph break
-                continue
-            if SEC_LINE_RE.match(ln) or SUBSECTION_LINE_RE.match(ln):
-                flush_buf()
-                out.append(ln.strip())
-            else:
-                buf.append(ln.strip())
-        flush_buf()
-        return re.sub(r"(?:\n\s*){3,}", "\n\n", "\n".join(out)).strip()
-
-    text = _merge_preserving_structure(text)
-
-    # 8) Final whitespace normalization
-    text = re.sub(r"[ \t]+", " ", text)
-    text = re.sub(r"\n{3,}", "\n\n", text).strip()
-    return text
+    return _clean_statute_text(raw, inline_tag_re=SCRIPT_INLINE_TAG_RE, strip_angle_brackets=True)
 
 
 # =========================
@@ -371,67 +260,6 @@ def get_crs_summary(bill_type: str, bill_number: int) -> Optional[str]:
     return cand or None
 
 
-# =========================
-# Universal priors
-# =========================
-def extract_dynamic_terms(bill_text: str,
-                          top_ngrams: int = 40,
-                          ngram_range=(1, 2),
-                          stopwords: Optional[set] = None) -> dict:
-    stop = stopwords or set()
-    text = bill_text.lower()
-    text = re.sub(r'\s+', ' ', text)
-
-    tokens = re.findall(r"[a-z][a-z0-9\-]+", text)
-    tokens = [t for t in tokens if t not in stop and len(t) > 2]
-
-    bigrams = [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
-    grams = tokens + bigrams
-
-    def is_ok(g):
-        n = len(g.split())
-        return n >= ngram_range[0] and n <= ngram_range[1]
-
-    freq = Counter(g for g in grams if is_ok(g))
-    most = freq.most_common(top_ngrams)
-    if not most:
-        return {}
-    maxf = most[0][1]
-    return {g: 1.0 + (c / maxf) for g, c in most}  # weights ~[1..2]
-
-
-def keyword_prior_score_dynamic(text: str, term_weights: dict,
-                                cap: float = 0.15, per_hit: float = 0.02) -> float:
-    t = text.lower()
-    score = 0.0
-    for k, w in term_weights.items():
-        if k in t:
-            score += per_hit * w * 10
-    return min(cap, score)
-
-
-def industry_prior_from_embeddings(df: pd.DataFrame,
-                                   bill_query_text: str,
-                                   model: SentenceTransformer,
-                                   sector_col: str = "sector",
-                                   industry_col: str = "industry",
-                                   cap: float = 0.12) -> np.ndarray:
-    labels = (df[industry_col].fillna("") + " | " + df[sector_col].fillna("")).tolist()
-    uniq = sorted(set(labels))
-    if not uniq:
-        return np.zeros(len(df))
-    lbl_embs = model.encode(uniq, convert_to_numpy=True, normalize_embeddings=True)
-    q_emb = model.encode([bill_query_text], convert_to_numpy=True, normalize_embeddings=True)
-    sims = (q_emb @ lbl_embs.T).ravel()
-    lbl2sim = {l: s for l, s in zip(uniq, sims)}
-    raw = np.array([lbl2sim.get(l, 0.0) for l in labels], dtype=float)
-    if raw.max() > raw.min():
-        norm = (raw - raw.min()) / (raw.max() - raw.min())
-    else:
-        norm = np.zeros_like(raw)
-    return cap * norm
-
-
 # =========================
 # Function 1: fetch, clean & preprocess bill text
 # =========================
@@ -461,9 +289,9 @@ def get_bill_text(bill_type: str, bill_number: int) -> Tuple[str, str, List[str]
     if fmt == "Plain Text":
         raw = "\n".join([ln.strip() for ln in r.text.splitlines() if ln.strip()])
     elif fmt == "Formatted Text":
-        raw = _html_to_text(r.text)
+        raw = html_to_text(r.text)
     elif fmt == "Formatted XML":
-        raw = _xml_to_text(r.text)
+        raw = xml_to_text(r.text)
     else:
         raise RuntimeError("PDF-only for best version; add a PDF-to-text step if needed.")
 
@@ -488,90 +316,128 @@ def get_bill_text(bill_type: str, bill_number: int) -> Tuple[str, str, List[str]
 
 
 # =========================
-# Function 2: match bill to S&P 500 (universal hybrid)
+# Matcher (model + company artifacts loaded once)
 # =========================
-def match_bill_to_sp500(bill_type: str, bill_number: int) -> dict:
-    print("Fetching, cleaning, and preprocessing bill text ...")
-    bill_id, clean_text, chunks = get_bill_text(bill_type, bill_number)
-    print(f"✅ {bill_id} | cleaned chars: {len(clean_text)} | chunks: {len(chunks)}\n")
-
-    # Focused query: CRS summary + a long bill chunk
-    crs = get_crs_summary(bill_type, bill_number)
-    if crs:
-        print("Hello")
-        long_chunk = max(chunks, key=len) if chunks else ""
-        bill_query_text = (crs + "\n\n" + long_chunk)[:6000]
-    else:
-        # fallback: concat the longest 2–3 chunks
-        bill_query_text = " ".join(sorted(chunks, key=len, reverse=True)[:3])
-
-    print("Loading embedding model ...")
-    model = SentenceTransformer(MODEL_NAME)
-    print(f"✅ Model loaded: {MODEL_NAME}\n")
-
-    print("Loading S&P 500 dataset ...")
-    sp = pd.read_csv(SP500_CSV)
-    print(f"✅ {len(sp)} companies\n")
-
-    # Build company texts
-    comp_texts = sp.apply(_build_company_text, axis=1).tolist()
-
-    # Dynamic terms from bill (prefer CRS if present)
-    source_text = crs if crs else clean_text
-    dyn_terms = extract_dynamic_terms(source_text, top_ngrams=40, ngram_range=(1, 2))
-
-    # Industry prior learned from label embeddings
-    ind_boosts = industry_prior_from_embeddings(sp, bill_query_text, model,
-                                                sector_col="sector", industry_col="industry", cap=0.12)
-
-    # --- Hybrid scoring ---
-    # Dense
-    q_emb = model.encode([bill_query_text], convert_to_numpy=True, normalize_embeddings=True)
-    d_embs = model.encode(comp_texts, convert_to_numpy=True, normalize_embeddings=True,
-                          batch_size=64, show_progress_bar=False)
-    dense_sims = (q_emb @ d_embs.T).ravel()
-
-    # TF-IDF
-    vect = TfidfVectorizer(min_df=2, ngram_range=(1, 2))
-    X = vect.fit_transform(comp_texts + [bill_query_text])
-    D, q = X[:-1], X[-1]
-    D = sk_normalize(D); q = sk_normalize(q)
-    tfidf_sims = (D @ q.T).toarray().ravel()
-
-    # Dynamic keyword prior
-    kprior = np.array([keyword_prior_score_dynamic(t, dyn_terms) for t in comp_texts], dtype=float)
+class BillMatcher:
+    def __init__(self, encoder_backend: str = ENCODER_BACKEND, tfidf_mode: str = TFIDF_MODE, log=print):
+        if tfidf_mode not in TFIDF_MODES:
+            raise ValueError(f"tfidf_mode must be one of {TFIDF_MODES}")
+        self.tfidf_mode = tfidf_mode
+        t0 = time.perf_counter()
+        self.model = load_encoder(encoder_backend, MODEL_NAME)
+        log(f"✅ Model loaded: {MODEL_NAME} ({encoder_backend})")
+
+        if all(os.path.exists(p) for p in (COMP_DF_PATH, COMP_TEXTS_PATH, COMP_EMB_PATH)):
+            verify_companies(ARTIFACT_DIR, COMP_DF_PATH)
+            self.df = pd.read_parquet(COMP_DF_PATH)
+            with open(COMP_TEXTS_PATH, "r", encoding="utf-8") as f:
+                self.comp_texts = list(json.load(f))
+            self.comp_embs = EmbeddingStore.open("float32", COMP_EMB_PATH)
+            self.tfidf = TfidfEngine.load(self.comp_texts)
+            source = ARTIFACT_DIR
+        else:
+            # No artifacts: build them in memory once (what every call used to do)
+            self.df = pd.read_csv(SP500_CSV)
+            self.comp_texts = self.df.apply(_build_company_text, axis=1).tolist()
+            self.comp_embs = EmbeddingStore.from_array(self.model.encode(
+                self.comp_texts, convert_to_numpy=True, normalize_embeddings=True,
+                batch_size=64, show_progress_bar=False))
+            self.tfidf = TfidfEngine.fit(self.comp_texts)
+            source = SP500_CSV
+        self.industry_prior = IndustryPrior.load(self.df, cap=INDUSTRY_PRIOR_CAP, model=self.model)
+        self.keyword_index = KeywordIndex(self.comp_texts)
+        self.companies = CompanyTable(self.df)
+        log(f"✅ {len(self.df)} companies from {source} in {time.perf_counter() - t0:.1f}s")
+
+    def prepare(self, bill_type: str, bill_number: int) -> Dict[str, Any]:
+        """Fetch/clean/chunk + CRS summary -> query text (network only; safe to run in threads)."""
+        bill_id, clean_text, chunks = get_bill_text(bill_type, bill_number)
+        # Focused query: CRS summary + a long bill chunk
+        crs = get_crs_summary(bill_type, bill_number)
+        if crs:
+            long_chunk = max(chunks, key=len) if chunks else ""
+            bill_query_text = (crs + "\n\n" + long_chunk)[:6000]
+        else:
+            # fallback: concat the longest 2–3 chunks
+            bill_query_text = " ".join(sorted(chunks, key=len, reverse=True)[:3])
+        return {"bill_id": bill_id, "clean_text": clean_text, "chunks": chunks,
+                "crs": crs, "query_text": bill_query_text}
+
+    def score(self, bills: List[Dict[str, Any]]) -> np.ndarray:
+        """Hybrid scores as a (bills x companies) matrix; one encode call for the batch."""
+        query_texts = [b["query_text"] for b in bills]
+        Q = self.model.encode(query_texts, convert_to_numpy=True, normalize_embeddings=True,
+                              batch_size=64, show_progress_bar=False)
+        dense_sims = self.comp_embs.matmul(Q)
+        tfidf_sims = self.tfidf.sims_matrix(query_texts, mode=self.tfidf_mode)
+        # Dynamic terms from bill (prefer CRS if present)
+        kprior = np.vstack([
+            self.keyword_index.scores(extract_dynamic_terms(b["crs"] or b["clean_text"], top_ngrams=40,
+                                                            ngram_range=(1, 2)))
+            for b in bills])
+        ind_boosts = self.industry_prior.boosts_matrix(Q)
+        return ALPHA * dense_sims + BETA * tfidf_sims + GAMMA_K * kprior + ind_boosts
+
+    def result(self, bill: Dict[str, Any], scores: np.ndarray, topk: int = TOPK_RESULTS) -> Dict[str, Any]:
+        snippet_source = bill["crs"] or bill["clean_text"]
+        return {
+            "bill_id": bill["bill_id"],
+            "congress": CONGRESS,
+            "model": MODEL_NAME,
+            "ranking": "hybrid_dense_tfidf_dynamic_keywords_industry_prior",
+            "tfidf_mode": self.tfidf_mode,
+            "topk": topk,
+            "results": self.companies.top_records(scores, topk),
+            "snippet": snippet_source[:280] + ("..." if len(snippet_source) > 280 else ""),
+            "clean_text_path": os.path.join(BILL_TEXT_DIR, f"{bill['bill_id'].lower()}_clean.txt"),
+        }
+
+
+_MATCHER: Optional[BillMatcher] = None
+
+
+def get_matcher() -> BillMatcher:
+    global _MATCHER
+    if _MATCHER is None:
+        _MATCHER = BillMatcher()
+    return _MATCHER
 
-    # Blend
-    alpha, beta, gamma_k = 0.65, 0.30, 0.05
-    base = alpha * dense_sims + beta * tfidf_sims + gamma_k * kprior
-    final_scores = base + ind_boosts
 
-    sp = sp.copy()
-    sp["hybrid_score"] = final_scores
+# =========================
+# Function 2: match bill to S&P 500 (universal hybrid)
+# =========================
+def match_bill_to_sp500(bill_type: str, bill_number: int, matcher: Optional[BillMatcher] = None) -> dict:
+    matcher = matcher or get_matcher()
+    print("Fetching, cleaning, and preprocessing bill text ...")
+    bill = matcher.prepare(bill_type, bill_number)
+    print(f"✅ {bill['bill_id']} | cleaned chars: {len(bill['clean_text'])} | chunks: {len(bill['chunks'])}\n")
 
-    top = sp.nlargest(TOPK_RESULTS, "hybrid_score").reset_index(drop=True)
+    final_scores = matcher.score([bill])[0]
+    idx = top_k_indices(final_scores, TOPK_RESULTS)
+    top = matcher.df.iloc[idx].reset_index(drop=True)
+    top["hybrid_score"] = final_scores[idx]
 
     # Simple explanation snippet
-    snippet_source = (crs or clean_text)
+    snippet_source = (bill["crs"] or bill["clean_text"])
     snippet = snippet_source[:280] + ("..." if len(snippet_source) > 280 else "")
     top["bill_snippet"] = snippet
 
     print("=" * 96)
-    print(f"TOP {TOPK_RESULTS} COMPANIES RELATED TO BILL {bill_id} (Hybrid on CLEANED text)")
+    print(f"TOP {TOPK_RESULTS} COMPANIES RELATED TO BILL {bill['bill_id']} (Hybrid on CLEANED text)")
     print("=" * 96)
     print(top[["ticker", "name", "sector", "industry", "hybrid_score"]].to_string(index=False))
     print("\n— Matching bill snippet (from CRS or cleaned bill) —")
     print(snippet)
 
     result = {
-        "bill_id": bill_id,
+        "bill_id": bill["bill_id"],
         "congress": CONGRESS,
         "model": MODEL_NAME,
         "ranking": "hybrid_dense_tfidf_dynamic_keywords_industry_prior",
         "topk": TOPK_RESULTS,
         "results": top.to_dict("records"),
         # also tell caller where the cleaned text was saved
-        "clean_text_path": os.path.join(BILL_TEXT_DIR, f"{bill_id.lower()}_clean.txt"),
+        "clean_text_path": os.path.join(BILL_TEXT_DIR, f"{bill['bill_id'].lower()}_clean.txt"),
     }
     with open(OUTPUT_JSON, "w", encoding="utf-8") as f:
         json.dump(result, f, indent=2)
@@ -582,9 +448,108 @@ def match_bill_to_sp500(bill_type: str, bill_number: int) -> dict:
 
 
 # =========================
-# Example usage
+# Multi-bill CLI
 # =========================
+_BILL_REF_RE = re.compile(r"^\s*([A-Za-z][A-Za-z.\s]*?)[\s./-]*(\d+)\s*$")
+BILL_TYPES = ("hr", "s", "hjres", "sjres", "hconres", "sconres", "hres", "sres")
+
+
+def parse_bill_ref(ref: str) -> Tuple[str, int]:
+    """'HR.3076', 'hr3076', 'H.R. 3076', 's 12', 'hjres/7' -> ('hr', 3076), ..."""
+    m = _BILL_REF_RE.match(ref)
+    if not m:
+        raise ValueError(f"not a bill id: {ref!r}")
+    bill_type = re.sub(r"[\s.]", "", m.group(1)).lower()
+    if bill_type not in BILL_TYPES:
+        raise ValueError(f"unknown bill type in {ref!r}; expected one of {BILL_TYPES}")
+    return bill_type, int(m.group(2))
+
+
+def read_bill_refs(args_bills: List[str], path: Optional[str]) -> List[str]:
+    refs = list(args_bills)
+    if path:
+        f = sys.stdin if path == "-" else open(path, "r", encoding="utf-8")
+        try:
+            refs += [ln.split("#", 1)[0].strip() for ln in f]
+        finally:
+            if f is not sys.stdin:
+                f.close()
+    return [r for r in refs if r]
+
+
+def match_bills(matcher: BillMatcher, refs: Iterable[str], workers: int = FETCH_WORKERS,
+                batch: int = SCORE_BATCH, topk: int = TOPK_RESULTS) -> Iterable[Dict[str, Any]]:
+    """
+    Yield one result (or {"bill_id", "error"}) per bill ref, in completion order.
+    At most `workers` fetches run at once; a batch is scored as soon as it fills,
+    while the remaining fetches continue.
+    """
+    ready: List[Dict[str, Any]] = []
+
+    def flush():
+        scores = matcher.score(ready)
+        out = [matcher.result(b, s, topk) for b, s in zip(ready, scores)]
+        ready.clear()
+        return out
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers, thread_name_prefix="fetch") as executor:
+        futures = {}
+        for ref in refs:
+            try:
+                bill_type, bill_number = parse_bill_ref(ref)
+            except ValueError as e:
+                yield {"bill_id": ref, "error": str(e)}
+                continue
+            futures[executor.submit(matcher.prepare, bill_type, bill_number)] = f"{bill_type.upper()}.{bill_number}"
+        for future in concurrent.futures.as_completed(futures):
+            try:
+                ready.append(future.result())
+            except Exception as e:
+                yield {"bill_id": futures[future], "error": str(e)}
+                continue
+            if len(ready) >= batch:
+                yield from flush()
+        if ready:
+            yield from flush()
+
+
+def main(argv: Optional[List[str]] = None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("bills", nargs="*", help="bill ids (HR.3076, s1234, ...)")
+    ap.add_argument("--file", default=None, help="file with one bill id per line ('-' = stdin)")
+    ap.add_argument("--out", default="-", help="JSON Lines output (default stdout)")
+    ap.add_argument("--workers", type=int, default=FETCH_WORKERS, help="concurrent bill fetches")
+    ap.add_argument("--batch", type=int, default=SCORE_BATCH, help="bills per encode/score call")
+    ap.add_argument("--topk", type=int, default=TOPK_RESULTS)
+    ap.add_argument("--tfidf-mode", default=TFIDF_MODE, choices=TFIDF_MODES)
+    ap.add_argument("--encoder", default=ENCODER_BACKEND, choices=BACKENDS)
+    args = ap.parse_args(argv)
+
+    refs = read_bill_refs(args.bills, args.file)
+    if not refs:
+        ap.error("no bills given (positional ids or --file)")
+
+    def log(msg):
+        print(msg, file=sys.stderr)
+
+    t0 = time.perf_counter()
+    matcher = BillMatcher(args.encoder, args.tfidf_mode, log=log)
+    out = sys.stdout if args.out == "-" else open(args.out, "w", encoding="utf-8")
+    n_ok = n_err = 0
+    try:
+        for rec in match_bills(matcher, refs, args.workers, args.batch, args.topk):
+            out.write(json.dumps(rec, ensure_ascii=False) + "\n")
+            out.flush()
+            if "error" in rec:
+                n_err += 1
+                log(f"[top5] {rec['bill_id']}: {rec['error']}")
+            else:
+                n_ok += 1
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    log(f"[top5] {n_ok} matched, {n_err} failed of {len(refs)} bills in {time.perf_counter() - t0:.1f}s")
+
+
 if __name__ == "__main__":
-    BILL_TYPE = "hr"      # e.g., "hr", "s", "hjres", "sjres", ...
-    BILL_NUMBER = 3076
-    match_bill_to_sp500(BILL_TYPE, BILL_NUMBER)
+    main()
@@ -0,0 +1,598 @@
+#!/usr/bin/env python3
+"""
+Offline upstream simulator: one local server standing in for every host the
+services call (Congress.gov API + bill text documents, Polymarket gamma / CLOB /
+event page, Yahoo Finance charts), so api_service.py and app.py run and can be
+benchmarked without network.
+
+  python upstream_sim.py --port 8900
+  HTTP_UPSTREAM_OVERRIDE=http://127.0.0.1:8900 uvicorn api_service:app
+  python upstream_sim.py --latency 0.3 --jitter 0.1 --error-rate 0.05 --quota 5000/3600
+  python upstream_sim.py --record        # pass through to the real hosts, saving fixtures
+  python upstream_sim.py --strict        # unrecorded URL -> 404, no synthetic answers
+
+Calls arrive as /<host>/<path>?<query> (http_client.route()) and are answered by
+  1. the fixture recorded for that URL + params (api_key is ignored, never stored)
+  2. else a fixture recorded for the same path with other params
+  3. else a synthetic payload shaped like the real one for the route (ROUTES),
+     the same for the same URL every time (bill text: bill_texts/<id>_clean.txt
+     when there is one)
+Fixtures: <fixtures>/<route>/<key>.json = {url, status, headers, body}; a stored
+ETag is honoured (If-None-Match -> 304). The set committed in fixtures/upstream
+(tests/test_upstream_sim.py) is synthetic, written from this simulator's own
+answers: it exercises replay, not real response shapes; --record replaces it.
+
+Faults are decided per URL and per call count, so a rerun injects the same ones:
+  --latency / --jitter   seconds before answering
+  --error-rate           fraction of calls answered 500 / 503 or dropped
+  --quota N/SECONDS      calls per host per window; beyond it 429 + Retry-After
+
+  GET  /_sim/stats       calls per route: fixture, synthetic, recorded, errors, throttled
+  POST /_sim/config      {"latency": 0.5, "error_rate": 0.1, "quota": "100/60"} while running
+"""
+import argparse
+import datetime
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+import requests
+
+from http_cache import SECRET_PARAMS, cache_key
+
+FIXTURES_DIR = os.getenv("UPSTREAM_FIXTURES_DIR", os.path.join("fixtures", "upstream"))
+BILL_TEXT_DIR = "bill_texts"
+KEPT_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Retry-After")
+RECORD_TIMEOUT = 30
+
+# Synthetic data: the listing has SIM_BILLS bills per congress (HR and S alternating,
+# newest first); bill n of a type is sponsored by MEMBERS[(n + offset) % len(MEMBERS)].
+SIM_BILLS = 2000
+SIM_EPOCH = datetime.datetime(2025, 10, 1)
+STATES = ["CA", "TX", "NY", "FL", "PA", "OH", "IL", "GA", "WA", "AZ", "MI", "NC"]
+SURNAMES = ["Adams", "Baker", "Chen", "Diaz", "Evans", "Foster", "Garcia", "Hughes", "Ito", "Jones",
+            "Kim", "Lopez", "Miller", "Nguyen", "Owens", "Patel", "Quinn", "Reyes", "Smith", "Turner"]
+MEMBERS = [{
+    "bioguideId": f"{name[0]}{100 + i:06d}",
+    "firstName": "Sam",
+    "lastName": name,
+    "party": "DR"[i % 2],
+    "state": STATES[i % len(STATES)],
+    "fullName": f"{'Rep.' if i % 4 else 'Sen.'} {name}, Sam [{'DR'[i % 2]}-{STATES[i % len(STATES)]}]",
+} for i, name in enumerate(SURNAMES * 2)]
+TYPE_OFFSET = {"hr": 0, "s": 7, "hres": 3, "sres": 11, "hjres": 5, "sjres": 13, "hconres": 2, "sconres": 9}
+POLICY_AREAS = {
+    "Energy": "domestic oil and natural gas production, pipeline permitting and refinery capacity",
+    "Health": "prescription drug pricing, hospital reimbursement and medical device approval",
+    "Housing and Community Development": "mortgage lending, home construction and residential building permits",
+    "Armed Forces and National Security": "defense procurement, aircraft programs and munitions supply",
+    "Transportation and Public Works": "highway funding, freight rail and commercial aviation safety",
+    "Finance and Financial Sector": "bank capital requirements, payment networks and consumer credit",
+    "Science, Technology, Communications": "semiconductor manufacturing, broadband deployment and cloud services",
+    "Agriculture and Food": "crop insurance, fertilizer supply and beverage labeling",
+}
+ACTIONS = ["Introduced in House", "Referred to the Committee on Energy and Commerce.",
+           "Passed House by recorded vote.", "Passed Senate without amendment by Unanimous Consent.",
+           "Placed on the Union Calendar."]
+MARKET_BILLS = [("hr", 1), ("s", 2), ("hr", 3), ("s", 4), ("hr", 5), ("hr", 9), ("s", 10), ("hr", 13)]
+
+
+# =========================
+# Synthetic payloads
+# =========================
+def _rng(*parts) -> random.Random:
+    return random.Random(int(hashlib.sha1(repr(parts).encode()).hexdigest()[:12], 16))
+
+
+def _day(days_ago: float) -> str:
+    return (SIM_EPOCH - datetime.timedelta(days=days_ago)).strftime("%Y-%m-%d")
+
+
+def _label(bill_type: str, number: int) -> str:
+    return {"hr": "H.R.", "s": "S."}.get(bill_type, bill_type.upper() + ".") + f" {number}"
+
+
+def _sponsor(bill_type: str, number: int) -> Dict[str, Any]:
+    return MEMBERS[(number + TYPE_OFFSET.get(bill_type, 0)) % len(MEMBERS)]
+
+
+def _listing_item(k: int, congress: int) -> Dict[str, Any]:
+    bill_type, number = ("hr", "s")[k % 2], k // 2 + 1
+    return _bill_summary(congress, bill_type, number, updated=k / 24)
+
+
+def _bill_summary(congress: int, bill_type: str, number: int, updated: Optional[float] = None) -> Dict[str, Any]:
+    rng = _rng(congress, bill_type, number)
+    area = rng.choice(sorted(POLICY_AREAS))
+    introduced = rng.randint(30, 600)
+    acted = rng.randint(0, introduced)
+    return {
+        "congress": congress,
+        "type": bill_type.upper(),
+        "number": str(number),
+        "title": f"{area.split(',')[0].split(' and ')[0]} Improvement Act of {2026 - introduced // 365}",
+        "introducedDate": _day(introduced),
+        "latestAction": {"actionDate": _day(acted), "text": rng.choice(ACTIONS)},
+        "updateDate": _day(acted if updated is None else updated),
+        "policyArea": {"name": area},
+        "url": f"https://api.congress.gov/v3/bill/{congress}/{bill_type}/{number}?format=json",
+    }
+
+
+def _cosponsors(congress: int, bill_type: str, number: int) -> List[Dict[str, Any]]:
+    rng = _rng("cosponsors", congress, bill_type, number)
+    sponsor = _sponsor(bill_type, number)
+    picks = rng.sample([m for m in MEMBERS if m is not sponsor], rng.randint(0, 8))
+    return [dict(m, sponsorshipDate=_day(rng.randint(0, 30)), isOriginalCosponsor=i < 2) for i, m in enumerate(picks)]
+
+
+def _bill_text(congress: int, bill_type: str, number: int) -> str:
+    path = os.path.join(BILL_TEXT_DIR, f"{bill_type}.{number}_clean.txt")
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read()
+    s = _bill_summary(congress, bill_type, number)
+    topic = POLICY_AREAS[s["policyArea"]["name"]]
+    rng = _rng("text", congress, bill_type, number)
+    secs = [f"SECTION 1. SHORT TITLE. This Act may be cited as the {s['title']}."]
+    for i in range(2, 2 + rng.randint(3, 8)):
+        secs.append(f"SEC. {i}. The Secretary shall issue rules on {topic}, report to Congress on "
+                    f"{rng.choice(topic.split(', '))} within {rng.randint(90, 720)} days, and may award "
+                    f"grants of up to ${rng.randint(1, 500)},000,000 for each fiscal year.")
+    return "\n\n".join(secs)
+
+
+def _bill_route(m: Dict[str, str]) -> Tuple[int, str, int]:
+    return int(m["congress"]), m["type"].lower(), int(m["number"])
+
+
+def sim_bill(m, q):
+    c, t, n = _bill_route(m)
+    bill = _bill_summary(c, t, n)
+    bill["sponsors"] = [dict(_sponsor(t, n), isByRequest="N")]
+    bill["cosponsors"] = {"count": len(_cosponsors(c, t, n))}
+    return 200, {"bill": bill}
+
+
+def sim_text_versions(m, q):
+    c, t, n = _bill_route(m)
+    base = f"https://www.congress.gov/{c}/bills/{t}{n}/BILLS-{c}{t}{n}ih"
+    return 200, {"textVersions": [{
+        "type": "Introduced in House" if t.startswith("h") else "Introduced in Senate",
+        "date": _bill_summary(c, t, n)["introducedDate"] + "T04:00:00Z",
+        "formats": [{"type": "Formatted Text", "url": base + ".htm"}, {"type": "PDF", "url": base + ".pdf"}],
+    }]}
+
+
+def sim_summaries(m, q):
+    c, t, n = _bill_route(m)
+    s = _bill_summary(c, t, n)
+    return 200, {"summaries": [{
+        "actionDate": s["introducedDate"], "actionDesc": "Introduced in House", "updateDate": s["updateDate"],
+        "text": f"<p><strong>{s['title']}</strong></p><p>This bill concerns "
+                f"{POLICY_AREAS[s['policyArea']['name']]}.</p>",
+    }]}
+
+
+def sim_cosponsors(m, q):
+    cos = _cosponsors(*_bill_route(m))
+    return 200, {"cosponsors": cos, "pagination": {"count": len(cos)}}
+
+
+def sim_actions(m, q):
+    c, t, n = _bill_route(m)
+    s = _bill_summary(c, t, n)
+    return 200, {"actions": [s["latestAction"], {"actionDate": s["introducedDate"], "text": ACTIONS[0]}]}
+
+
+def _page(q: Dict[str, str], total: int) -> Tuple[int, int]:
+    offset = max(0, int(q.get("offset") or 0))
+    return offset, min(int(q.get("limit") or 20), 250, max(0, total - offset))
+
+
+def sim_listing(m, q):
+    congress = int(m.get("congress") or q.get("congress") or 119)
+    if m.get("type"):
+        bills = [_bill_summary(congress, m["type"].lower(), k + 1, updated=k / 12) for k in range(SIM_BILLS)]
+    else:
+        bills = [_listing_item(k, congress) for k in range(SIM_BILLS)]
+    if q.get("fromDateTime"):  # updated since (day resolution)
+        bills = [b for b in bills if b["updateDate"] >= q["fromDateTime"][:10]]
+    offset, limit = _page(q, len(bills))
+    return 200, {"bills": bills[offset:offset + limit], "pagination": {"count": len(bills)}}
+
+
+def sim_members(m, q):
+    offset, limit = _page(q, len(MEMBERS))
+    return 200, {"members": [{"bioguideId": x["bioguideId"], "name": f"{x['lastName']}, {x['firstName']}",
+                              "partyName": {"D": "Democratic", "R": "Republican"}[x["party"]], "state": x["state"]}
+                             for x in MEMBERS[offset:offset + limit]], "pagination": {"count": len(MEMBERS)}}
+
+
+def sim_member_bills(m, q):
+    member = next((i for i, x in enumerate(MEMBERS) if x["bioguideId"] == m["bioguide_id"].upper()), None)
+    if member is None:
+        return 404, {"error": f"Unknown member {m['bioguide_id']}"}
+    field = f"{m['kind']}Legislation"
+    if m["kind"] == "cosponsored":
+        items = [b for k in range(SIM_BILLS) for b in [_listing_item(k, 119)]
+                 if MEMBERS[member] in _cosponsors(119, b["type"].lower(), int(b["number"]))]
+    else:
+        items = [_bill_summary(119, t, n) for n in range(SIM_BILLS // 2, 0, -1) for t in ("hr", "s")
+                 if (n + TYPE_OFFSET[t]) % len(MEMBERS) == member]
+    items.sort(key=lambda b: b["introducedDate"], reverse=True)
+    offset, limit = _page(q, len(items))
+    return 200, {field: items[offset:offset + limit], "pagination": {"count": len(items)}}
+
+
+def sim_document(m, q):
+    c, t, n = _bill_route(m)
+    body = _bill_text(c, t, n).replace("&", "&amp;").replace("<", "&lt;")
+    return 200, f"<html><body><pre>\n{body}\n</pre></body></html>"
+
+
+def _markets() -> List[Dict[str, Any]]:
+    out = []
+    for t, n in MARKET_BILLS:
+        rng = _rng("market", t, n)
+        yes = round(rng.uniform(0.02, 0.9), 3)
+        out.append({"bill_type": t, "bill_number": n, "yes": yes, "volume": rng.randint(10, 50000),
+                    "tokens": [str(_rng("token", t, n, side).getrandbits(64)) for side in ("yes", "no")]})
+    return out
+
+
+def sim_event(m, q):
+    return 200, {"slug": m["slug"], "title": "What bills will be signed into law?", "markets": [{
+        "question": f"Will {_label(x['bill_type'], x['bill_number'])} be signed into law?",
+        "groupItemTitle": _label(x["bill_type"], x["bill_number"]),
+        "outcomePrices": json.dumps([str(x["yes"]), str(round(1 - x["yes"], 3))]),
+        "clobTokenIds": json.dumps(x["tokens"]),
+        "volume": str(x["volume"]),
+    } for x in _markets()]}
+
+
+def sim_event_page(m, q):
+    heads = "".join(f"<h3>{x['bill_type'].upper()}.{x['bill_number']} ${x['volume']:,} Vol. {round(x['yes'] * 100)}%</h3>"
+                    for x in _markets())
+    return 200, f"<html><body><h1>What bills will be signed into law?</h1>{heads}</body></html>"
+
+
+def sim_price_history(m, q):
+    end = int(q.get("endTs") or SIM_EPOCH.timestamp())
+    start = int(q.get("startTs") or end - 30 * 86400)
+    step = 60 * int(q.get("fidelity") or 60)
+    rng = _rng("prices", q.get("market"))
+    p, history = rng.uniform(0.1, 0.9), []
+    for ts in range(start, end, max(step, (end - start) // 500 or 1)):
+        p = min(0.99, max(0.01, p + rng.gauss(0, 0.02)))
+        history.append({"t": ts, "p": round(p, 4)})
+    return 200, {"history": history}
+
+
+def sim_chart(m, q):
+    end = int(q.get("period2") or SIM_EPOCH.timestamp())
+    start = int(q.get("period1") or end - 30 * 86400)
+    rng = _rng("chart", m["symbol"].upper())
+    close, stamps, closes = rng.uniform(40, 400), [], []
+    for ts in range(start - start % 86400 + 14 * 3600, end, 86400):
+        if datetime.datetime.fromtimestamp(ts, datetime.timezone.utc).weekday() < 5:
+            close *= 1 + rng.gauss(0.0004, 0.012)
+            stamps.append(ts)
+            closes.append(round(close, 2))
+    return 200, {"chart": {"error": None, "result": [{
+        "meta": {"symbol": m["symbol"].upper(), "currency": "USD"},
+        "timestamp": stamps,
+        "indicators": {"quote": [{"close": closes, "open": closes, "high": closes, "low": closes}]},
+    }]}}
+
+
+_BILL = r"/v3/bill/(?P<congress>\d+)/(?P<type>[a-z]+)/(?P<number>\d+)"
+ROUTES: List[Tuple[str, str, str, Callable]] = [  # (route, host, path regex, synthetic answer)
+    ("text_versions", "api.congress.gov", _BILL + r"/text$", sim_text_versions),
+    ("summaries", "api.congress.gov", _BILL + r"/summaries$", sim_summaries),
+    ("cosponsors", "api.congress.gov", _BILL + r"/cosponsors$", sim_cosponsors),
+    ("actions", "api.congress.gov", _BILL + r"/actions$", sim_actions),
+    ("bill", "api.congress.gov", _BILL + r"$", sim_bill),
+    ("member_bills", "api.congress.gov",
+     r"/v3/member/(?P<bioguide_id>[A-Za-z0-9]+)/(?P<kind>sponsored|cosponsored)-legislation$", sim_member_bills),
+    ("listing", "api.congress.gov", r"/v3/bill(/(?P<congress>\d+)(/(?P<type>[a-z]+))?)?$", sim_listing),
+    ("members", "api.congress.gov", r"/v3/member$", sim_members),
+    ("bill_text", "www.congress.gov",
+     r"/(?P<congress>\d+)/bills/(?P<type>[a-z]+?)(?P<number>\d+)/.+\.(htm|html|txt)$", sim_document),
+    ("markets", "gamma-api.polymarket.com", r"/events/slug/(?P<slug>[^/]+)$", sim_event),
+    ("price_history", "clob.polymarket.com", r"/prices-history$", sim_price_history),
+    ("event_page", "polymarket.com", r"/event/[^/]+$", sim_event_page),
+    ("yahoo_chart", "query1.finance.yahoo.com", r"/v8/finance/chart/(?P<symbol>[^/]+)$", sim_chart),
+    ("yahoo_chart", "query2.finance.yahoo.com", r"/v8/finance/chart/(?P<symbol>[^/]+)$", sim_chart),
+]
+_COMPILED = [(name, host, re.compile(rx, re.I), fn) for name, host, rx, fn in ROUTES]
+
+
+def match_route(host: str, path: str):
+    """(route, synthetic fn, path groups), or (None, None, {}) for a URL no service calls."""
+    for name, h, rx, fn in _COMPILED:
+        m = rx.search(path.rstrip("/") or "/") if h == host else None
+        if m:
+            return name, fn, {k: v for k, v in m.groupdict().items() if v is not None}
+    return None, None, {}
+
+
+# =========================
+# Fixtures
+# =========================
+class FixtureStore:
+    def __init__(self, root: Optional[str]):
+        self.root = root
+        self._by_url: Dict[str, Dict[str, List[str]]] = {}  # route -> url without query -> files
+        self._lock = threading.Lock()
+
+    def _path(self, route: str, key: str) -> str:
+        return os.path.join(self.root, route, key + ".json")
+
+    def get(self, route: str, url: str, params: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        """The fixture for url + params, else one recorded for url with other params."""
+        if not self.root:
+            return None
+        key, _ = cache_key(url, params)
+        fixture = self._read(self._path(route, key))
+        for path in [] if fixture is not None else self._index(route).get(url, []):
+            fixture = self._read(path)
+            if fixture is not None:
+                break
+        return fixture
+
+    def _index(self, route: str) -> Dict[str, List[str]]:
+        with self._lock:
+            index = self._by_url.get(route)
+            if index is None:
+                index = self._by_url[route] = {}
+                folder = os.path.join(self.root, route)
+                for name in sorted(os.listdir(folder)) if os.path.isdir(folder) else []:
+                    fixture = self._read(os.path.join(folder, name))
+                    if fixture is not None:
+                        index.setdefault(fixture["url"].split("?")[0], []).append(os.path.join(folder, name))
+            return index
+
+    @staticmethod
+    def _read(path: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, route: str, url: str, params: Dict[str, str], resp: requests.Response) -> None:
+        key, full = cache_key(url, params)
+        fixture = {
+            "url": full,
+            "status": resp.status_code,
+            "headers": {h: resp.headers[h] for h in KEPT_HEADERS if h in resp.headers},
+            "body": resp.content.decode("utf-8", "surrogateescape"),
+        }
+        path = self._path(route, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(fixture, f, indent=1)
+        with self._lock:
+            self._by_url.pop(route, None)
+
+
+# =========================
+# Simulator
+# =========================
+def parse_quota(spec: Optional[str]) -> Optional[Tuple[int, float]]:
+    """'5000/3600' -> (5000, 3600.0); None / '' = no quota."""
+    if not spec:
+        return None
+    calls, _, seconds = str(spec).partition("/")
+    return int(calls), float(seconds or 3600)
+
+
+class Simulator:
+    def __init__(self, fixtures_dir: Optional[str] = FIXTURES_DIR, latency: float = 0.0, jitter: float = 0.0,
+                 error_rate: float = 0.0, quota: Optional[str] = None, strict: bool = False, record: bool = False):
+        self.fixtures = FixtureStore(fixtures_dir)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.quota = parse_quota(quota)
+        self.strict = strict
+        self.record = record
+        self._lock = threading.Lock()
+        self._calls: Dict[str, int] = {}
+        self._windows: Dict[str, List[float]] = {}  # host -> [window start, calls]
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._session = requests.Session() if record else None
+
+    # ---- config / stats
+    def configure(self, **knobs) -> Dict[str, Any]:
+        with self._lock:
+            for k in ("latency", "jitter", "error_rate"):
+                if k in knobs:
+                    setattr(self, k, float(knobs[k]))
+            if "quota" in knobs:
+                self.quota = parse_quota(knobs["quota"])
+                self._windows.clear()
+            if "strict" in knobs:
+                self.strict = bool(knobs["strict"])
+        return self.config()
+
+    def config(self) -> Dict[str, Any]:
+        return {"latency": self.latency, "jitter": self.jitter, "error_rate": self.error_rate,
+                "quota": None if self.quota is None else f"{self.quota[0]}/{self.quota[1]:g}",
+                "strict": self.strict, "record": self.record, "fixtures": self.fixtures.root}
+
+    def _count(self, route: str, what: str) -> None:
+        with self._lock:
+            s = self._stats.setdefault(route, {"calls": 0, "fixture": 0, "synthetic": 0, "recorded": 0,
+                                               "not_found": 0, "errors": 0, "throttled": 0})
+            s[what] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"config": self.config(), "routes": {k: dict(v) for k, v in self._stats.items()}}
+
+    # ---- faults
+    def _roll(self, key: str) -> Tuple[float, float]:
+        """Two numbers in [0, 1) for the n-th call of key (same every run)."""
+        with self._lock:
+            n = self._calls[key] = self._calls.get(key, 0) + 1
+        h = hashlib.sha1(f"{key}#{n}".encode()).digest()
+        return int.from_bytes(h[:4], "big") / 2 ** 32, int.from_bytes(h[4:8], "big") / 2 ** 32
+
+    def _throttled(self, host: str) -> Optional[float]:
+        """Seconds until host's quota window resets if this call is over it, else None."""
+        if self.quota is None:
+            return None
+        calls, window = self.quota
+        now = time.monotonic()
+        with self._lock:
+            w = self._windows.get(host)
+            if w is None or now - w[0] >= window:
+                w = self._windows[host] = [now, 0]
+            w[1] += 1
+            return None if w[1] <= calls else w[0] + window - now
+
+    # ---- answer
+    def handle(self, host: str, path: str, query: str, headers) -> Tuple[int, Dict[str, str], bytes]:
+        """(status, headers, body) for GET https://host/path?query; status 0 = drop the connection."""
+        params = dict(parse_qsl(query, keep_blank_values=True))
+        url = f"https://{host}{path}"
+        route, synth, groups = match_route(host, path)
+        route = route or "other"
+        self._count(route, "calls")
+        key, _ = cache_key(url, params)
+        fault, delay = self._roll(key)
+
+        retry_in = self._throttled(host)
+        if retry_in is not None:
+            self._count(route, "throttled")
+            return 429, {"Retry-After": str(max(1, round(retry_in))), "Content-Type": "application/json"}, \
+                json.dumps({"error": {"code": "OVER_RATE_LIMIT"}}).encode()
+        if self.latency or self.jitter:
+            time.sleep(max(0.0, self.latency + (2 * delay - 1) * self.jitter))
+        if fault < self.error_rate:
+            self._count(route, "errors")
+            kind = int(fault / self.error_rate * 3)
+            if kind == 2:
+                return 0, {}, b""
+            return (500, 503)[kind], {"Content-Type": "text/plain"}, b"simulated upstream error"
+
+        if self.record:
+            resp = self._session.get(url, params=params, timeout=RECORD_TIMEOUT)
+            if resp.status_code < 500 and resp.status_code != 429:
+                self.fixtures.put(route, url, params, resp)
+                self._count(route, "recorded")
+            return resp.status_code, {h: resp.headers[h] for h in KEPT_HEADERS if h in resp.headers}, resp.content
+
+        fixture = self.fixtures.get(route, url, params)
+        if fixture is not None:
+            self._count(route, "fixture")
+            etag = fixture["headers"].get("ETag")
+            if etag and headers.get("If-None-Match") == etag:
+                return 304, {"ETag": etag}, b""
+            return fixture["status"], dict(fixture["headers"]), fixture["body"].encode("utf-8", "surrogateescape")
+        if synth is None or self.strict:
+            self._count(route, "not_found")
+            return 404, {"Content-Type": "application/json"}, \
+                json.dumps({"error": f"No fixture for {url} (upstream_sim)"}).encode()
+        self._count(route, "synthetic")
+        status, payload = synth(groups, {k: v for k, v in params.items() if k not in SECRET_PARAMS})
+        if isinstance(payload, str):
+            return status, {"Content-Type": "text/html; charset=utf-8"}, payload.encode()
+        return status, {"Content-Type": "application/json"}, json.dumps(payload).encode()
+
+
+# =========================
+# Server
+# =========================
+class SimServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+
+def make_server(sim: Simulator, host: str = "127.0.0.1", port: int = 0) -> SimServer:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _send(self, status: int, headers: Dict[str, str], body: bytes) -> None:
+            self.send_response(status)
+            for k, v in headers.items():
+                self.send_header(k, v)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _json(self, payload: Dict[str, Any]) -> None:
+            self._send(200, {"Content-Type": "application/json"}, json.dumps(payload, indent=1).encode())
+
+        def do_GET(self):
+            parts = urlsplit(self.path)
+            if parts.path.rstrip("/") == "/_sim/stats":
+                return self._json(sim.stats())
+            upstream, _, rest = parts.path.lstrip("/").partition("/")
+            try:
+                status, headers, body = sim.handle(upstream.lower(), "/" + rest, parts.query, self.headers)
+            except requests.RequestException as e:
+                status, headers, body = 502, {"Content-Type": "text/plain"}, f"record: {e}".encode()
+            if status == 0:  # simulated connection drop
+                self.close_connection = True
+                return
+            self._send(status, headers, body)
+
+        def do_POST(self):
+            if urlsplit(self.path).path.rstrip("/") != "/_sim/config":
+                return self._send(404, {}, b"")
+            length = int(self.headers.get("Content-Length") or 0)
+            try:
+                knobs = json.loads(self.rfile.read(length) or b"{}")
+            except ValueError:
+                return self._send(400, {"Content-Type": "text/plain"}, b"invalid JSON")
+            self._json(sim.configure(**knobs))
+
+        def log_message(self, *args):
+            pass
+
+    return SimServer((host, port), Handler)
+
+
+def start(sim: Optional[Simulator] = None, host: str = "127.0.0.1", port: int = 0, **kwargs) -> SimServer:
+    """A simulator served on a daemon thread (port 0 = any free port, see .server_port)."""
+    srv = make_server(sim or Simulator(**kwargs), host, port)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    return srv
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8900)
+    ap.add_argument("--fixtures", default=FIXTURES_DIR)
+    ap.add_argument("--latency", type=float, default=0.0, help="seconds before each answer")
+    ap.add_argument("--jitter", type=float, default=0.0, help="+/- seconds around --latency")
+    ap.add_argument("--error-rate", type=float, default=0.0, help="fraction of calls failing (500/503/dropped)")
+    ap.add_argument("--quota", default=None, metavar="N/SECONDS", help="calls per host per window, then 429")
+    ap.add_argument("--strict", action="store_true", help="unrecorded URLs get 404 instead of synthetic data")
+    ap.add_argument("--record", action="store_true", help="forward to the real hosts and save fixtures")
+    args = ap.parse_args()
+
+    sim = Simulator(args.fixtures, args.latency, args.jitter, args.error_rate, args.quota, args.strict, args.record)
+    srv = make_server(sim, args.host, args.port)
+    print(f"[upstream_sim] {'recording' if args.record else 'replaying'} on http://{args.host}:{srv.server_port} "
+          f"(fixtures: {args.fixtures}); HTTP_UPSTREAM_OVERRIDE=http://{args.host}:{srv.server_port}")
+    try:
+        srv.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    print(json.dumps(sim.stats()["routes"], indent=2))
+
+
+if __name__ == "__main__":
+    main()